@@ -7,6 +7,7 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          stop_generation message
 #
 #
 ###############################################################################
@@ -67,6 +68,8 @@ class Mind:
                 msg = self.queue.get(timeout=1)
                 if msg.get("type") == "process_thought":
                     self.process_thought(msg)
+                elif msg.get("type") == "stop_generation":
+                    self.stop_generation(msg)
             except queue.Empty:
                 pass
             except Exception as e:
@@ -80,4 +83,15 @@ class Mind:
         """
         thought = msg.get("text")
         print(f"Processing thought: {thought}")
+
+    def stop_generation(self, msg: dict) -> None:
+        """Abandon the reply in progress (the /stop command).
+
+        Thoughts are processed as soon as they arrive, so there is
+        nothing in progress to stop yet.
+
+        Args:
+            msg: Stop message
+        """
+        print("Stopping generation")
         
\ No newline at end of file
@@ -7,6 +7,7 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          /stop from Widget 7
 #
 #
 ###############################################################################
@@ -103,7 +104,10 @@ class Orchestrator:
             try:
                 msg = self.queue.get(timeout=1)
                 if msg.get("type") == "user_input":
-                    self.handle_user_input(msg)
+                    if msg.get("text", "").strip().lower() == "/stop":
+                        self.handle_stop()
+                    else:
+                        self.handle_user_input(msg)
             except queue.Empty:
                 pass
             except Exception as e:
@@ -152,3 +156,29 @@ class Orchestrator:
         })  
 
     ###  End of handle_user_input()  ###
+
+
+    #####################################################
+    #
+    #  Function: handle_stop()
+    #
+    #  Description:
+    #     The /stop command typed in Widget 7. Tells the Mind to
+    #     abandon the reply in progress. Nothing is archived.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def handle_stop(self) -> None:
+
+        # Send to Mind (Thread 11)
+        self.archivist_queue.put({
+            "type": "stop_generation"
+        })
+
+    ###  End of handle_stop()  ###
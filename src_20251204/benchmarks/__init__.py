@@ -0,0 +1,4 @@
+"""Benchmarks for Willow. Run from the src_20251204 folder, for example:
+
+    python -m benchmarks.benchmark_load_history
+"""
@@ -0,0 +1,202 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_coalescing.py
+#
+#   PURPOSE:
+#   A user who types a few short lines in a row, against the local fake
+#   server with streamed replies. Compares a reply to every message with
+#   superseding the reply in progress and with a debounce window, and
+#   reports Gemini requests, bytes sent and replies shown.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_coalescing --bursts 5 --lines 3 --gap 0.15
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html#condition-objects
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from metrics import Metrics
+from turn_record import TurnRecord
+from llm_client_thread import llm_client_thread
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: run()
+#
+###############################################################################
+
+def run(server, debounce_ms:int, supersede:bool, bursts:int, lines:int, gap:float, pause:float) :
+    """Plays the bursts and returns (requests, KiB sent, replies shown)."""
+    global_variables.global_metrics = Metrics()
+    global_variables.global_history = ConversationLog()
+    global_variables.DEBOUNCE_MS = debounce_ms
+    global_variables.SUPERSEDE_REPLIES = supersede
+    global_variables.STOP_EVENT.clear()
+
+    server.requests.clear()
+    requests_before = server.request_count
+    replies = []
+
+    # Stands in for the server thread: finished replies go into the history
+    def receive() :
+        while not global_variables.STOP_EVENT.is_set() :
+            try :
+                sender, text, kind, _, _ = global_variables.LLM_Out_Queue.get(timeout=0.1)
+            except queue.Empty :
+                continue
+
+            if kind == "final" :
+                replies.append(text)
+                global_variables.global_history.append([TurnRecord(time.time(), "model", sender, text)])
+
+    receive_t = threading.Thread(target=receive)
+    llm_t = threading.Thread(target=llm_client_thread)
+    receive_t.start()
+    llm_t.start()
+
+    for b in range(bursts) :
+        for i in range(lines) :
+            text = f"Line {i} of burst {b}"
+            global_variables.global_history.append([TurnRecord(time.time(), "user", "Human", text)])
+            global_variables.LLM_In_Queue.put(("Human", text))
+            time.sleep(gap)
+
+        time.sleep(pause)
+
+    # Let replies still queued finish
+    shown = -1
+
+    while shown != len(replies) :
+        shown = len(replies)
+        time.sleep(1.5)
+
+    global_variables.STOP_EVENT.set()
+    llm_t.join()
+    receive_t.join()
+
+    sent = sum(len(body) for path, body in server.requests if "generatecontent" in path.lower())
+
+    return server.request_count - requests_before, sent / 1024, len(replies)
+
+    ###  END OF RUN  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark debouncing and superseding of rapid messages.")
+    parser.add_argument("--bursts", type=int, default=5, help="Bursts of messages")
+    parser.add_argument("--lines", type=int, default=3, help="Messages per burst")
+    parser.add_argument("--gap", type=float, default=0.15, help="Seconds between the messages of a burst")
+    parser.add_argument("--pause", type=float, default=2.0, help="Seconds after each burst")
+    parser.add_argument("--debounce", type=int, default=500, help="DEBOUNCE_MS for the last variant")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+
+    # A reply takes about a second to stream
+    server = FakeGeminiServer(latency=0.3, reply_text="A considered answer. " * 10, chunks=10, chunk_delay=0.07).start()
+
+    instructions = os.path.join(tempfile.mkdtemp(), "instructions.txt")
+
+    with open(instructions, "w", encoding="utf-8") as f :
+        f.write("Be brief.")
+
+    global_variables.global_instructions_file = instructions
+    global_variables.GEMINI_BASE_URL = server.url
+    global_variables.API_KEY = "benchmark"
+    global_variables.STREAM_REPLIES = True
+    global_variables.console = Console(quiet=True)
+
+    variants = [
+        ("Reply to every message", 0, False),
+        ("Supersede", 0, True),
+        (f"Debounce {args.debounce} ms + supersede", args.debounce, True),
+    ]
+
+    try :
+        results = [(name, run(server, debounce, supersede, args.bursts, args.lines, args.gap, args.pause))
+                   for name, debounce, supersede in variants]
+    finally :
+        server.stop()
+
+    table = Table(title=f"{args.bursts} bursts of {args.lines} messages, {args.gap * 1000:.0f} ms apart", box=box.ASCII)
+    table.add_column("Variant")
+    table.add_column("Gemini requests", justify="right")
+    table.add_column("Sent (KiB)", justify="right")
+    table.add_column("Replies shown", justify="right")
+
+    for name, (requests, sent, replies) in results :
+        table.add_row(name, str(requests), f"{sent:.1f}", str(replies))
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,163 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_context.py
+#
+#   PURPOSE:
+#   Measures request size and call time as the history grows, sending the
+#   whole history (CONTEXT_TOKEN_BUDGET = 0) against a token budget. Uses
+#   the local fake server, which records each request body.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_context --turns 1000 5000 20000 --budget 32000
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/tokens
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import statistics
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from context_builder import ContextBuilder
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: make_history()
+#
+###############################################################################
+
+def make_history(turns:int, text_length:int) :
+    """A ConversationLog of alternating user/model turns."""
+    history = ConversationLog()
+    history.append([TurnRecord(1767225600 + i, "user" if i % 2 == 0 else "model", "Human" if i % 2 == 0 else "Willow",
+                               f"Message {i} " + "x" * text_length) for i in range(turns)])
+
+    return history
+
+    ###  END OF MAKE_HISTORY  ###
+
+
+###############################################################################
+#
+#  FUNCTION: measure()
+#
+###############################################################################
+
+def measure(server:FakeGeminiServer, manager:GeminiClientManager, builder:ContextBuilder, requests:int) :
+    """Calls get_gemini_reply() requests times.
+
+    Returns (mean request KiB, mean seconds per call)."""
+    sizes = []
+    times = []
+
+    for _ in range(requests) :
+        start = time.perf_counter()
+        get_gemini_reply("Human", "", "Be brief.", client_manager=manager, context_builder=builder)
+        times.append(time.perf_counter() - start)
+        sizes.append(len(server.requests[-1][1]) / 1024)
+
+    return statistics.mean(sizes), statistics.mean(times)
+
+    ###  END OF MEASURE  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark request size with and without a context budget.")
+    parser.add_argument("--turns", type=int, nargs="+", default=[1000, 5000, 20000], help="History lengths")
+    parser.add_argument("--text-length", type=int, default=200, help="Characters per turn")
+    parser.add_argument("--budget", type=int, default=32000, help="CONTEXT_TOKEN_BUDGET to compare with")
+    parser.add_argument("--requests", type=int, default=5, help="Calls per measurement")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+    server = FakeGeminiServer().start()
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+
+    table = Table(title=f"Request size and call time, {args.text_length} characters per turn", box=box.ASCII)
+    table.add_column("Turns", justify="right")
+    table.add_column("Budget", justify="right")
+    table.add_column("Request (KiB)", justify="right")
+    table.add_column("Call (ms)", justify="right")
+
+    try :
+        for turns in args.turns :
+            global_variables.global_history = make_history(turns, args.text_length)
+
+            for budget in (0, args.budget) :
+                size, seconds = measure(server, manager, ContextBuilder(budget), args.requests)
+                table.add_row(f"{turns}", f"{budget}" if budget else "none", f"{size:.0f}", f"{seconds * 1000:.1f}")
+
+    finally :
+        manager.close()
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
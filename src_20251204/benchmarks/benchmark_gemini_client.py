@@ -0,0 +1,187 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_gemini_client.py
+#
+#   PURPOSE:
+#   Measures per-request overhead of the Gemini call against the local
+#   fake server: the original code path (new genai.Client and config on
+#   every call) against the long-lived GeminiClientManager. The fake
+#   server answers instantly, so the time is client and connection cost.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_gemini_client --requests 200
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://www.python-httpx.org/advanced/resource-limits/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import statistics
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from google import genai
+from google.genai import types
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from gemini_client_manager import GeminiClientManager
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+MODEL:str = "gemini-2.5-flash"
+INSTRUCTIONS:str = "You are Willow, a futuristic AI digital assistant."
+CONTENTS:str = "At 2026-01-01 00:00:00, Human said: Hello Willow"
+
+
+###############################################################################
+#
+#  FUNCTION: original_request()
+#
+###############################################################################
+
+def original_request(base_url:str) :
+    """One call the way get_gemini_reply used to make it: a new client and
+    config per request. The client is never closed, as before."""
+    client = genai.Client(api_key="benchmark", http_options=types.HttpOptions(base_url=base_url))
+    config = types.GenerateContentConfig(system_instruction=INSTRUCTIONS)
+
+    return client.models.generate_content(model=MODEL, contents=CONTENTS, config=config).text
+
+    ###  END OF ORIGINAL_REQUEST  ###
+
+
+###############################################################################
+#
+#  FUNCTION: pooled_request()
+#
+###############################################################################
+
+def pooled_request(manager:GeminiClientManager) :
+    """One call through the long-lived manager."""
+    return manager.client.models.generate_content(model=MODEL, contents=CONTENTS, config=manager.config(INSTRUCTIONS)).text
+
+    ###  END OF POOLED_REQUEST  ###
+
+
+###############################################################################
+#
+#  FUNCTION: measure()
+#
+###############################################################################
+
+def measure(server:FakeGeminiServer, request, count:int) :
+    """Times count calls of request().
+
+    Returns (list of seconds per call, TCP connections opened)."""
+    connections = server.connections
+    samples = []
+
+    for _ in range(count) :
+        start = time.perf_counter()
+        request()
+        samples.append(time.perf_counter() - start)
+
+    return samples, server.connections - connections
+
+    ###  END OF MEASURE  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark Gemini client reuse against a local fake server.")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per variant")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the fake server waits before replying")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+    server = FakeGeminiServer(latency=args.latency).start()
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+
+    try :
+        # Warm up imports and the first connection outside the measurement
+        original_request(server.url)
+        pooled_request(manager)
+
+        results = [
+            ("new client per request (original)", measure(server, lambda : original_request(server.url), args.requests)),
+            ("pooled GeminiClientManager", measure(server, lambda : pooled_request(manager), args.requests)),
+        ]
+
+    finally :
+        manager.close()
+        server.stop()
+
+    table = Table(title=f"{args.requests} generateContent calls against {server.url}", box=box.ASCII)
+    table.add_column("Client")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("Connections", justify="right")
+
+    for name, (samples, connections) in results :
+        samples_ms = [s * 1000 for s in samples]
+        p95 = statistics.quantiles(samples_ms, n=20)[-1] if len(samples_ms) > 1 else samples_ms[0]
+        table.add_row(name, f"{statistics.mean(samples_ms):.2f}", f"{statistics.median(samples_ms):.2f}", f"{p95:.2f}", f"{connections}")
+
+    console.print(table)
+
+    original, pooled = (statistics.mean(samples) for samples, _ in (results[0][1], results[1][1]))
+    console.print(f"Per-request overhead saved: {(original - pooled) * 1000:.2f} ms ({original / pooled:.1f}x faster)")
+    console.print("The fake server speaks plain HTTP; against the real API each new connection also pays a TLS handshake.")
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,180 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_hedging.py
+#
+#   PURPOSE:
+#   Asks the local fake server, where a few requests stall, for replies
+#   one after another, with and without hedging. Reports the latency to
+#   the first text, the requests sent and the hedges issued and won.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_hedging --requests 300 --stall-rate 0.03 --stall 1.0 --stream
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://research.google/pubs/the-tail-at-scale/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from stream_gemini_reply import stream_gemini_reply
+from hedging import Hedger
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(hedger, args) :
+    """Asks for args.requests replies against a fresh server.
+
+    Returns (sorted first-text latencies, requests sent, metrics)."""
+    global_variables.global_metrics = Metrics()
+
+    server = FakeGeminiServer(latency=args.latency, chunks=3 if args.stream else 1, chunk_delay=0.01,
+                              stall_rate=args.stall_rate, stall=args.stall).start()
+    manager = GeminiClientManager("benchmark", base_url=server.url, max_connections=8)
+    latencies = []
+
+    def request(on_chunk, cancel) :
+        if args.stream :
+            return stream_gemini_reply("Human", "", "Be brief.", on_chunk, client_manager=manager, cancel=cancel)
+
+        return get_gemini_reply("Human", "", "Be brief.", client_manager=manager, cancel=cancel)
+
+    try :
+        for _ in range(args.requests) :
+            start = time.perf_counter()
+            first = []
+
+            # Time to the first text shown, or to the whole reply unstreamed
+            def on_chunk(text) :
+                if not first :
+                    first.append(time.perf_counter() - start)
+
+            if hedger is None :
+                request(on_chunk, None)
+            else :
+                hedger.run(request, None, on_chunk)
+
+            latencies.append(first[0] if first else time.perf_counter() - start)
+
+        # Let abandoned attempts reach the server before counting
+        time.sleep(args.stall)
+        sent = server.request_count
+
+    finally :
+        manager.close()
+        server.stop()
+
+    return sorted(latencies), sent, global_variables.global_metrics
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark hedged requests against stalls.")
+    parser.add_argument("--requests", type=int, default=300, help="Replies per variant")
+    parser.add_argument("--latency", type=float, default=0.03, help="Seconds per healthy reply")
+    parser.add_argument("--stall-rate", type=float, default=0.03, help="Fraction of requests that stall")
+    parser.add_argument("--stall", type=float, default=1.0, help="Extra seconds a stalled request takes")
+    parser.add_argument("--percentile", type=float, default=95.0, help="Hedge after this latency percentile")
+    parser.add_argument("--min-delay", type=float, default=0.05, help="Never hedge sooner, in seconds")
+    parser.add_argument("--max-ratio", type=float, default=0.05, help="Most extra requests per request")
+    parser.add_argument("--stream", action="store_true", help="Streamed replies")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+    global_variables.console = Console(quiet=True)
+    global_variables.global_history.append([TurnRecord.from_message("Human", "Hello", "user", "2026-01-01 00:00:00")])
+
+    results = [
+        ("No hedging", play(None, args)),
+        (f"Hedge after p{args.percentile:g}", play(Hedger(args.percentile, args.min_delay, args.max_ratio), args)),
+    ]
+
+    table = Table(title=f"{args.requests} {'streamed' if args.stream else 'unstreamed'} replies, "
+                        f"{args.stall_rate:.0%} stalling {args.stall * 1000:.0f} ms", box=box.ASCII)
+    table.add_column("Variant")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    table.add_column("Requests sent", justify="right")
+    table.add_column("Hedged", justify="right")
+    table.add_column("Hedges won", justify="right")
+
+    for name, (latencies, sent, metrics) in results :
+        table.add_row(name, *[f"{percentile(latencies, p) * 1000:.0f}" for p in (50, 95, 99, 100)], str(sent),
+                      str(metrics.counter("llm.hedged")), str(metrics.counter("llm.hedge_won")))
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,191 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Measure without coalescing
+#  2026-10-18   agent          One session per sender, as conversations are now sessions
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_llm_workers.py
+#
+#   PURPOSE:
+#   Runs llm_client_thread against the local fake server while people
+#   in several sessions put messages on LLM_In_Queue, once with one LLM
+#   worker and once with a pool. Reports throughput, queue wait and
+#   service time.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_llm_workers --sessions 4 --messages 5 --workers 4
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/queue.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from turn_record import TurnRecord
+from session_manager import SessionManager
+from llm_client_thread import llm_client_thread
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: run()
+#
+###############################################################################
+
+def run(workers:int, sessions:int, messages:int) :
+    """Sends messages in every session and waits for all replies.
+
+    Returns (seconds, replies per session, metrics)."""
+    global_variables.global_metrics = Metrics()
+    global_variables.LLM_WORKERS = workers
+    global_variables.STOP_EVENT.clear()
+
+    llm_t = threading.Thread(target=llm_client_thread)
+    llm_t.start()
+
+    start = time.perf_counter()
+
+    # Interleaved, the way several people typing at once would arrive
+    for i in range(messages) :
+        for s in range(sessions) :
+            global_variables.LLM_In_Queue.put((f"Person-{s}", f"Message {i}", f"session-{s}"))
+
+    served = {}
+    expected = sessions * messages
+
+    while sum(served.values()) < expected :
+        _, _, kind, conversation, _ = global_variables.LLM_Out_Queue.get(timeout=30)
+
+        if kind == "final" :
+            served[conversation] = served.get(conversation, 0) + 1
+
+    elapsed = time.perf_counter() - start
+
+    global_variables.STOP_EVENT.set()
+    llm_t.join()
+
+    return elapsed, served, global_variables.global_metrics
+
+    ###  END OF RUN  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark the LLM worker pool.")
+    parser.add_argument("--sessions", type=int, default=4, help="Conversations sending at once")
+    parser.add_argument("--messages", type=int, default=5, help="Messages per session")
+    parser.add_argument("--workers", type=int, default=4, help="Pool size to compare with one worker")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds the server takes per reply")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+
+    server = FakeGeminiServer(latency=args.latency).start()
+
+    folder = tempfile.mkdtemp()
+    instructions = os.path.join(folder, "instructions.txt")
+
+    with open(instructions, "w", encoding="utf-8") as f :
+        f.write("Be brief.")
+
+    global_variables.global_instructions_file = instructions
+    global_variables.GEMINI_BASE_URL = server.url
+    global_variables.API_KEY = "benchmark"
+    global_variables.STREAM_REPLIES = False
+
+    # One reply per message, so the pool alone is measured
+    global_variables.DEBOUNCE_MS = 0
+    global_variables.SUPERSEDE_REPLIES = False
+    global_variables.console = Console(quiet=True)
+    global_variables.global_sessions = SessionManager(os.path.join(folder, "sessions"), fsync_policy="never")
+
+    for s in range(args.sessions) :
+        global_variables.global_sessions.record(f"session-{s}", [TurnRecord.from_message(f"Person-{s}", "Hello", "user", "2026-01-01 00:00:00")])
+
+    try :
+        results = [(f"{workers} worker{'s' if workers > 1 else ''}", run(workers, args.sessions, args.messages))
+                   for workers in (1, args.workers)]
+    finally :
+        server.stop()
+        global_variables.global_sessions.close()
+
+    table = Table(title=f"{args.sessions} sessions x {args.messages} messages, {args.latency * 1000:.0f} ms per reply", box=box.ASCII)
+    table.add_column("Pool")
+    table.add_column("Replies/s", justify="right")
+    table.add_column("Queue wait p50 (ms)", justify="right")
+    table.add_column("Queue wait p95 (ms)", justify="right")
+    table.add_column("Service p50 (ms)", justify="right")
+    table.add_column("Replies per session", justify="right")
+
+    for name, (elapsed, served, metrics) in results :
+        wait = sorted(metrics.samples("llm.queue_wait"))
+        service = sorted(metrics.samples("llm.service"))
+        table.add_row(name, f"{args.sessions * args.messages / elapsed:.1f}", f"{percentile(wait, 50) * 1000:.0f}",
+                      f"{percentile(wait, 95) * 1000:.0f}", f"{percentile(service, 50) * 1000:.0f}", ", ".join(str(served[key]) for key in sorted(served)))
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
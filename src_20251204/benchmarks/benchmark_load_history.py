@@ -0,0 +1,221 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Original loader keeps its own Content list
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_load_history.py
+#
+#   PURPOSE:
+#   Measures startup history loading: the original json.load loader that
+#   printed two lines and took the content lock per entry, against the
+#   streaming load_history(). Reports wall time and peak Python memory.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_load_history --entries 10000
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/tracemalloc.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from google.genai.types import Content, Part
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from load_history import load_history
+
+
+###############################################################################
+#
+#  FUNCTION: write_history()
+#
+###############################################################################
+
+def write_history(path, entries:int, text_length:int) :
+    """Writes a synthetic history.json with alternating user/model turns."""
+    history = []
+
+    for i in range(entries) :
+        role = "user" if i % 2 == 0 else "model"
+        history.append({
+            "timestamp" : f"2026-01-01 00:{(i // 60) % 60:02d}:{i % 60:02d}",
+            "role" : role,
+            "username" : "Human" if role == "user" else "Willow",
+            "parts" : [{"text" : f"Message {i} " + "x" * text_length}],
+        })
+
+    with open(path, "w", encoding="utf-8") as f :
+        json.dump(history, f, indent=4)
+
+    ###  END OF WRITE_HISTORY  ###
+
+
+###############################################################################
+#
+#  FUNCTION: original_load_history()
+#
+###############################################################################
+
+def original_load_history(path, console) :
+    """The loader as it was before streaming: whole-file json.load, two
+    console lines and one lock acquisition per entry, with every turn kept
+    both as a dict and as a Content."""
+    content_lock = threading.Lock()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        loaded_history = json.load(f)
+        contents = []
+
+        for entry in loaded_history:
+            role = entry.get("role", "unknown")
+            username = entry.get("username", "N/A")
+            timestamp = entry.get("timestamp", "N/A")
+            parts = entry.get("parts", [])
+
+            first_item = parts[0] if parts else {}
+            text = first_item.get("text", "")
+
+            new_text = f"At {timestamp}, {username} said: {text}"
+            console.print(f"[bold green]Loaded entry:[/bold green] {new_text}")
+            console.print(f"The length of new_text is {len(new_text)} characters.")
+
+            c = Content(role=role, parts=[Part.from_text(text=new_text)])
+
+            with content_lock :
+                contents.append(c)
+
+        return loaded_history, contents
+
+    ###  END OF ORIGINAL_LOAD_HISTORY  ###
+
+
+###############################################################################
+#
+#  FUNCTION: measure()
+#
+###############################################################################
+
+def measure(loader) :
+    """Runs loader twice, once timed and once under tracemalloc (which
+    slows allocation down too much to time the same run).
+
+    Returns (seconds, peak MiB, entries loaded)."""
+    start = time.perf_counter()
+    loaded = loader()
+    elapsed = time.perf_counter() - start
+
+    del loaded
+
+    tracemalloc.start()
+    count = len(loader())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1024 * 1024), count
+
+    ###  END OF MEASURE  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark history loading at startup.")
+    parser.add_argument("--entries", type=int, default=10000, help="Turns in the synthetic history")
+    parser.add_argument("--text-length", type=int, default=200, help="Characters per turn")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+    null_console = Console(file=open(os.devnull, "w"), width=100)
+
+    # The loader's summary line is not part of what we measure
+    global_variables.console = null_console
+    global_variables.HISTORY_BACKEND = "json"
+    global_variables.VERBOSE = False
+
+    with tempfile.TemporaryDirectory() as folder :
+        path = os.path.join(folder, "history.json")
+        write_history(path, args.entries, args.text_length)
+        size_mib = os.path.getsize(path) / (1024 * 1024)
+
+        results = [
+            ("original (json.load, per-entry output)", measure(lambda : original_load_history(path, null_console)[0])),
+            ("streaming load_history()", measure(lambda : load_history(path))),
+        ]
+
+    table = Table(title=f"Loading {args.entries} turns ({size_mib:.1f} MiB history.json)", box=box.ASCII)
+    table.add_column("Loader")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Peak memory (MiB)", justify="right")
+    table.add_column("Entries", justify="right")
+
+    for name, (elapsed, peak, count) in results :
+        table.add_row(name, f"{elapsed:.3f}", f"{peak:.1f}", f"{count}")
+
+    console.print(table)
+
+    baseline, streaming = results[0][1], results[1][1]
+    console.print(f"Speed-up: {baseline[0] / streaming[0]:.1f}x, peak memory: {streaming[1] / baseline[1]:.0%} of original")
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,190 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_model_router.py
+#
+#   PURPOSE:
+#   1. Shows the model each routing target picks for a short message, an
+#      ordinary one and a long conversation.
+#   2. Plays a slowdown of the primary model on the local fake server:
+#      healthy, degraded, healthy again. Compares staying on the primary
+#      with falling back to the fast model when its p95 exceeds the SLO,
+#      and reports the latency users saw and where the requests went.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_model_router --requests 40 --slow 0.4 --slo 200
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://sre.google/sre-book/service-level-objectives/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from model_router import ModelRouter, TARGETS
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+PRIMARY:str = "gemini-2.5-flash"
+FAST:str = "gemini-2.5-flash-lite"
+LARGE:str = "gemini-2.5-pro"
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(server, manager, router, requests:int, slow:float, healthy:float, interval:float) :
+    """Asks for requests replies in each phase, the primary being slow in
+    the middle one.
+
+    Returns (sorted latencies per phase, metrics)."""
+    global_variables.global_metrics = Metrics()
+    phases = []
+
+    for latency in (healthy, slow, healthy) :
+        server.model_latency[PRIMARY] = latency
+        latencies = []
+
+        for _ in range(requests) :
+            start = time.perf_counter()
+            get_gemini_reply("Human", "Tell me more about that", "Be brief.", client_manager=manager, model_router=router)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(interval)
+
+        phases.append(sorted(latencies))
+
+    return phases, global_variables.global_metrics
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark model routing and the latency SLO fallback.")
+    parser.add_argument("--requests", type=int, default=40, help="Replies per phase")
+    parser.add_argument("--healthy", type=float, default=0.05, help="Seconds per reply of a healthy model")
+    parser.add_argument("--slow", type=float, default=0.4, help="Seconds per reply of the degraded primary")
+    parser.add_argument("--slo", type=int, default=200, help="p95 milliseconds before falling back")
+    parser.add_argument("--window", type=float, default=3.0, help="Seconds a latency sample is remembered")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between requests")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+    global_variables.console = Console(quiet=True)
+
+    # What each target picks: (request tokens, message tokens)
+    shapes = [("Short message", 400, 5), ("Ordinary message", 1500, 60), ("Long conversation", 12000, 60)]
+
+    table = Table(title="Model per routing target", box=box.ASCII)
+    table.add_column("Target")
+
+    for name, _, _ in shapes :
+        table.add_column(name)
+
+    for target in TARGETS :
+        router = ModelRouter(PRIMARY, FAST, LARGE, target)
+        table.add_row(target, *[router.choose(request, message) for _, request, message in shapes])
+
+    console.print(table)
+
+    global_variables.global_history.append([TurnRecord.from_message("Human", "Hello", "user", "2026-01-01 00:00:00")])
+
+    server = FakeGeminiServer(latency=args.healthy, model_latency={FAST : args.healthy / 2}).start()
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+
+    try :
+        results = [(name, play(server, manager, ModelRouter(PRIMARY, FAST, LARGE, "primary", slo=slo, window_seconds=args.window),
+                               args.requests, args.slow, args.healthy, args.interval))
+                   for name, slo in (("Primary only", 0.0), (f"SLO {args.slo} ms", args.slo / 1000.0))]
+    finally :
+        manager.close()
+        server.stop()
+
+    table = Table(title=f"Primary slowed to {args.slow * 1000:.0f} ms for the middle {args.requests} of {args.requests * 3} requests",
+                  box=box.ASCII)
+    table.add_column("Routing")
+    table.add_column("Phase")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+
+    for name, (phases, _) in results :
+        for phase, latencies in zip(("healthy", "degraded", "recovered"), phases) :
+            table.add_row(name, phase, f"{percentile(latencies, 50) * 1000:.0f}", f"{percentile(latencies, 95) * 1000:.0f}")
+
+    console.print(table)
+
+    for name, (_, metrics) in results :
+        console.print(metrics.summary(f"{name}: routing decisions and latency per model"))
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
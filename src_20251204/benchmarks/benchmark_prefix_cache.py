@@ -0,0 +1,197 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Count failed replies by LLMUnavailableError
+#  2026-10-18   agent          A real context budget and alternating models
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_prefix_cache.py
+#
+#   PURPOSE:
+#   Plays a conversation against the local fake server with and without
+#   the PrefixCache and reports the bytes each variant actually sent:
+#   per reply request, and in total including cache uploads. Halfway
+#   through, the instructions change, which must replace the cache.
+#
+#   The history is longer than the context budget, so the window moves
+#   as the conversation grows, and the replies alternate between the
+#   --models given, as MODEL_TARGET routing would do.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_prefix_cache --history 1000 --replies 200 --budget 32000
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/caching
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from context_builder import ContextBuilder
+from prefix_cache import PrefixCache
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from resilience import LLMUnavailableError
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(server:FakeGeminiServer, history_turns:int, replies:int, text_length:int, budget:int, models, use_cache:bool) :
+    """One conversation. Returns a dict of byte counts and checks."""
+    global_variables.global_metrics.__init__()
+    global_variables.global_history = ConversationLog(
+        TurnRecord(1767225600 + i, "user" if i % 2 == 0 else "model", "Human" if i % 2 == 0 else "Willow",
+                   f"Message {i} " + "x" * text_length) for i in range(history_turns))
+
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+    builder = ContextBuilder(budget)
+    cache = PrefixCache(manager, builder.estimate) if use_cache else None
+
+    server.requests.clear()
+    failed = 0
+    instructions = "You are Willow."
+
+    for i in range(replies) :
+        if i == replies // 2 :
+            instructions = "You are Willow, and you are brief."
+
+        now = 1767225600 + history_turns + 2 * i
+        global_variables.global_history.append([TurnRecord(now, "user", "Human", f"Question {i} " + "x" * text_length)])
+
+        try :
+            reply = get_gemini_reply("Human", "", instructions, model_name=models[i % len(models)], client_manager=manager,
+                                     context_builder=builder, prefix_cache=cache)
+        except LLMUnavailableError :
+            failed += 1
+            continue
+
+        global_variables.global_history.append([TurnRecord(now + 1, "model", "Willow", reply)])
+
+    if cache is not None :
+        cache.close()
+
+    manager.close()
+
+    sent = list(server.requests)
+    generate = [body for path, body in sent if path.endswith(":generateContent")]
+    uploads = [body for path, body in sent if path.endswith("/cachedContents")]
+
+    return {
+        "requests" : len(generate),
+        "mean_request" : sum(map(len, generate)) / len(generate),
+        "total" : sum(len(body) for _, body in sent),
+        "caches" : len(uploads),
+        "hits" : global_variables.global_metrics.counter("prefix_cache.hits"),
+        "invalidated" : global_variables.global_metrics.counter("prefix_cache.invalidated"),
+        "leftover" : len(server.caches),
+        "failed" : failed,
+    }
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark the bytes sent with and without the prefix cache.")
+    parser.add_argument("--history", type=int, default=1000, help="Turns before the conversation starts")
+    parser.add_argument("--replies", type=int, default=200, help="Replies requested")
+    parser.add_argument("--text-length", type=int, default=200, help="Characters per turn")
+    parser.add_argument("--budget", type=int, default=32000, help="CONTEXT_TOKEN_BUDGET, 0 = every turn")
+    parser.add_argument("--models", nargs="+", default=["gemini-2.5-flash", "gemini-2.5-flash-lite"],
+                        help="Models the replies alternate between")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+    server = FakeGeminiServer().start()
+
+    try :
+        results = [
+            ("every turn each request", play(server, args.history, args.replies, args.text_length, args.budget, args.models, False)),
+            ("PrefixCache", play(server, args.history, args.replies, args.text_length, args.budget, args.models, True)),
+        ]
+
+    finally :
+        server.stop()
+
+    table = Table(title=f"{args.replies} replies after {args.history} turns, budget {args.budget}, {len(args.models)} models",
+                  box=box.ASCII)
+    table.add_column("Variant")
+    table.add_column("Mean request (KiB)", justify="right")
+    table.add_column("Total sent (KiB)", justify="right")
+    table.add_column("Caches created", justify="right")
+    table.add_column("Cache hits", justify="right")
+    table.add_column("Invalidated", justify="right")
+
+    for name, result in results :
+        table.add_row(name, f"{result['mean_request'] / 1024:.1f}", f"{result['total'] / 1024:.0f}",
+                      f"{result['caches']}", f"{result['hits']}", f"{result['invalidated']}")
+
+    console.print(table)
+
+    cached = results[1][1]
+    console.print(f"Failed replies: {cached['failed']}, caches left on the server: {cached['leftover']}")
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,225 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_rate_limit.py
+#
+#   PURPOSE:
+#   Checks the RateLimiter on a one-second period so it finishes quickly.
+#
+#   1. Several processes take requests as fast as they can, each with its
+#      own limiter and then sharing one state file. Only the shared file
+#      keeps the host within the budget.
+#   2. Background threads saturate the budget while one interactive
+#      caller asks for requests, and the waits of both are compared.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_rate_limit --processes 3 --rpm 20
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/rate-limits
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import percentile
+from rate_limiter import RateLimiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+
+###############################################################################
+#
+#  FUNCTION: take()
+#
+###############################################################################
+
+def take(rpm:int, state_file, count:int, times) :
+    """One process: takes count requests and records when each was granted."""
+    limiter = RateLimiter(rpm, state_file=state_file, period=1.0)
+
+    for _ in range(count) :
+        limiter.acquire(0)
+        times.append(time.time())
+
+    ###  END OF TAKE  ###
+
+
+###############################################################################
+#
+#  FUNCTION: across_processes()
+#
+###############################################################################
+
+def across_processes(processes:int, rpm:int, count:int, state_file) :
+    """Returns the highest number of grants in any one-second window,
+    after the initial burst."""
+    with multiprocessing.Manager() as manager :
+        times = manager.list()
+        workers = [multiprocessing.Process(target=take, args=(rpm, state_file, count, times)) for _ in range(processes)]
+
+        for worker in workers :
+            worker.start()
+
+        for worker in workers :
+            worker.join()
+
+        times = sorted(times)
+
+    # The full bucket lets the first rpm requests through at once
+    steady = times[rpm:]
+    busiest = 0
+    j = 0
+
+    for i, t in enumerate(steady) :
+        while steady[j] < t - 1.0 :
+            j += 1
+
+        busiest = max(busiest, i - j + 1)
+
+    return busiest, times[-1] - times[0]
+
+    ###  END OF ACROSS_PROCESSES  ###
+
+
+###############################################################################
+#
+#  FUNCTION: priorities()
+#
+###############################################################################
+
+def priorities(rpm:int, background_threads:int, interactive_count:int) :
+    """Returns sorted waits in seconds for (interactive, background)."""
+    limiter = RateLimiter(rpm, period=1.0)
+    waits = {PRIORITY_INTERACTIVE : [], PRIORITY_BACKGROUND : []}
+    done = threading.Event()
+
+    def caller(priority, count = None, pause = 0.0) :
+        taken = 0
+
+        while not done.is_set() and (count is None or taken < count) :
+            start = time.monotonic()
+            limiter.acquire(0, priority)
+            waits[priority].append(time.monotonic() - start)
+            taken += 1
+            time.sleep(pause)
+
+    background = [threading.Thread(target=caller, args=(PRIORITY_BACKGROUND,)) for _ in range(background_threads)]
+
+    for thread in background :
+        thread.start()
+
+    # A user typing now and then while the summarizer is busy
+    interactive = threading.Thread(target=caller, args=(PRIORITY_INTERACTIVE, interactive_count, 0.1))
+    interactive.start()
+    interactive.join()
+
+    done.set()
+
+    for thread in background :
+        thread.join()
+
+    return sorted(waits[PRIORITY_INTERACTIVE]), sorted(waits[PRIORITY_BACKGROUND])
+
+    ###  END OF PRIORITIES  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark the client-side rate limiter.")
+    parser.add_argument("--processes", type=int, default=3, help="Willow processes sharing one key")
+    parser.add_argument("--rpm", type=int, default=20, help="Requests per one-second period")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per process")
+    parser.add_argument("--background", type=int, default=4, help="Background threads saturating the budget")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+
+    state_file = os.path.join(tempfile.mkdtemp(), "rate_limit.json")
+
+    table = Table(title=f"{args.processes} processes x {args.requests} requests, budget {args.rpm} per second", box=box.ASCII)
+    table.add_column("Limiter")
+    table.add_column("Busiest second", justify="right")
+    table.add_column("Over budget", justify="right")
+    table.add_column("Elapsed (s)", justify="right")
+
+    for name, path in (("One per process", None), ("Shared state file", state_file)) :
+        busiest, elapsed = across_processes(args.processes, args.rpm, args.requests, path)
+        table.add_row(name, str(busiest), "yes" if busiest > args.rpm + 1 else "no", f"{elapsed:.2f}")
+
+    console.print(table)
+
+    interactive, background = priorities(args.rpm, args.background, 20)
+
+    table = Table(title=f"Waits with {args.background} background threads saturating the budget", box=box.ASCII)
+    table.add_column("Priority")
+    table.add_column("Requests", justify="right")
+    table.add_column("Wait p50 (ms)", justify="right")
+    table.add_column("Wait p95 (ms)", justify="right")
+
+    for name, waits in (("Interactive", interactive), ("Background", background)) :
+        table.add_row(name, str(len(waits)), f"{percentile(waits, 50) * 1000:.1f}", f"{percentile(waits, 95) * 1000:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
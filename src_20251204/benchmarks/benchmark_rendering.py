@@ -0,0 +1,133 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_rendering.py
+#
+#   PURPOSE:
+#   Shows a session of messages on an in-memory terminal, reprinting the
+#   whole chat table for every message (the old client_receive_thread)
+#   and with the ChatRenderer views. Reports the terminal output written
+#   and the time spent on the last messages and on the whole session.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_rendering --messages 300
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://rich.readthedocs.io/en/stable/console.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import io
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from chat_renderer import ChatRenderer
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(view, messages:int) :
+    """Shows the messages; view None reprints the whole table each time.
+
+    Returns (bytes written, seconds for the session, ms for the last message)."""
+    out = io.StringIO()
+    console = Console(file=out, width=110, force_terminal=True, color_system="truecolor")
+    renderer = None if view is None else ChatRenderer(console, view, refresh_per_second=4.0)
+    history = ChatRenderer.table()
+    start = time.perf_counter()
+    last = 0.0
+
+    for i in range(messages) :
+        before = time.perf_counter()
+        row = (f"[yellow]Human" if i % 2 == 0 else "[cyan]Willow", f"Message number {i} of the session, long enough to wrap onto a second line of the table.",
+               "2026-10-18 12:00:00")
+
+        if renderer is None :
+            history.add_row(*row)
+            console.print(history)
+        else :
+            renderer.add(*row)
+
+        last = time.perf_counter() - before
+
+    if renderer is not None :
+        renderer.close()
+
+    return len(out.getvalue().encode("utf-8")), time.perf_counter() - start, last * 1000
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark drawing the chat transcript.")
+    parser.add_argument("--messages", type=int, default=300, help="Messages in the session")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+
+    table = Table(title=f"Session of {args.messages} messages", box=box.ASCII)
+    table.add_column("Rendering")
+    table.add_column("Output (KiB)", justify="right")
+    table.add_column("Session (s)", justify="right")
+    table.add_column("Last message (ms)", justify="right")
+
+    for name, view in (("Reprint whole table", None), ("Scroll: new rows only", "scroll"), ("Window: last 20 rows, 4 Hz", "window")) :
+        written, seconds, last = play(view, args.messages)
+        table.add_row(name, f"{written / 1024:.0f}", f"{seconds:.2f}", f"{last:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
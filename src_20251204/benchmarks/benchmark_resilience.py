@@ -0,0 +1,183 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_resilience.py
+#
+#   PURPOSE:
+#   Sends replies through get_gemini_reply() while the local fake server
+#   fails a share of the requests with 503, once without retries and once
+#   with the RetryPolicy, and reports failed replies and latency. A second
+#   run takes the server down completely and shows how long the callers
+#   wait with and without the circuit breaker.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_resilience --requests 200 --error-rate 0.2
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+#   https://martinfowler.com/bliki/CircuitBreaker.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from resilience import CircuitBreaker, LLMUnavailableError, RetryPolicy
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(manager, retry_policy, count:int) :
+    """Asks for count replies with fresh metrics.
+
+    Returns (failed replies, sorted latencies in seconds, metrics)."""
+    global_variables.global_metrics = Metrics()
+
+    failed = 0
+    latencies = []
+
+    for _ in range(count) :
+        start = time.perf_counter()
+
+        try :
+            get_gemini_reply("Human", "", "Be brief.", client_manager=manager, retry_policy=retry_policy)
+        except LLMUnavailableError :
+            failed += 1
+
+        latencies.append(time.perf_counter() - start)
+
+    return failed, sorted(latencies), global_variables.global_metrics
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark retries and the circuit breaker against injected faults.")
+    parser.add_argument("--requests", type=int, default=200, help="Replies per variant")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the server takes per reply")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Fraction of requests answered with 503")
+    parser.add_argument("--outage-requests", type=int, default=20, help="Replies asked for while the server is down")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+
+    global_variables.global_history.append([TurnRecord.from_message("Human", "Hello", "user", "2026-01-01 00:00:00")])
+
+    # Short delays so the benchmark finishes quickly; the shape is what matters
+    def policy(breaker = None) :
+        return RetryPolicy(deadline=5.0, max_attempts=5, base_delay=0.02, max_delay=0.2, breaker=breaker)
+
+    server = FakeGeminiServer(latency=args.latency, error_rate=args.error_rate).start()
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+
+    try :
+        flaky = [
+            ("No retries", play(manager, None, args.requests)),
+            ("RetryPolicy", play(manager, policy(), args.requests)),
+        ]
+
+        server.error_rate = 1.0
+
+        outage = [
+            ("RetryPolicy, no breaker", play(manager, policy(), args.outage_requests)),
+            ("RetryPolicy + CircuitBreaker", play(manager, policy(CircuitBreaker(failure_threshold=5, reset_timeout=60.0)), args.outage_requests)),
+        ]
+
+    finally :
+        manager.close()
+        server.stop()
+
+    table = Table(title=f"{args.requests} replies, {args.error_rate:.0%} of requests fail with 503", box=box.ASCII)
+    table.add_column("Variant")
+    table.add_column("Failed replies", justify="right")
+    table.add_column("Retries", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+
+    for name, (failed, latencies, metrics) in flaky :
+        table.add_row(name, str(failed), str(metrics.counter("llm.retries")), f"{percentile(latencies, 50) * 1000:.1f}",
+                      f"{percentile(latencies, 95) * 1000:.1f}", f"{percentile(latencies, 99) * 1000:.1f}")
+
+    console.print(table)
+
+    table = Table(title=f"{args.outage_requests} replies while the server is down", box=box.ASCII)
+    table.add_column("Variant")
+    table.add_column("Requests sent", justify="right")
+    table.add_column("Failed fast", justify="right")
+    table.add_column("Total wait (s)", justify="right")
+
+    for name, (failed, latencies, metrics) in outage :
+        sent = metrics.counter("llm.errors.503")
+        table.add_row(name, str(sent), str(metrics.counter("llm.errors.circuit_open")), f"{sum(latencies):.2f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,194 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_routing.py
+#
+#   PURPOSE:
+#   Time the server takes to route a message: a human message from
+#   Server_Queue and a streamed chunk from LLM_Out_Queue, each to
+#   Client_Receive_Queue. Compares server_thread, which sleeps on the
+#   Server_Inbox, with the loop it replaced, which polled each queue in
+#   turn for 50 ms. Also reports the CPU used while idle.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_routing --messages 200
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/time.html#time.process_time
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import queue
+import random
+import threading
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import percentile
+from server_thread import server_thread
+
+
+###############################################################################
+#
+#  FUNCTION: polling_server()
+#
+###############################################################################
+
+def polling_server() :
+    """The routing loop server_thread had before the Server_Inbox."""
+    while not global_variables.STOP_EVENT.is_set() :
+        try :
+            message = global_variables.Server_Queue.get(timeout=0.05)
+            global_variables.Client_Receive_Queue.put([global_variables.HUMAN_USERNAME, message])
+        except queue.Empty :
+            pass
+
+        try :
+            sender, text, kind, conversation = global_variables.LLM_Out_Queue.get(timeout=0.05)
+            global_variables.Client_Receive_Queue.put([sender, text, kind, conversation])
+        except queue.Empty :
+            pass
+
+    ###  END OF POLLING_SERVER  ###
+
+
+###############################################################################
+#
+#  FUNCTION: play()
+#
+###############################################################################
+
+def play(target, messages:int, idle:float) :
+    """Routes messages through target and measures it.
+
+    Returns (sorted human latencies, sorted chunk latencies, idle CPU ms per second)."""
+    global_variables.STOP_EVENT.clear()
+
+    for q in (global_variables.Server_Queue, global_variables.LLM_Out_Queue, global_variables.Client_Receive_Queue,
+              global_variables.LLM_In_Queue, global_variables.Recorder_In_Queue) :
+        while not q.empty() :
+            q.get_nowait()
+
+    router = threading.Thread(target=target)
+    router.start()
+    time.sleep(0.2)
+
+    # Idle: nothing to route
+    cpu = time.process_time()
+    time.sleep(idle)
+    idle_cpu = (time.process_time() - cpu) / idle * 1000
+
+    pause = random.Random(0)
+    latencies = {"human" : [], "chunk" : []}
+
+    for i in range(messages) :
+        for path in ("human", "chunk") :
+            sent = time.perf_counter()
+
+            if path == "human" :
+                global_variables.Server_Queue.put(f"{i}")
+            else :
+                global_variables.LLM_Out_Queue.put((global_variables.LLM_USERNAME, f"{i}", "partial", global_variables.HUMAN_USERNAME))
+
+            # Skip the server's notices until the message comes back
+            while global_variables.Client_Receive_Queue.get(timeout=5)[1] != f"{i}" :
+                pass
+
+            latencies[path].append(time.perf_counter() - sent)
+
+            # Arrive at random points of the polling cycle
+            time.sleep(pause.uniform(0.0, 0.1))
+
+    global_variables.STOP_EVENT.set()
+    router.join()
+
+    return sorted(latencies["human"]), sorted(latencies["chunk"]), idle_cpu
+
+    ###  END OF PLAY  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark routing latency of the server thread.")
+    parser.add_argument("--messages", type=int, default=200, help="Messages of each kind")
+    parser.add_argument("--idle", type=float, default=3.0, help="Seconds to measure idle CPU over")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+    global_variables.console = Console(quiet=True)
+
+    results = [(name, play(target, args.messages, args.idle))
+               for name, target in (("Polling 50 ms per queue", polling_server), ("Server_Inbox", server_thread))]
+
+    table = Table(title=f"Routing {args.messages} human messages and {args.messages} streamed chunks", box=box.ASCII)
+    table.add_column("Server loop")
+    table.add_column("Human p50 (ms)", justify="right")
+    table.add_column("Human p99 (ms)", justify="right")
+    table.add_column("Chunk p50 (ms)", justify="right")
+    table.add_column("Chunk p99 (ms)", justify="right")
+    table.add_column("Idle CPU (ms/s)", justify="right")
+
+    for name, (human, chunk, idle_cpu) in results :
+        table.add_row(name, f"{percentile(human, 50) * 1000:.2f}", f"{percentile(human, 99) * 1000:.2f}",
+                      f"{percentile(chunk, 50) * 1000:.2f}", f"{percentile(chunk, 99) * 1000:.2f}", f"{idle_cpu:.2f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,166 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_sessions.py
+#
+#   PURPOSE:
+#   Writes thousands of sessions through a SessionManager into a
+#   temporary folder, then reports the memory a session takes in and out
+#   of memory, and the time to reach one: from memory, or loaded from its
+#   shard. Lookups go mostly to a small set of active sessions, the rest
+#   to any session, as on a host with a few busy teams.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_sessions --sessions 5000 --turns 20
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/tracemalloc.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from session_manager import SessionManager
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark the session manager.")
+    parser.add_argument("--sessions", type=int, default=5000, help="Sessions written")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per session")
+    parser.add_argument("--hot", type=int, default=128, help="SESSION_MAX_HOT")
+    parser.add_argument("--active", type=int, default=100, help="Sessions most lookups go to")
+    parser.add_argument("--lookups", type=int, default=20000, help="Lookups to time")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+    global_variables.console = Console(quiet=True)
+    global_variables.global_metrics = Metrics()
+
+    root = tempfile.mkdtemp()
+    ids = [f"team-{i}" for i in range(args.sessions)]
+
+    # Write every session, a turn pair at a time
+    manager = SessionManager(root, max_hot=args.hot, fsync_policy="never")
+    started = time.perf_counter()
+
+    for session_id in ids :
+        for i in range(0, args.turns, 2) :
+            manager.record(session_id, [TurnRecord.from_message("Ann", f"Question {i} for {session_id}, with a few words more.", "user", "2026-10-18 12:00:00"),
+                                        TurnRecord.from_message("Willow", f"Answer {i} for {session_id}, a little longer than the question was.", "model", "2026-10-18 12:00:01")])
+
+    written = time.perf_counter() - started
+    manager.close()
+
+    # Memory with a full set of hot sessions, then with none
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    manager = SessionManager(root, max_hot=args.hot, fsync_policy="never")
+
+    for session_id in ids[:args.hot] :
+        manager.history(session_id)
+
+    hot_bytes = tracemalloc.get_traced_memory()[0] - base
+    manager.close()
+    idle_bytes = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    # Lookups: 90% to the active sessions, 10% to any
+    global_variables.global_metrics = Metrics()
+    manager = SessionManager(root, max_hot=args.hot, fsync_policy="never")
+    pick = random.Random(0)
+    hits = []
+
+    for _ in range(args.lookups) :
+        session_id = ids[pick.randrange(args.active)] if pick.random() < 0.9 else pick.choice(ids)
+        loads = global_variables.global_metrics.counter("session.loads")
+
+        before = time.perf_counter()
+        manager.history(session_id)
+        elapsed = time.perf_counter() - before
+
+        if global_variables.global_metrics.counter("session.loads") == loads :
+            hits.append(elapsed)
+
+    manager.close()
+
+    loads = sorted(global_variables.global_metrics.samples("session.load"))
+    hits.sort()
+
+    table = Table(title=f"{args.sessions} sessions of {args.turns} turns, {args.hot} kept in memory", box=box.ASCII)
+    table.add_column("Measure")
+    table.add_column("Value", justify="right")
+
+    table.add_row("Write, per session", f"{written / args.sessions * 1000:.2f} ms")
+    table.add_row("Memory, per session in memory", f"{hot_bytes / args.hot / 1024:.1f} KiB")
+    table.add_row("Memory, per session out of memory", f"{max(0, idle_bytes) / args.sessions:.1f} B")
+    table.add_row("Lookups served from memory", f"{len(hits) / args.lookups * 100:.1f} %")
+    table.add_row("From memory p50 / p99", f"{percentile(hits, 50) * 1e6:.1f} / {percentile(hits, 99) * 1e6:.1f} us")
+    table.add_row("Loaded from shard p50 / p99", f"{percentile(loads, 50) * 1000:.2f} / {percentile(loads, 99) * 1000:.2f} ms")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
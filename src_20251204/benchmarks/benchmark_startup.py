@@ -0,0 +1,209 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_startup.py
+#
+#   PURPOSE:
+#   Launches the host threads against a fake Gemini server and histories
+#   of growing size, the way main.py did (a second between threads) and
+#   through the Launcher, and reports how long each takes to be ready.
+#   For the staggered start it also reports whether the history had
+#   loaded before the recorder started, which nothing guaranteed.
+#
+#   Every launch runs in a process of its own, as a real one would.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_startup --entries 0 10000 50000 --trials 2
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import percentile
+from benchmarks.benchmark_load_history import write_history
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: launch()
+#
+###############################################################################
+
+def launch(mode:str) -> dict :
+    """One launch in this process, configured from the environment.
+
+    Returns seconds until every thread was ready (staggered: until the
+    last one was started, as main.py knew no better), and whether the
+    history had loaded when the recorder started."""
+    from launcher import Launcher
+    from load_config import load_config
+    from saver_thread import saver_thread
+    from recorder_thread import recorder_thread
+    from llm_client_thread import llm_client_thread
+    from server_thread import server_thread
+    from housekeeper_thread import housekeeper_thread
+    from client_receive_thread import client_receive_thread
+
+    global_variables.console = Console(quiet=True)
+    load_config()
+
+    launcher = Launcher(global_variables.Startup_Inbox, global_variables.STOP_EVENT, global_variables.IDLE_WAIT)
+    launcher.add("saver", saver_thread, 'Saver-Thread', global_variables.HISTORY_READY)
+    launcher.add("recorder", recorder_thread, 'Recorder-Thread', global_variables.RECORDER_READY, needs=["saver"])
+    launcher.add("llm", llm_client_thread, 'LLM-Client-Thread', global_variables.LLM_READY)
+    launcher.add("server", server_thread, 'Server-Thread', global_variables.SERVER_READY, needs=["recorder", "llm"])
+    launcher.add("housekeeper", housekeeper_thread, 'Housekeeper-Thread', global_variables.HOUSEKEEPER_READY, needs=["saver"])
+    launcher.add("receive", client_receive_thread, 'Client-Receive-Thread', global_variables.RECEIVE_READY, needs=["saver"])
+
+    history_loaded = True
+    slowest = ""
+    saver = None
+    began = time.perf_counter()
+
+    if mode == "launcher" :
+        launcher.start()
+        elapsed = launcher.elapsed
+        slowest = max(launcher.components.values(), key=lambda component: component.ready_at).name
+        saver = launcher.components["saver"].ready_at
+
+    else :
+        # The order and sleeps of main.py before the Launcher
+        components = launcher.components
+
+        for name in ("saver", "recorder", "server", "receive", "llm", "housekeeper") :
+            if name == "recorder" :
+                history_loaded = global_variables.HISTORY_READY.is_set()
+
+            components[name].thread.start()
+            components[name].started_at = time.perf_counter() - began
+
+            if name != "housekeeper" :
+                time.sleep(1)
+
+        elapsed = time.perf_counter() - began
+
+    global_variables.STOP_EVENT.set()
+    launcher.join()
+
+    return {"elapsed" : elapsed, "history_loaded" : history_loaded, "slowest" : slowest, "saver" : saver}
+
+    ###  END OF LAUNCH  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark host startup.")
+    parser.add_argument("--entries", type=int, nargs="+", default=[0, 10000, 50000], help="Turns in the history")
+    parser.add_argument("--trials", type=int, default=2, help="Launches per history and mode")
+    parser.add_argument("--launch", choices=["staggered", "launcher"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.launch is not None :
+        print(json.dumps(launch(args.launch)))
+        return
+
+    console = Console(width=110)
+    server = FakeGeminiServer(latency=0.05).start()
+
+    table = Table(title="Startup, until every thread is ready", box=box.ASCII)
+    table.add_column("History turns", justify="right")
+    table.add_column("Staggered", justify="right")
+    table.add_column("History loaded before recorder")
+    table.add_column("Launcher p50", justify="right")
+    table.add_column("History loaded at", justify="right")
+    table.add_column("Slowest")
+
+    try :
+        for entries in args.entries :
+            with tempfile.TemporaryDirectory() as folder :
+                with open(os.path.join(folder, "gemini_key.txt"), "w", encoding="utf-8") as f :
+                    f.write("benchmark")
+
+                with open(os.path.join(folder, "instructions.txt"), "w", encoding="utf-8") as f :
+                    f.write("You are Willow.")
+
+                write_history(os.path.join(folder, "history.json"), entries, 200)
+
+                # The window view, so drawing the whole backlog afterwards does not slow the run down
+                env = dict(os.environ, CONFIG_ROOT=folder, GEMINI_BASE_URL=server.url, CHAT_PORT="0", CHAT_CONSOLE="true",
+                           CLIENT_VIEW="window", HISTORY_BACKEND="json", RESPONSE_CACHE="false")
+                results = {"staggered" : [], "launcher" : []}
+
+                for _ in range(args.trials) :
+                    for mode in results :
+                        output = subprocess.run([sys.executable, "-m", "benchmarks.benchmark_startup", "--launch", mode],
+                                                env=env, capture_output=True, text=True, check=True).stdout
+                        results[mode].append(json.loads(output.strip().splitlines()[-1]))
+
+                staggered = sorted(result["elapsed"] for result in results["staggered"])
+                loaded = sum(result["history_loaded"] for result in results["staggered"])
+                launched = sorted(result["elapsed"] for result in results["launcher"])
+                saver = sorted(result["saver"] for result in results["launcher"])
+
+                table.add_row(f"{entries}", f"{percentile(staggered, 50):.2f} s", f"{loaded} of {args.trials}",
+                              f"{percentile(launched, 50) * 1000:.0f} ms", f"{percentile(saver, 50) * 1000:.0f} ms",
+                              results["launcher"][-1]["slowest"])
+
+    finally :
+        server.stop()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,150 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_streaming.py
+#
+#   PURPOSE:
+#   Measures time-to-first-token of get_gemini_reply() (nothing to show
+#   until the whole reply is back) against stream_gemini_reply(), using the
+#   local fake server with a simulated generation time.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_streaming --requests 10 --chunks 20 --chunk-delay 0.05
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/text-generation#streaming
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import Metrics, percentile
+from turn_record import TurnRecord
+from gemini_client_manager import GeminiClientManager
+from get_gemini_reply import get_gemini_reply
+from stream_gemini_reply import stream_gemini_reply
+from benchmarks.fake_gemini_server import FakeGeminiServer
+
+
+###############################################################################
+#
+#  FUNCTION: measure()
+#
+###############################################################################
+
+def measure(request, count:int) :
+    """Runs request() count times with fresh metrics.
+
+    Returns (sorted TTFT samples, sorted total samples) in seconds."""
+    global_variables.global_metrics = Metrics()
+
+    for _ in range(count) :
+        request()
+
+    metrics = global_variables.global_metrics
+
+    return sorted(metrics.samples("llm.ttft")), sorted(metrics.samples("llm.total"))
+
+    ###  END OF MEASURE  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark time-to-first-token with and without streaming.")
+    parser.add_argument("--requests", type=int, default=10, help="Calls per variant")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds before the first chunk")
+    parser.add_argument("--chunks", type=int, default=20, help="Pieces the reply is split into")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="Seconds between chunks")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+
+    global_variables.global_history.append([TurnRecord.from_message("Human", "Tell me a story.", "user", "2026-01-01 00:00:00")])
+
+    server = FakeGeminiServer(latency=args.latency, reply_text="Once upon a time " * 20,
+                              chunks=args.chunks, chunk_delay=args.chunk_delay).start()
+    manager = GeminiClientManager("benchmark", base_url=server.url)
+
+    try :
+        results = [
+            ("get_gemini_reply (whole reply)",
+             measure(lambda : get_gemini_reply("Human", "", "Be brief.", client_manager=manager), args.requests)),
+            ("stream_gemini_reply",
+             measure(lambda : stream_gemini_reply("Human", "", "Be brief.", lambda text : None, client_manager=manager), args.requests)),
+        ]
+
+    finally :
+        manager.close()
+        server.stop()
+
+    table = Table(title=f"{args.requests} replies, {args.chunks} chunks, first after {args.latency * 1000:.0f} ms, then every {args.chunk_delay * 1000:.0f} ms",
+                  box=box.ASCII)
+    table.add_column("Call")
+    table.add_column("TTFT p50 (ms)", justify="right")
+    table.add_column("TTFT p95 (ms)", justify="right")
+    table.add_column("Full reply p50 (ms)", justify="right")
+
+    for name, (ttft, total) in results :
+        table.add_row(name, f"{percentile(ttft, 50) * 1000:.1f}", f"{percentile(ttft, 95) * 1000:.1f}", f"{percentile(total, 50) * 1000:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
@@ -0,0 +1,156 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: benchmark_turn_memory.py
+#
+#   PURPOSE:
+#   Compares the resident memory per turn of the old bookkeeping (a
+#   history dict plus a Gemini Content per turn) with one TurnRecord.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.benchmark_turn_memory --turns 10000
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/tracemalloc.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import tracemalloc
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from google.genai.types import Content, Part
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  FUNCTION: messages()
+#
+###############################################################################
+
+def messages(turns:int, text_length:int) :
+    """Yields (speaker, message, role, timestamp) like Recorder_In_Queue."""
+    for i in range(turns) :
+        role = "user" if i % 2 == 0 else "model"
+        speaker = "Human" if role == "user" else "Willow"
+        yield speaker, f"Message {i} " + "x" * text_length, role, f"2026-01-01 00:{(i // 60) % 60:02d}:{i % 60:02d}"
+
+    ###  END OF MESSAGES  ###
+
+
+###############################################################################
+#
+#  FUNCTION: old_turns() / new_turns()
+#
+###############################################################################
+
+def old_turns(turns:int, text_length:int) :
+    """What recorder_thread used to keep: a dict and a Content per turn."""
+    history = []
+    content = []
+
+    for speaker, message, role, timestamp in messages(turns, text_length) :
+        history.append({"timestamp" : timestamp, "role" : role, "username" : speaker, "parts" : [{"text" : message}]})
+        content.append(Content(role=role, parts=[Part.from_text(text=f"At {timestamp}, {speaker} said: {message}")]))
+
+    return history, content
+
+def new_turns(turns:int, text_length:int) :
+    """What recorder_thread keeps now."""
+    return [TurnRecord.from_message(*message) for message in messages(turns, text_length)]
+
+    ###  END OF OLD_TURNS() / NEW_TURNS()  ###
+
+
+###############################################################################
+#
+#  FUNCTION: bytes_per_turn()
+#
+###############################################################################
+
+def bytes_per_turn(builder, turns:int, text_length:int) -> float :
+    """Memory still allocated after building the turns, divided by turns."""
+    tracemalloc.start()
+    kept = builder(turns, text_length)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del kept
+
+    return current / turns
+
+    ###  END OF BYTES_PER_TURN  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Benchmark memory per conversation turn.")
+    parser.add_argument("--turns", type=int, default=10000, help="Turns to build")
+    parser.add_argument("--text-length", type=int, default=200, help="Characters per turn")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+
+    old = bytes_per_turn(old_turns, args.turns, args.text_length)
+    new = bytes_per_turn(new_turns, args.turns, args.text_length)
+
+    table = Table(title=f"{args.turns} turns of about {args.text_length} characters", box=box.ASCII)
+    table.add_column("Representation")
+    table.add_column("Bytes per turn", justify="right")
+    table.add_row("dict + Content (before)", f"{old:,.0f}")
+    table.add_row("TurnRecord", f"{new:,.0f}")
+
+    console.print(table)
+    console.print(f"TurnRecord uses {new / old:.0%} of the memory per turn")
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
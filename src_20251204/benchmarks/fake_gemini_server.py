@@ -0,0 +1,400 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Streaming endpoint with per-chunk delays
+#  2026-10-18   agent          Context caching endpoints
+#  2026-10-18   agent          Error injection
+#  2026-10-18   agent          Count streams the client abandons
+#  2026-10-18   agent          Latency per model
+#  2026-10-18   agent          Stalled requests
+#  2026-10-18   agent          Latency distributions
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: fake_gemini_server.py
+#
+#   PURPOSE:
+#   Local stand-in for the Gemini REST endpoint, used by the benchmarks.
+#   Answers POST /v1beta/models/{model}:generateContent with a canned reply
+#   over HTTP/1.1 keep-alive, and :streamGenerateContent?alt=sse with the
+#   same reply split into server-sent event chunks. Point the client at it
+#   with GEMINI_BASE_URL or GeminiClientManager(base_url=server.url).
+#
+#   POST /v1beta/cachedContents and DELETE /v1beta/cachedContents/{id}
+#   emulate context caching: a request naming a cache is billed for the
+#   cached bytes as well (usageMetadata.cachedContentTokenCount), and an
+#   unknown cache is rejected with 404. Every request body is kept in
+#   server.requests so a test can see exactly what was sent.
+#
+#   Faults: a fraction "error_rate" of generate requests is answered with
+#   "error_status" (503 by default) instead of a reply, and a fraction
+#   "stall_rate" waits "stall" seconds longer before the first chunk.
+#
+#   Timing: the first chunk is sent after "latency" seconds (or the
+#   model's entry in "model_latency") and each further chunk
+#   "chunk_delay" seconds later. A non-streaming reply is sent once the
+#   last chunk would have been. "distribution" draws the latency of each
+#   request around that value instead:
+#
+#      fixed        always the latency
+#      uniform      latency * (1 +/- spread)
+#      exponential  mean latency
+#      lognormal    median latency, sigma spread (a long right tail)
+#
+#   Random draws are seeded, so every run sees the same sequence.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.fake_gemini_server --port 8765
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/http.server.html
+#   https://ai.google.dev/api/generate-content
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+###############################################################################
+#
+#  Class: FakeGeminiHandler
+#
+###############################################################################
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"     # Keep connections open between requests
+    disable_nagle_algorithm = True    # Headers and body are separate writes
+
+    def do_POST(self):
+        """Replies to generateContent and cachedContents, 404 for anything else."""
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        self.server.record(self.path, body)
+
+        path = self.path.split("?", 1)[0]
+
+        if path.endswith("/cachedContents"):
+            self._send(200, self.server.create_cache(json.loads(body), length))
+            return
+
+        if not (path.endswith(":generateContent") or path.endswith(":streamGenerateContent")):
+            self._not_found()
+            return
+
+        cache_name = json.loads(body).get("cachedContent") if b'"cachedContent"' in body else None
+        cached_length = self.server.cache_length(cache_name)
+
+        if cached_length is None:
+            self._not_found()
+            return
+
+        if self.server.inject_error():
+            self._error(self.server.error_status)
+            return
+
+        chunks = self.server.reply_chunks()
+        latency = self.server.latency_for(path)
+
+        if path.endswith(":streamGenerateContent"):
+            self._stream(chunks, length, cached_length, latency)
+            return
+
+        time.sleep(latency + self.server.chunk_delay * (len(chunks) - 1))
+
+        self._send(200, self._response("".join(chunks), length, cached_length, "STOP"))
+
+    def do_DELETE(self):
+        """Deletes a cachedContents entry."""
+        self.server.record(self.path, b"")
+
+        if self.server.delete_cache(self.path.split("?", 1)[0].split("/v1beta/", 1)[-1]):
+            self._send(200, {})
+        else:
+            self._not_found()
+
+    def _not_found(self):
+        self._send(404, {"error" : {"code" : 404, "message" : "Not found", "status" : "NOT_FOUND"}})
+
+    def _error(self, status:int):
+        self._send(status, {"error" : {"code" : status, "message" : "Injected fault", "status" : "UNAVAILABLE"}})
+
+    def _stream(self, chunks, prompt_length:int, cached_length:int, latency:float):
+        """Server-sent events over chunked transfer encoding."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        time.sleep(latency)
+
+        try:
+            for i, text in enumerate(chunks):
+                if i > 0:
+                    time.sleep(self.server.chunk_delay)
+
+                finish = "STOP" if i == len(chunks) - 1 else None
+                event = f"data: {json.dumps(self._response(text, prompt_length, cached_length, finish))}\r\n\r\n".encode("utf-8")
+                self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+
+            self.wfile.write(b"0\r\n\r\n")
+
+        except (BrokenPipeError, ConnectionResetError):
+            # The client abandoned the stream
+            with self.server._lock:
+                self.server.abandoned += 1
+
+            self.close_connection = True
+
+    @staticmethod
+    def _response(text:str, prompt_length:int, cached_length:int, finish_reason):
+        """One generateContent response; about 4 bytes per token."""
+        candidate = {"content" : {"role" : "model", "parts" : [{"text" : text}]}, "index" : 0}
+
+        if finish_reason:
+            candidate["finishReason"] = finish_reason
+
+        prompt_tokens = (prompt_length + cached_length) // 4
+        usage = {"promptTokenCount" : prompt_tokens, "candidatesTokenCount" : 8, "totalTokenCount" : prompt_tokens + 8}
+
+        if cached_length:
+            usage["cachedContentTokenCount"] = cached_length // 4
+
+        return {"candidates" : [candidate], "usageMetadata" : usage, "modelVersion" : "fake"}
+
+    def _send(self, status:int, payload):
+        data = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Quiet: the benchmarks print their own results."""
+        return
+
+    ###  END OF FAKEGEMINIHANDLER  ###
+
+
+###############################################################################
+#
+#  Class: FakeGeminiServer
+#
+###############################################################################
+
+class FakeGeminiServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, host:str = "127.0.0.1", port:int = 0, latency:float = 0.0, reply_text:str = "Hello from the fake Gemini server.",
+                 chunks:int = 1, chunk_delay:float = 0.0, error_rate:float = 0.0, error_status:int = 503, model_latency = None,
+                 stall_rate:float = 0.0, stall:float = 0.0, distribution:str = "fixed", spread:float = 0.5):
+
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {distribution}")
+
+
+        super().__init__((host, port), FakeGeminiHandler)
+
+        self.latency:float = latency        # Seconds before the first chunk
+        self.model_latency = dict(model_latency or {})  # Model name -> latency, overrides the above
+        self.distribution:str = distribution
+        self.spread:float = spread
+        self.reply_text:str = reply_text
+        self.chunks:int = max(1, chunks)    # Pieces a streamed reply is split into
+        self.chunk_delay:float = chunk_delay
+        self.error_rate:float = error_rate  # Fraction of generate requests that fail
+        self.error_status:int = error_status
+        self.errors:int = 0                 # Faults injected so far
+        self.stall_rate:float = stall_rate  # Fraction of generate requests that stall
+        self.stall:float = stall            # Extra seconds before a stalled request's first chunk
+        self.stalls:int = 0
+        self.abandoned:int = 0              # Streams the client hung up on
+        self._random = random.Random(0)     # Same faults on every run
+
+        self.connections:int = 0            # TCP connections accepted
+        self.request_count:int = 0
+        self.requests = []                  # (path, body) of recent requests
+        self.max_recorded:int = 1000
+        self.caches = {}                    # cachedContents name -> bytes uploaded
+        self._cache_ids = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_request(self):
+        """Counts new connections so the benchmarks can show reuse."""
+        with self._lock:
+            self.connections += 1
+
+        return super().get_request()
+
+    def latency_for(self, path:str) -> float:
+        """Seconds before the first chunk for the model in the request path."""
+        model = path.rsplit("/models/", 1)[-1].split(":", 1)[0]
+        latency = self.model_latency.get(model, self.latency)
+
+        with self._lock:
+            if self.distribution == "uniform":
+                latency *= self._random.uniform(1.0 - self.spread, 1.0 + self.spread)
+            elif self.distribution == "exponential" and latency > 0:
+                latency = self._random.expovariate(1.0 / latency)
+            elif self.distribution == "lognormal":
+                latency *= math.exp(self._random.gauss(0.0, self.spread))
+
+            latency = max(0.0, latency)
+
+            if self.stall_rate and self._random.random() < self.stall_rate:
+                self.stalls += 1
+                latency += self.stall
+
+        return latency
+
+    def reply_chunks(self):
+        """reply_text split into self.chunks roughly equal pieces."""
+        size = -(-len(self.reply_text) // self.chunks)
+
+        return [self.reply_text[i:i + size] for i in range(0, len(self.reply_text), size)] or [""]
+
+    def create_cache(self, request:dict, length:int) -> dict:
+        with self._lock:
+            self._cache_ids += 1
+            name = f"cachedContents/fake-{self._cache_ids}"
+            self.caches[name] = length
+
+        return {"name" : name, "model" : request.get("model", ""), "expireTime" : "2099-01-01T00:00:00Z",
+                "usageMetadata" : {"totalTokenCount" : length // 4}}
+
+    def cache_length(self, name):
+        """Bytes cached under name, 0 for no cache, None if unknown."""
+        if name is None:
+            return 0
+
+        with self._lock:
+            return self.caches.get(name)
+
+    def inject_error(self) -> bool:
+        """Should this request fail?"""
+        with self._lock:
+            if self._random.random() >= self.error_rate:
+                return False
+
+            self.errors += 1
+
+        return True
+
+    def delete_cache(self, name:str) -> bool:
+        with self._lock:
+            return self.caches.pop(name, None) is not None
+
+    def record(self, path:str, body:bytes) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.requests.append((path, body))
+            del self.requests[:-self.max_recorded]
+
+    def start(self):
+        """Serves from a daemon thread and returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name="FakeGeminiServer", daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    ###  END OF FAKEGEMINISERVER  ###
+
+
+###############################################################################
+#
+#  FUNCTION: main()
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Local stand-in for the Gemini API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first chunk")
+    parser.add_argument("--chunks", type=int, default=1, help="Pieces a streamed reply is split into")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of the injected errors")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    parser.add_argument("--stall", type=float, default=0.0, help="Extra seconds a stalled request waits")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed", help="How the latency of each request is drawn")
+    parser.add_argument("--spread", type=float, default=0.5, help="Width of the uniform and lognormal distributions")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(args.host, args.port, args.latency, chunks=args.chunks, chunk_delay=args.chunk_delay,
+                              error_rate=args.error_rate, error_status=args.error_status,
+                              stall_rate=args.stall_rate, stall=args.stall, distribution=args.distribution, spread=args.spread)
+    print(f"Fake Gemini server on {server.url} (set GEMINI_BASE_URL to use it)")
+
+    try :
+        server.serve_forever()
+    except KeyboardInterrupt :
+        pass
+    finally :
+        server.server_close()
+
+    ###  END OF MAIN  ###
+
+
+if __name__ == "__main__" :
+    main()
@@ -0,0 +1,284 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: load_generator.py
+#
+#   PURPOSE:
+#   End-to-end load test of the chat pipeline against the local fake
+#   server. Runs the real recorder, server and LLM threads and plays the
+#   client: messages go into Server_Queue, travel through LLM_In_Queue,
+#   the LLM workers and LLM_Out_Queue, and the replies are read back from
+#   Client_Receive_Queue.
+#
+#   Messages arrive at a Poisson rate (open loop), or one after another
+#   as soon as the previous reply is in (--rate 0, closed loop). Each
+#   message gets its own reply (debouncing and superseding are off), so
+#   replies are matched to messages in order. They all come from the one
+#   console user, whose replies are served one at a time: a rate above
+#   1 / llm.service shows up as a growing llm.queue_wait.
+#
+#   Reports throughput, the end-to-end latency (message sent to reply
+#   received), the time to the first streamed text, and the stage
+#   latencies from global_metrics, at p50/p95/p99. --json saves the same
+#   numbers to compare runs.
+#
+#   Usage (from src_20251204):
+#      python -m benchmarks.load_generator --messages 100 --rate 2 --latency 0.2 --distribution lognormal --stream
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/queue.html
+#   https://en.wikipedia.org/wiki/Poisson_point_process
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import json
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from metrics import Metrics, percentile
+from resilience import RetryPolicy
+from recorder_thread import recorder_thread
+from server_thread import server_thread
+from llm_client_thread import llm_client_thread
+from benchmarks.fake_gemini_server import DISTRIBUTIONS, FakeGeminiServer
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+STAGES = ("llm.queue_wait", "llm.ttft", "llm.service")
+
+
+###############################################################################
+#
+#  FUNCTION: run()
+#
+###############################################################################
+
+def run(args) :
+    """Plays the load and returns the results as a dict."""
+    global_variables.global_metrics = Metrics()
+    global_variables.global_history = ConversationLog()
+    global_variables.global_history_store = None
+    global_variables.STREAM_REPLIES = args.stream
+    global_variables.LLM_WORKERS = args.workers
+    global_variables.DEBOUNCE_MS = 0
+    global_variables.SUPERSEDE_REPLIES = False
+    global_variables.STOP_EVENT.clear()
+
+    # Short backoffs so injected errors are retried within the run
+    global_variables.global_retry_policy = RetryPolicy(deadline=10.0, max_attempts=5, base_delay=0.02, max_delay=0.2)
+
+    threads = [threading.Thread(target=target, name=name) for name, target in
+               (("Recorder", recorder_thread), ("Server", server_thread), ("LLM", llm_client_thread))]
+
+    for thread in threads :
+        thread.start()
+
+    sent = []                       # perf_counter time each message was put on Server_Queue
+    first_text = {}                 # message -> seconds to the first streamed chunk
+    done = {}                       # message -> seconds to the reply
+    errors = 0
+    replied = threading.Semaphore(0)
+
+    def send() :
+        pause = random.Random(1)
+
+        for i in range(args.messages) :
+            sent.append(time.perf_counter())
+            global_variables.Server_Queue.put(f"Load message {i}")
+
+            if args.rate > 0 :
+                time.sleep(pause.expovariate(args.rate))
+            else :
+                replied.acquire()
+
+    sender = threading.Thread(target=send, name="Load")
+    sender.start()
+
+    deadline = time.perf_counter() + args.timeout
+
+    while len(done) < args.messages and time.perf_counter() < deadline :
+        try :
+            item = global_variables.Client_Receive_Queue.get(timeout=0.1)
+        except queue.Empty :
+            continue
+
+        now = time.perf_counter()
+
+        # Echoes of the messages and server notices have no kind
+        if len(item) < 4 :
+            continue
+
+        kind = item[2]
+        current = len(done)
+
+        if kind == "partial" and current not in first_text :
+            first_text[current] = now - sent[current]
+
+        elif kind in ("final", "error") :
+            done[current] = now - sent[current]
+            errors += kind == "error"
+            replied.release()
+
+    elapsed = time.perf_counter() - sent[0] if sent else 0.0
+
+    global_variables.STOP_EVENT.set()
+
+    for _ in range(args.messages) :
+        replied.release()
+
+    sender.join()
+
+    for thread in threads :
+        thread.join()
+
+    def summary(values) :
+        ordered = sorted(values)
+
+        return {"count" : len(ordered), **{f"p{p}" : percentile(ordered, p) for p in (50, 95, 99)}}
+
+    metrics = global_variables.global_metrics
+
+    return {
+        "messages" : args.messages,
+        "replies" : len(done),
+        "errors" : errors,
+        "seconds" : elapsed,
+        "throughput" : len(done) / elapsed if elapsed else 0.0,
+        "end_to_end" : summary(done.values()),
+        "first_text" : summary(first_text.values()),
+        "stages" : {name : summary(metrics.samples(name)) for name in STAGES},
+    }
+
+    ###  END OF RUN  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="End-to-end load test of the chat pipeline.")
+    parser.add_argument("--messages", type=int, default=100, help="Messages to send")
+    parser.add_argument("--rate", type=float, default=2.0, help="Messages per second, 0 = wait for each reply")
+    parser.add_argument("--workers", type=int, default=4, help="LLM_WORKERS")
+    parser.add_argument("--stream", action="store_true", help="Streamed replies")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first chunk")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal", help="How each latency is drawn")
+    parser.add_argument("--spread", type=float, default=0.5, help="Width of the distribution")
+    parser.add_argument("--chunks", type=int, default=5, help="Pieces a streamed reply is split into")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for the replies")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    console = Console(width=110)
+
+    server = FakeGeminiServer(latency=args.latency, reply_text="A reply from the load test. " * 4, chunks=args.chunks,
+                              chunk_delay=args.chunk_delay, error_rate=args.error_rate,
+                              distribution=args.distribution, spread=args.spread).start()
+
+    instructions = os.path.join(tempfile.mkdtemp(), "instructions.txt")
+
+    with open(instructions, "w", encoding="utf-8") as f :
+        f.write("Be brief.")
+
+    global_variables.global_instructions_file = instructions
+    global_variables.GEMINI_BASE_URL = server.url
+    global_variables.API_KEY = "benchmark"
+    global_variables.console = Console(quiet=True)
+
+    try :
+        results = run(args)
+    finally :
+        server.stop()
+
+    results["gemini_requests"] = server.request_count
+    results["injected_errors"] = server.errors
+
+    table = Table(title=f"{results['replies']}/{args.messages} replies in {results['seconds']:.1f} s: "
+                        f"{results['throughput']:.1f} replies/s, {results['errors']} errors, "
+                        f"{server.request_count} Gemini requests", box=box.ASCII)
+    table.add_column("Latency")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+
+    rows = [("End to end", results["end_to_end"]), ("First text", results["first_text"])] + list(results["stages"].items())
+
+    for name, values in rows :
+        table.add_row(name, str(values["count"]), *[f"{values[p] * 1000:.0f}" for p in ("p50", "p95", "p99")])
+
+    console.print(table)
+
+    if args.json :
+        with open(args.json, "w", encoding="utf-8") as f :
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###
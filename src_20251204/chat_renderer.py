@@ -0,0 +1,260 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: chat_renderer.py
+#
+#   PURPOSE:
+#   Draws the conversation for client_receive_thread, so that a new
+#   message costs the same however long the session has been.
+#
+#   "scroll" (default): each new row is printed on its own with the
+#   chat table's column layout, its top edge left out so it continues
+#   the rows above. Replies being streamed are shown below in a
+#   transient Live view until they are final.
+#
+#   "window": a Live view redraws the last rows (and the replies being
+#   streamed) at most refresh_per_second times a second, in place of
+#   the scrolling transcript.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://rich.readthedocs.io/en/stable/live.html
+#   https://rich.readthedocs.io/en/stable/tables.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import itertools
+
+from rich.console import Group
+from rich.live import Live
+from rich.segment import Segments
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+VIEWS = ("scroll", "window")
+
+
+###############################################################################
+#
+#  Class: ChatRenderer
+#
+###############################################################################
+
+class ChatRenderer:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     console - rich Console to draw on
+    #     view - One of VIEWS
+    #     rows - Rows the window view shows
+    #     refresh_per_second - Most redraws a second, window view
+    #     backlog - Rows of earlier sessions, (sender, message,
+    #               timestamp) markup; shown with the first new row
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, console, view:str = "scroll", rows:int = 20, refresh_per_second:float = 4.0, backlog = ()):
+
+        self.console = console
+        self.view:str = view if view in VIEWS else "scroll"
+        self.refresh_per_second:float = max(0.1, refresh_per_second)
+
+        self._pending = list(backlog)
+        self._printed:bool = False          # Scroll view: a table edge is already on screen
+        self._window = collections.deque(maxlen=max(1, rows))
+        self._streams = None                # Renderable of the replies being streamed
+        self._live = None
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: table()
+    #
+    #  Description:
+    #     An empty chat table; every view uses this layout.
+    #
+    ######################################################
+
+    @staticmethod
+    def table() -> Table:
+
+        table = Table(box=box.ASCII, show_header=False, show_edge=True, show_lines=True, leading=2)
+        table.add_column("Sender",  no_wrap=True,    width=20, justify="right")
+        table.add_column("Message", no_wrap=False,   width=55, justify="left")
+        table.add_column("Timestamp", no_wrap=True, width=25, justify="center")
+
+        return table
+
+    ###  END OF TABLE()  ###
+
+
+    #####################################################
+    #
+    #  Function: add()
+    #
+    #  Description:
+    #     Shows one new row.
+    #
+    #  Parameters:
+    #     sender, message, timestamp - Cell markup
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def add(self, sender:str, message:str, timestamp:str) -> None:
+
+        self._pending.append((sender, message, timestamp))
+        rows, self._pending = self._pending, []
+
+        if self.view == "window":
+            self._window.extend(rows)
+            self._show_live()
+            return
+
+        table = self.table()
+
+        for row in rows:
+            table.add_row(*row)
+
+        # The bottom edge of the rows above already separates them
+        lines = self.console.render_lines(table, pad=False, new_lines=True)
+
+        if self._printed:
+            lines = lines[1:]
+
+        self.console.print(Segments(itertools.chain.from_iterable(lines)), end="")
+        self._printed = True
+
+        return
+
+    ###  END OF ADD()  ###
+
+
+    #####################################################
+    #
+    #  Function: streaming()
+    #
+    #  Description:
+    #     Shows the replies being streamed, below the rows.
+    #
+    #  Parameters:
+    #     renderable - What to show, or None once none is left
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def streaming(self, renderable) -> None:
+
+        self._streams = renderable
+
+        if self.view == "window":
+            self._show_live()
+            return
+
+        if renderable is None:
+            self._stop_live()
+            return
+
+        if self._live is None:
+            self._live = Live(console=self.console, auto_refresh=False, transient=True)
+            self._live.start()
+
+        self._live.update(renderable, refresh=True)
+
+        return
+
+    ###  END OF STREAMING()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        self._stop_live()
+
+    ###  END OF CLOSE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _show_live() / _stop_live()
+    #
+    #  Description:
+    #     The window view's Live redraws on its own timer, so updating
+    #     it faster than refresh_per_second costs nothing on screen.
+    #
+    ######################################################
+
+    def _show_live(self) -> None:
+
+        table = self.table()
+
+        for row in self._window:
+            table.add_row(*row)
+
+        renderable = table if self._streams is None else Group(table, self._streams)
+
+        if self._live is None:
+            self._live = Live(renderable, console=self.console, refresh_per_second=self.refresh_per_second)
+            self._live.start()
+        else:
+            self._live.update(renderable)
+
+    def _stop_live(self) -> None:
+
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+    ###  END OF _SHOW_LIVE() / _STOP_LIVE()  ###
@@ -0,0 +1,580 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Clients may name a session; broadcasts go to the clients in it
+#  2026-10-18   agent          The ready event may be passed in
+#  2026-10-18   agent          /stop stops the reply in the client's session
+#  2026-10-18   agent          Flush a closing client's outbox; the console claims its name with claim_console_name()
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: chat_server.py
+#
+#   PURPOSE:
+#   Network front end, so remote clients share one Willow host. Each
+#   connection is a client with its own username; its messages go into
+#   Server_Queue like the console user's and take the same path through
+#   the server, recorder and LLM threads. Replies to different users are
+#   generated side by side.
+#
+#   A client that names a session in its hello talks in that
+#   conversation (see session_manager.py); otherwise it joins the main
+#   one with the console user. Everything the server shows is broadcast
+#   to every client in the conversation.
+#
+#   The protocol is one JSON object per line over TCP.
+#
+#   Client to server:
+#      {"type": "hello", "username": "Ann"}     first line, joins the chat
+#      {"type": "hello", "username": "Ann", "session": "team-a"}
+#      {"type": "message", "text": "..."}
+#      {"type": "stop"}                          the /stop command
+#      {"type": "quit"}
+#
+#   Server to client:
+#      {"type": "welcome", "username": "Ann", "llm": "Willow", "session": ...}
+#      {"type": "message", "speaker": ..., "text": ..., "kind": ...,
+#       "conversation": ..., "timestamp": ...}   kind as in Client_Receive_Queue
+#      {"type": "error", "text": ...}            and the connection closes
+#
+#   Backpressure: each client has a bounded send queue, written out as
+#   fast as the socket drains. Once it is half full, streamed chunks to
+#   that client are dropped (the final reply still arrives whole) and
+#   its next message is not read until it catches up. A client whose
+#   queue fills up is disconnected, so one slow client never holds up
+#   the others. A client that quits or is closed at shutdown is sent
+#   what is left in its queue first, for at most CLOSE_TIMEOUT.
+#
+#   Usernames are unique, the console user's included. The console
+#   claims its name with claim_console_name() once it has been typed,
+#   which fails if a client already has it.
+#
+#   All the clients live on one asyncio event loop, run by
+#   chat_server_thread; broadcast() may be called from any thread.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/asyncio-stream.html
+#   https://jsonlines.org/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from send_to_clients import send_to_clients
+from session_manager import valid_session_id
+from stop_generation import stop_generation
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+HELLO_TIMEOUT:float = 10.0      # Seconds a new connection has to say hello
+CLOSE_TIMEOUT:float = 2.0       # Seconds at shutdown to flush what the clients have not read
+MAX_LINE:int = 64 * 1024        # Longest line a client may send
+MAX_USERNAME:int = 32
+
+
+###############################################################################
+#
+#  FUNCTION: encode()
+#
+###############################################################################
+
+def encode(message:dict) -> bytes :
+    """One protocol line."""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+    ###  END OF ENCODE  ###
+
+
+###############################################################################
+#
+#  Class: Client
+#
+###############################################################################
+
+class Client:
+    """One connected client. Used only on the event loop."""
+
+    def __init__(self, username:str, session_id, writer, send_queue:int):
+
+        self.username:str = username
+        self.session_id = session_id    # None = the main conversation
+        self.writer = writer
+        self.outbox = asyncio.Queue(max(2, send_queue))
+        self.high_water:int = self.outbox.maxsize // 2
+        self.room = asyncio.Event()     # Clear while the client is behind
+        self.room.set()
+        self.sender = None              # Task writing the outbox
+        self.closing = None             # Task flushing the outbox before closing
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: offer()
+    #
+    #  Description:
+    #     Queues a line for the client.
+    #
+    #  Parameters:
+    #     line - Encoded protocol line
+    #     partial - A streamed chunk, which may be dropped
+    #
+    #  Returns:
+    #     False if the client is too far behind to take it
+    #
+    ######################################################
+
+    def offer(self, line:bytes, partial:bool) -> bool:
+
+        if partial and self.outbox.qsize() >= self.high_water:
+            global_variables.global_metrics.increment("chat.dropped_chunks")
+            return True
+
+        try:
+            self.outbox.put_nowait(line)
+        except asyncio.QueueFull:
+            return False
+
+        if self.outbox.qsize() >= self.high_water:
+            self.room.clear()
+
+        return True
+
+    ###  END OF OFFER()  ###
+
+
+    #####################################################
+    #
+    #  Function: send()
+    #
+    #  Description:
+    #     Writes the outbox to the socket, waiting for it to drain.
+    #     outbox.join() returns once everything queued is written.
+    #
+    ######################################################
+
+    async def send(self) -> None:
+
+        while True:
+            line = await self.outbox.get()
+
+            if self.outbox.qsize() < self.high_water:
+                self.room.set()
+
+            self.writer.write(line)
+            await self.writer.drain()
+            self.outbox.task_done()
+
+    ###  END OF SEND()  ###
+
+
+###############################################################################
+#
+#  Class: ChatServer
+#
+###############################################################################
+
+class ChatServer:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     host, port - Where to listen; port 0 picks a free one
+    #     send_queue - Lines queued per client before it is
+    #                  disconnected
+    #     ready - Event to set once listening, or a new one
+    #     console_name - Name of the console user, None if there is none
+    #
+    ######################################################
+
+    def __init__(self, host:str = "127.0.0.1", port:int = 8765, send_queue:int = 256, ready:threading.Event = None,
+                 console_name:str = None):
+
+        self.host:str = host
+        self.port:int = port
+        self.send_queue:int = send_queue
+        self.console_name:str = console_name
+
+        self.clients = {}               # username -> Client
+        self._names = threading.Lock()  # A name is checked and taken in one step
+        self._handlers = set()          # Tasks serving a connection
+        self.ready = ready if ready is not None else threading.Event()  # Set once listening; port is then the real one
+        self._loop = None
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: run()
+    #
+    #  Description:
+    #     Serves until stop_event is set, then disconnects every
+    #     client. Blocks.
+    #
+    ######################################################
+
+    def run(self, stop_event:threading.Event) -> None:
+
+        asyncio.run(self._serve(stop_event))
+
+    async def _serve(self, stop_event:threading.Event) -> None:
+
+        server = await asyncio.start_server(self._connected, self.host, self.port, limit=MAX_LINE)
+        self.port = server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self.ready.set()
+
+        async with server:
+            await asyncio.to_thread(stop_event.wait)
+
+            self._loop = None
+
+            for client in list(self.clients.values()):
+                self._close(client)
+
+            # Let the handlers see their connection end, dropping whatever
+            # a client still has not read after CLOSE_TIMEOUT
+            if self._handlers:
+                _, stuck = await asyncio.wait(self._handlers, timeout=CLOSE_TIMEOUT)
+
+                for task in stuck:
+                    task.cancel()
+
+                await asyncio.gather(*stuck, return_exceptions=True)
+
+    ###  END OF RUN()  ###
+
+
+    #####################################################
+    #
+    #  Function: broadcast()
+    #
+    #  Description:
+    #     Shows an item to every client in a conversation. Thread
+    #     safe.
+    #
+    #  Parameters:
+    #     item - [speaker, message] or [speaker, message, kind,
+    #            conversation], as read from Client_Receive_Queue
+    #     session_id - The conversation, None for the main one
+    #
+    ######################################################
+
+    def broadcast(self, item, session_id = None) -> None:
+
+        loop = self._loop
+
+        if loop is None:
+            return
+
+        kind = item[2] if len(item) > 2 else "final"
+        line = encode({"type" : "message", "speaker" : item[0], "text" : item[1], "kind" : kind,
+                       "conversation" : item[3] if len(item) > 3 else None,
+                       "timestamp" : datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+        try:
+            loop.call_soon_threadsafe(self._offer_all, line, kind == "partial", session_id)
+        except RuntimeError:
+            pass    # Shutting down
+
+    def _offer_all(self, line:bytes, partial:bool, session_id) -> None:
+
+        for client in list(self.clients.values()):
+            if client.session_id != session_id:
+                continue
+
+            if not client.offer(line, partial):
+                global_variables.global_metrics.increment("chat.too_slow")
+                self._close(client, abort=True)
+
+    ###  END OF BROADCAST()  ###
+
+
+    #####################################################
+    #
+    #  Function: claim_console_name()
+    #
+    #  Description:
+    #     Claims a name for the console user, in place of the one
+    #     it had. Thread safe.
+    #
+    #  Returns:
+    #     False if a client or Willow already has the name
+    #
+    ######################################################
+
+    def claim_console_name(self, username:str) -> bool:
+
+        with self._names:
+            if username in self._taken() and username != self.console_name:
+                return False
+
+            self.console_name = username
+
+        return True
+
+    def _taken(self) -> set:
+
+        taken = set(self.clients) | {"Server", global_variables.LLM_USERNAME}
+
+        if self.console_name is not None:
+            taken.add(self.console_name)
+
+        return taken
+
+    ###  END OF CLAIM_CONSOLE_NAME()  ###
+
+
+    #####################################################
+    #
+    #  Function: _connected()
+    #
+    #  Description:
+    #     Serves one connection, from its hello to its end.
+    #
+    ######################################################
+
+    async def _connected(self, reader, writer) -> None:
+
+        client = None
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+
+        try:
+            username, session_id, problem = await self._hello(reader)
+
+            if problem is None:
+                client = Client(username, session_id, writer, self.send_queue)
+
+                # The console may be claiming a name meanwhile
+                with self._names:
+                    if username in self._taken():
+                        problem = f"The name {username} is taken."
+                    else:
+                        self.clients[username] = client
+
+            if problem is not None:
+                client = None
+                writer.write(encode({"type" : "error", "text" : problem}))
+                await writer.drain()
+                return
+
+            client.sender = asyncio.create_task(client.send())
+            global_variables.global_metrics.increment("chat.clients")
+
+            client.offer(encode({"type" : "welcome", "username" : username, "llm" : global_variables.LLM_USERNAME,
+                                 "session" : session_id}), False)
+            send_to_clients(["Server", f"*** {username} joined the chat. ***"], session_id)
+
+            while True:
+                # A client that is not reading its replies does not get to send more
+                await client.room.wait()
+
+                line = await reader.readline()
+
+                if not line or not self._received(client, line):
+                    break
+
+        except (ConnectionError, asyncio.TimeoutError, ValueError):
+            pass    # Gone, silent or sent a line over MAX_LINE
+
+        except asyncio.CancelledError:
+            writer.transport.abort()    # Shutting down, the client is not reading
+
+        finally:
+            self._handlers.discard(handler)
+
+            if client is None:
+                writer.close()
+            else:
+                self._close(client)
+                send_to_clients(["Server", f"*** {client.username} left the chat. ***"], client.session_id)
+
+    ###  END OF _CONNECTED()  ###
+
+
+    #####################################################
+    #
+    #  Function: _hello()
+    #
+    #  Returns:
+    #     (username, session or None, None), or (None, None, why it
+    #     is refused)
+    #
+    ######################################################
+
+    async def _hello(self, reader):
+
+        line = await asyncio.wait_for(reader.readline(), HELLO_TIMEOUT)
+
+        try:
+            hello = json.loads(line)
+        except ValueError:
+            hello = None
+
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            return None, None, "Expected a hello."
+
+        username = str(hello.get("username", "")).strip()
+        session_id = hello.get("session") or None
+
+        if not username or len(username) > MAX_USERNAME:
+            return None, None, f"A username is 1 to {MAX_USERNAME} characters."
+
+        if session_id is not None and not valid_session_id(session_id):
+            return None, None, "A session is 1 to 64 letters, digits, '-' or '_'."
+
+        # Whether the name is free is decided when it is taken, in _connected()
+        return username, session_id, None
+
+    ###  END OF _HELLO()  ###
+
+
+    #####################################################
+    #
+    #  Function: _received()
+    #
+    #  Description:
+    #     Acts on one line from a client.
+    #
+    #  Returns:
+    #     False once the client quits
+    #
+    ######################################################
+
+    def _received(self, client:Client, line:bytes) -> bool:
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+
+        kind = request.get("type") if isinstance(request, dict) else None
+
+        if kind == "quit":
+            return False
+
+        if kind == "stop":
+            if not stop_generation(client.session_id):
+                self._notice(client, "*** Nothing to stop. ***")
+            return True
+
+        if kind == "message":
+            text = request.get("text")
+
+            if isinstance(text, str) and text.strip():
+                global_variables.Server_Queue.put((client.username, text, client.session_id))
+            return True
+
+        self._notice(client, "*** Not understood. ***")
+
+        return True
+
+    def _notice(self, client:Client, text:str) -> None:
+
+        client.offer(encode({"type" : "message", "speaker" : "Server", "text" : text, "kind" : "final", "conversation" : None,
+                             "timestamp" : datetime.now().strftime("%Y-%m-%d %H:%M:%S")}), False)
+
+    ###  END OF _RECEIVED()  ###
+
+
+    #####################################################
+    #
+    #  Function: _close()
+    #
+    #  Description:
+    #     Ends a client; its handler then reads the end of the
+    #     connection and announces it left. Called on the event loop.
+    #
+    #  Parameters:
+    #     client - The client
+    #     abort - Drop what the client has not read yet instead
+    #             of flushing it first
+    #
+    ######################################################
+
+    def _close(self, client:Client, abort:bool = False) -> None:
+
+        if self.clients.get(client.username) is client:
+            del self.clients[client.username]
+
+        client.room.set()
+
+        if abort:
+            if client.sender is not None:
+                client.sender.cancel()
+
+            client.writer.transport.abort()
+
+        elif client.closing is None:
+            client.closing = asyncio.get_running_loop().create_task(self._flush(client))
+
+    async def _flush(self, client:Client) -> None:
+
+        try:
+            # Until the outbox is written, the sender fails or CLOSE_TIMEOUT
+            if client.sender is not None and not client.sender.done():
+                written = asyncio.ensure_future(client.outbox.join())
+                await asyncio.wait({written, client.sender}, timeout=CLOSE_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+                written.cancel()
+
+        finally:
+            if client.sender is not None:
+                client.sender.cancel()
+
+            client.writer.close()
+
+    ###  END OF _CLOSE() / _FLUSH()  ###
@@ -0,0 +1,86 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Sets CHAT_SERVER_READY once listening
+#  2026-10-18   agent          Holds the console user's name for it
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: chat_server_thread.py
+#
+#   PURPOSE:
+#   Runs the ChatServer, so remote clients can join the chat, until
+#   STOP_EVENT is set.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/asyncio-stream.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from chat_server import ChatServer
+
+
+###############################################################################
+#
+#  FUNCTION: chat_server_thread()
+#
+###############################################################################
+
+def chat_server_thread():
+    """Serves remote clients until STOP_EVENT is set."""
+    # The console's name, or the one it has until it is typed; see client_write_thread
+    console_name = global_variables.HUMAN_USERNAME if global_variables.CHAT_CONSOLE else None
+    chat_server = ChatServer(global_variables.CHAT_HOST, global_variables.CHAT_PORT, global_variables.CHAT_SEND_QUEUE,
+                             ready=global_variables.CHAT_SERVER_READY, console_name=console_name)
+
+    # The server thread broadcasts through it
+    global_variables.global_chat_server = chat_server
+
+    try:
+        global_variables.console.print(f"Chat Server: Listening on {global_variables.CHAT_HOST}:{global_variables.CHAT_PORT}.")
+        chat_server.run(global_variables.STOP_EVENT)
+
+    except Exception as e:
+        global_variables.console.print(f"Chat Server error: {e}")
+        global_variables.STOP_EVENT.set()
+
+    finally:
+        global_variables.global_chat_server = None
+
+    global_variables.console.print("Chat Server: Stopped.")
+
+    ###  END OF CHAT_SERVER_THREAD  ###
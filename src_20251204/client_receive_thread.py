@@ -7,6 +7,14 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          History holds TurnRecords
+#  2026-10-18   agent          Show streamed replies progressively in a transient Live view
+#  2026-10-18   agent          An error notice also ends the streamed text
+#  2026-10-18   agent          One streamed line per conversation with a reply in progress
+#  2026-10-18   agent          Drop the streamed text of a superseded reply
+#  2026-10-18   agent          Print only the new rows through a ChatRenderer instead of the whole table
+#  2026-10-18   agent          Idle wait of IDLE_WAIT
+#  2026-10-18   agent          Sets RECEIVE_READY once it has the backlog
 #
 #
 ###############################################################################
@@ -18,7 +26,8 @@
 #   MODULE: client_receive_thread.py
 #
 #   PURPOSE:
-#   Displays messages received from other threads.
+#   Displays messages received from other threads. Drawing is left to a
+#   ChatRenderer, which prints only the new rows.
 #
 #
 ###############################################################################
@@ -44,6 +53,8 @@ from rich.pretty import pprint
 from rich import print
 from rich.table import Table
 from rich import box
+from rich.text import Text
+from rich.console import Group
 
 import threading
 import queue
@@ -67,6 +78,7 @@ import global_variables
 #
 ###############################################################################
 
+from chat_renderer import ChatRenderer
 
 
 ###############################################################################
@@ -80,22 +92,15 @@ def client_receive_thread():
     """Receives and displays messages from the Client_Receive_Queue."""
     #console.print("📥 Client Receiver: Ready to display messages.")
     
-    # --- Table for chat storage
-
-    history = Table(box=box.ASCII, show_header=False, show_edge=True, show_lines=True, leading=2)
-    history.add_column("Sender",  no_wrap=True,    width=20, justify="right")
-    history.add_column("Message", no_wrap=False,   width=55, justify="left")
-    history.add_column("Timestamp", no_wrap=True, width=25, justify="center")
-
     # --- Import our past conversations
 
-    for m in global_variables.global_history :
-        m_timestamp:str = m["timestamp"]
-        m_role:str = m["role"]
-        m_username:str = m["username"]
-        m_parts = m["parts"]
-        m_parts_zero = m_parts[0]
-        m_text:str = m_parts_zero["text"]
+    backlog = []
+
+    for m in global_variables.global_history.snapshot() :
+        m_timestamp:str = m.timestamp_text()
+        m_role:str = m.role
+        m_username:str = m.username
+        m_text:str = m.text
 
         my_color:str = "[white]"
         speaker:str = "Unknown"
@@ -108,16 +113,55 @@ def client_receive_thread():
             my_color:str = "[cyan]"
             speaker:str = f"{global_variables.LLM_USERNAME}"
 
-        history.add_row(f"{my_color}{speaker}", f"{my_color}{m_text}", f"{my_color}{m_timestamp}")
+        backlog.append((f"{my_color}{speaker}", f"{my_color}{m_text}", f"{my_color}{m_timestamp}"))
+
+    # Shown with the first new message
+    renderer = ChatRenderer(global_variables.console, global_variables.CLIENT_VIEW, global_variables.CLIENT_VIEW_ROWS,
+                            global_variables.CLIENT_REFRESH_HZ, backlog)
+
+    global_variables.RECEIVE_READY.set()
+
+
+    # --- Streaming reply in progress, shown below the table until it is final
+
+    streams = {}          # conversation -> text streamed so far
 
+    def streaming() :
+        # One line per reply still being written
+        if not streams :
+            return None
+
+        return Group(*(Text(f"{global_variables.LLM_USERNAME}: {text}", style="cyan") for text in streams.values()))
 
     # --- Main conversation loop
 
     while not global_variables.STOP_EVENT.is_set():
         try:
-            stuff = global_variables.Client_Receive_Queue.get(timeout=0.1)
+            stuff = global_variables.Client_Receive_Queue.get(timeout=global_variables.IDLE_WAIT)
             speaker = stuff[0]
             message = stuff[1]
+            kind = stuff[2] if len(stuff) > 2 else "final"
+            conversation = stuff[3] if len(stuff) > 3 else None
+
+            if kind == "partial" :
+                streams[conversation] = streams.get(conversation, "") + message
+                renderer.streaming(streaming())
+
+                global_variables.Client_Receive_Queue.task_done()
+                continue
+
+            if kind == "cancelled" :
+                # Superseded: a fresh reply follows
+                streams.pop(conversation, None)
+                renderer.streaming(streaming())
+
+                global_variables.Client_Receive_Queue.task_done()
+                continue
+
+            if conversation in streams :
+                # The final reply (or the reason there is none) replaces the streamed text
+                del streams[conversation]
+                renderer.streaming(streaming())
 
             # Overwrite the current input line to display the message cleanly
 
@@ -139,9 +183,7 @@ def client_receive_thread():
             now = datetime.now()
             now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
 
-            history.add_row(f"{my_color}{speaker}", f"{my_color}{message}", f"{my_color}{now_formatted}")
-
-            global_variables.console.print(history)
+            renderer.add(f"{my_color}{speaker}", f"{my_color}{message}", f"{my_color}{now_formatted}")
 
             global_variables.Client_Receive_Queue.task_done()
             
@@ -150,6 +192,8 @@ def client_receive_thread():
         except Exception as e:
             global_variables.console.print(f"Client Receive error: {e}")
             global_variables.STOP_EVENT.set()
+
+    renderer.close()
     
     global_variables.console.print("📥 Client Receiver: Stopped.")
 
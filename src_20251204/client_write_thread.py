@@ -8,6 +8,11 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          '/more' pages in older history (SQLite)
+#  2026-10-18   agent          /stop cancels the reply in progress
+#  2026-10-18   agent          /stop names the main conversation
+#  2026-10-18   agent          Claim the username from the chat server, asking again if a client has it
+#  2026-10-18   agent          '/find' looks up a speaker's messages (SQLite)
 #
 #
 ###############################################################################
@@ -61,6 +66,16 @@ import sys
 import global_variables
 
 
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from load_older_history import find_history, load_older_history
+from stop_generation import stop_generation
+
+
 ###############################################################################
 #
 #  FUNCTION: client_write_thread()
@@ -70,7 +85,19 @@ import global_variables
 # --- 5. The Client Write Component (Input Thread) ---
 def client_write_thread():
     """Reads input and puts messages into Server_Queue."""
-    global_variables.HUMAN_USERNAME = input("Please enter your username: ")
+    while True:
+        username = input("Please enter your username: ")
+
+        # Set before the chat server is looked up: a server created meanwhile
+        # holds this name from the start, one already running is asked for it
+        global_variables.HUMAN_USERNAME = username
+        chat_server = global_variables.global_chat_server
+
+        if chat_server is None or chat_server.claim_console_name(username):
+            break
+
+        global_variables.console.print(f"The name {username} is taken.")
+
     global_variables.console.print(f"\nWelcome, {global_variables.HUMAN_USERNAME}! You are chatting with {global_variables.LLM_USERNAME}. Type 'quit' to exit.\n")
     
     while not global_variables.STOP_EVENT.is_set():
@@ -82,6 +109,34 @@ def client_write_thread():
                 # Send a final system message to the server for cleanup
                 global_variables.Server_Queue.put(f"SYSTEM_QUIT: {global_variables.HUMAN_USERNAME} is leaving.")
                 break
+
+            if user_input.lower() == '/more':
+                # Page older turns of the conversation into memory
+                loaded = load_older_history()
+                global_variables.Client_Receive_Queue.put(["Server", f"*** Loaded {loaded} older messages. ***"])
+                continue
+
+            if user_input.lower().split(" ")[0] == '/find':
+                # A speaker's messages from the whole history: /find <name> [<from day> [<to day>]]
+                args = user_input.split()[1:]
+
+                if not args:
+                    global_variables.Client_Receive_Queue.put(["Server", "*** Usage: /find <name> [YYYY-MM-DD [YYYY-MM-DD]] ***"])
+                    continue
+
+                found = find_history(*args[:3])
+
+                for turn in found:
+                    global_variables.Client_Receive_Queue.put(["Server", f"{turn.timestamp_text()} {turn.username}: {turn.text}"])
+
+                global_variables.Client_Receive_Queue.put(["Server", f"*** Found {len(found)} messages. ***"])
+                continue
+
+            if user_input.lower() == '/stop':
+                # Cut the reply in progress short; it is recorded as stopped
+                if not stop_generation(None):
+                    global_variables.Client_Receive_Queue.put(["Server", "*** Nothing to stop. ***"])
+                continue
                 
             # Put the user's message into the Server's input queue
             global_variables.Server_Queue.put(user_input)
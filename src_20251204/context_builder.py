@@ -0,0 +1,392 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Send summaries in place of summarized turns
+#  2026-10-18   agent          Safe to share between LLM workers
+#  2026-10-18   agent          Window start moved in steps, for the prefix cache
+#  2026-10-18   agent          Keep opening and pinned turns a summary covers when the budget is 0
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: context_builder.py
+#
+#   PURPOSE:
+#   Chooses which turns of the conversation are sent to Gemini, so that the
+#   request stays within a token budget however long the history grows.
+#
+#   Each TurnRecord caches its own token estimate. Estimates start from a
+#   characters-per-token ratio and are corrected with the counts Gemini
+#   reports back in usage_metadata.
+#
+#   Policies (CONTEXT_POLICY):
+#      sliding_window  - the newest turns that fit
+#      keep_first_last - the first CONTEXT_KEEP_FIRST turns plus the newest
+#      pinned          - every pinned turn plus the newest
+#
+#   The newest turn (the message being answered) is always sent.
+#
+#   With a SummaryStore, turns that have been summarized are represented
+#   by the summaries instead (pinned and kept-first turns are still sent
+#   as they are), and only the turns after them are candidates for the
+#   window.
+#
+#   With a window_step the window's oldest turn only moves in steps of
+#   that many turns, giving up to a step of turns that would have fit,
+#   so the front of the request stays the same for a while and a cached
+#   prefix of it keeps matching.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/tokens
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import math
+import threading
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+POLICY_SLIDING_WINDOW:str = "sliding_window"
+POLICY_KEEP_FIRST_LAST:str = "keep_first_last"
+POLICY_PINNED:str = "pinned"
+
+CONTEXT_POLICIES = (POLICY_SLIDING_WINDOW, POLICY_KEEP_FIRST_LAST, POLICY_PINNED)
+
+CHARS_PER_TOKEN:float = 4.0        # Starting ratio, corrected from usage
+TURN_OVERHEAD:int = 4              # Tokens for the role and separators of a turn
+REPLY_TOKENS_KEPT:int = 16         # Exact reply counts waiting for their turn
+
+
+###############################################################################
+#
+#  Class: ContextBuilder
+#
+###############################################################################
+
+class ContextBuilder:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Sets the budget and policy.
+    #
+    #  Parameters:
+    #     token_budget - Tokens per request including the instructions,
+    #                    0 sends the whole history
+    #     policy - One of CONTEXT_POLICIES
+    #     keep_first - Turns kept from the start (keep_first_last)
+    #     summary_store - SummaryStore of older turns, or None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, token_budget:int = 0, policy:str = POLICY_SLIDING_WINDOW, keep_first:int = 2, summary_store = None):
+
+        if policy not in CONTEXT_POLICIES:
+            global_variables.console.print(f"[bold red]Error:[/bold red] Unknown context policy '{policy}', using '{POLICY_SLIDING_WINDOW}'")
+            policy = POLICY_SLIDING_WINDOW
+
+        self.token_budget:int = token_budget
+        self.policy:str = policy
+        self.keep_first:int = keep_first
+        self.summary_store = summary_store
+        self.chars_per_token:float = CHARS_PER_TOKEN
+
+        # Reply text -> token count reported by Gemini. The reply becomes
+        # a TurnRecord only after the recorder has stored it.
+        self._reply_tokens = {}
+
+        # The LLM workers share one builder
+        self._lock = threading.Lock()
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: estimate_text()
+    #
+    #  Description:
+    #     Token estimate for a piece of text.
+    #
+    #  Parameters:
+    #     text - Any text
+    #
+    #  Returns:
+    #     Estimated tokens
+    #
+    ######################################################
+
+    def estimate_text(self, text:str) -> int:
+
+        return math.ceil(len(text) / self.chars_per_token)
+
+    ###  END OF ESTIMATE_TEXT()  ###
+
+
+    #####################################################
+    #
+    #  Function: estimate()
+    #
+    #  Description:
+    #     Token count of a turn as sent, cached on the record. A reply
+    #     whose exact count Gemini reported uses that count.
+    #
+    #  Parameters:
+    #     turn - TurnRecord
+    #
+    #  Returns:
+    #     Tokens
+    #
+    ######################################################
+
+    def estimate(self, turn) -> int:
+
+        if turn.tokens == 0:
+            exact = None
+
+            if turn.role == "model":
+                with self._lock:
+                    exact = self._reply_tokens.pop(turn.text, None)
+
+            if exact is not None:
+                prefix = len(turn.context_text()) - len(turn.text)
+                turn.tokens = exact + math.ceil(prefix / self.chars_per_token) + TURN_OVERHEAD
+            else:
+                turn.tokens = self.estimate_text(turn.context_text()) + TURN_OVERHEAD
+
+        return turn.tokens
+
+    ###  END OF ESTIMATE()  ###
+
+
+    #####################################################
+    #
+    #  Function: build()
+    #
+    #  Description:
+    #     Picks the turns to send according to the policy.
+    #
+    #  Parameters:
+    #     turns - The conversation, oldest first (ConversationView or list)
+    #     system_instructions - Counted against the budget
+    #     window_step - Turns the window start moves at a time
+    #                   (1 = as far as the budget allows)
+    #
+    #  Returns:
+    #     List of SummaryRecords and TurnRecords, oldest first
+    #
+    ######################################################
+
+    def build(self, turns, system_instructions:str = "", window_step:int = 1):
+
+        count = len(turns)
+        summaries = self._summaries(turns)
+        start = summaries[-1].last + 1 if summaries else 0
+
+        if count == 0:
+            return []
+
+        if self.policy == POLICY_KEEP_FIRST_LAST:
+            head = range(min(self.keep_first, count - 1))
+        elif self.policy == POLICY_PINNED:
+            head = [i for i in range(count - 1) if turns[i].pinned]
+        else:
+            head = ()
+
+        if self.token_budget <= 0:
+            # Everything, with the head turns the summaries stand in for
+            items = [(i, 1, turns[i]) for i in head if i < start] + [(i, 1, turns[i]) for i in range(start, count)] + \
+                    [(summary.first, 0, summary) for summary in summaries]
+            items.sort(key=lambda item: item[:2])
+
+            return [item for _, _, item in items]
+
+        budget = self.token_budget - self.estimate_text(system_instructions)
+
+        # The message being answered goes in whatever it costs
+        selected = {count - 1}
+        used = self.estimate(turns[count - 1])
+
+        # Then the summaries, dropping the oldest if they do not all fit
+        chosen = []
+
+        for summary in reversed(summaries):
+            cost = self.estimate(summary)
+
+            if used + cost > budget:
+                break
+
+            chosen.append(summary)
+            used += cost
+
+        for i in head:
+            cost = self.estimate(turns[i])
+
+            if used + cost > budget:
+                break
+
+            selected.add(i)
+            used += cost
+
+        # Fill with the newest turns, stopping at the first that does not fit
+        # so the recent part of the conversation has no holes
+        stop = len(head) if self.policy == POLICY_KEEP_FIRST_LAST else 0
+        oldest = None
+
+        for i in range(count - 2, max(stop, start) - 1, -1):
+            if i in selected:
+                continue
+
+            cost = self.estimate(turns[i])
+
+            if used + cost > budget:
+                # Start the window on a multiple of the step instead
+                if window_step > 1 and oldest is not None:
+                    edge = -(-oldest // window_step) * window_step
+                    selected.difference_update(set(range(oldest, min(edge, count - 1))) - set(head))
+
+                break
+
+            selected.add(i)
+            used += cost
+            oldest = i
+
+        dropped = count - start - sum(1 for i in selected if i >= start)
+
+        if dropped > 0:
+            global_variables.global_metrics.increment("context.truncated")
+            global_variables.global_metrics.increment("context.turns_dropped", dropped)
+
+        # A summary goes in front of any kept turn it covers
+        items = [(i, 1, turns[i]) for i in selected] + [(summary.first, 0, summary) for summary in chosen]
+        items.sort(key=lambda item: item[:2])
+
+        return [item for _, _, item in items]
+
+    ###  END OF BUILD()  ###
+
+
+    #####################################################
+    #
+    #  Function: _summaries()
+    #
+    #  Description:
+    #     The summary frontier, if it matches these turns and leaves
+    #     the newest turn unsummarized.
+    #
+    ######################################################
+
+    def _summaries(self, turns):
+
+        if self.summary_store is None:
+            return ()
+
+        frontier = self.summary_store.frontier()
+
+        if not frontier or frontier[-1].last >= len(turns) - 1:
+            return ()
+
+        if not all(summary.matches(turns) for summary in frontier):
+            return ()
+
+        return frontier
+
+    ###  END OF _SUMMARIES()  ###
+
+
+    #####################################################
+    #
+    #  Function: record_usage()
+    #
+    #  Description:
+    #     Feeds Gemini's token counts back into the estimates. The
+    #     prompt count covers the instructions plus every turn sent, so
+    #     the cached estimates of those turns are scaled to match it and
+    #     the characters-per-token ratio moves toward the measured one.
+    #     The reply count is kept until the reply is estimated as a turn.
+    #
+    #  Parameters:
+    #     sent_turns - The list returned by build()
+    #     system_instructions - The instructions sent with them
+    #     usage - response.usage_metadata (may be None)
+    #     reply_text - The reply the usage belongs to
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def record_usage(self, sent_turns, system_instructions:str, usage, reply_text:str = "") -> None:
+
+        if usage is None:
+            return
+
+        prompt_tokens = usage.prompt_token_count or 0
+        reply_tokens = usage.candidates_token_count or 0
+
+        estimated = sum(self.estimate(turn) for turn in sent_turns)
+        measured = prompt_tokens - self.estimate_text(system_instructions)
+
+        with self._lock:
+            if estimated > 0 and measured > 0:
+                ratio = measured / estimated
+
+                for turn in sent_turns:
+                    turn.tokens = max(1, round(turn.tokens * ratio))
+
+                # Smoothed, so one odd reply does not swing the estimates
+                self.chars_per_token = min(10.0, max(1.0, (self.chars_per_token + self.chars_per_token / ratio) / 2))
+
+            if reply_tokens > 0 and reply_text:
+                if len(self._reply_tokens) >= REPLY_TOKENS_KEPT:
+                    self._reply_tokens.pop(next(iter(self._reply_tokens)))
+
+                self._reply_tokens[reply_text] = reply_tokens
+
+        return
+
+    ###  END OF RECORD_USAGE()  ###
@@ -0,0 +1,152 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: conversation_log.py
+#
+#   PURPOSE:
+#   Append-only log of TurnRecords. Readers take a snapshot view instead
+#   of deep-copying the conversation under a lock.
+#
+#   A view is just (list, start, stop). Turns are only ever added after
+#   the end of the list, so the items a view covers never change and
+#   every view can share the same list. Prepending older turns (paged in
+#   from SQLite) builds a new list, leaving existing views untouched.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import threading
+
+
+###############################################################################
+#
+#  Class: ConversationView
+#
+###############################################################################
+
+class ConversationView:
+    """Immutable, length-bounded view of a ConversationLog.
+
+    Supports len(), iteration, indexing and slicing. Slicing returns
+    another view over the same list, so it costs O(1).
+    """
+
+    __slots__ = ("_turns", "_start", "_stop")
+
+    def __init__(self, turns:list, start:int, stop:int):
+        self._turns = turns
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __iter__(self):
+        turns = self._turns
+        for i in range(self._start, self._stop):
+            yield turns[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+
+            return ConversationView(self._turns, self._start + start, self._start + max(start, stop))
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("conversation view index out of range")
+
+        return self._turns[self._start + index]
+
+    def tail(self, count:int) -> "ConversationView":
+        """The last count turns of this view."""
+        return self[max(0, len(self) - count):]
+
+    def __repr__(self) -> str:
+        return f"ConversationView({len(self)} turns)"
+
+
+###############################################################################
+#
+#  Class: ConversationLog
+#
+###############################################################################
+
+class ConversationLog:
+    """Append-only conversation shared between threads.
+
+    Only writers (the recorder, paging in older turns) take the lock.
+    snapshot() is lock-free: it reads the current list and its length,
+    both of which are single atomic operations in CPython.
+    """
+
+    def __init__(self, turns = None):
+        self._turns = list(turns) if turns else []
+        self._lock = threading.Lock()
+
+        # Turns appended since startup; the saver compares generations to
+        # find out whether anything changed.
+        self.generation:int = 0
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def append(self, turns) -> int:
+        """Adds turns at the end. Returns the index of the first one."""
+        with self._lock:
+            first = len(self._turns)
+            self._turns.extend(turns)
+            self.generation += len(turns)
+
+        return first
+
+    def prepend(self, turns) -> None:
+        """Adds older turns in front (copy-on-write)."""
+        with self._lock:
+            self._turns = list(turns) + self._turns
+
+    def snapshot(self) -> ConversationView:
+        """A view of every turn recorded so far."""
+        turns = self._turns
+        return ConversationView(turns, 0, len(turns))
+
+    def snapshot_with_generation(self):
+        """A view plus the generation it corresponds to."""
+        with self._lock:
+            return self.snapshot(), self.generation
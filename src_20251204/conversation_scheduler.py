@@ -0,0 +1,313 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Debounce bursts into one request; cancel the request a newer one supersedes
+#  2026-10-18   agent          stop() for the /stop command; Cancellation carries the reason
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: conversation_scheduler.py
+#
+#   PURPOSE:
+#   Hands LLM requests to the worker pool. Requests of one conversation
+#   are served one at a time, in the order they arrived; requests of
+#   different conversations run side by side.
+#
+#   Each conversation has its own FIFO. A conversation is "ready" when
+#   it has requests, none of them is being worked on and the burst at
+#   the front of its queue (requests at most "debounce" seconds apart)
+#   has ended. A worker takes the longest waiting ready conversation
+#   with that whole burst, so lines typed in quick succession become one
+#   Gemini call, and calls done() when finished. With supersede on, the
+#   whole queue is taken: the reply is built from the history, which
+#   already holds every queued message.
+#
+#   A request arriving while its conversation is being worked on cancels
+#   the current one (CANCEL_SUPERSEDED), so the worker can drop a reply
+#   that is about to be superseded. stop() cancels it with CANCEL_STOPPED
+#   and drops the queued ones, for the /stop command.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html#condition-objects
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import threading
+import time
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+CANCEL_SUPERSEDED:str = "superseded"   # A newer message will be answered instead
+CANCEL_STOPPED:str = "stopped"         # The user asked to stop
+
+
+###############################################################################
+#
+#  Class: Cancellation
+#
+###############################################################################
+
+class Cancellation(threading.Event):
+    """Set when the request it was handed out with should be abandoned.
+
+    Attributes:
+        reason: CANCEL_SUPERSEDED or CANCEL_STOPPED, None until cancelled
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reason = None
+
+    def cancel(self, reason:str) -> None:
+        self.reason = reason
+        self.set()
+
+
+###############################################################################
+#
+#  Class: ConversationScheduler
+#
+###############################################################################
+
+class ConversationScheduler:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     debounce - Seconds a conversation must be quiet before its
+    #                requests are handed out
+    #     supersede - Cancel the request in flight when a newer one
+    #                 of the same conversation arrives
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, debounce:float = 0.0, supersede:bool = False):
+
+        self.debounce:float = max(0.0, debounce)
+        self.supersede:bool = supersede
+
+        self._cond = threading.Condition()
+        self._pending = {}                      # conversation -> deque of (item, submitted), oldest first
+        self._busy = {}                         # conversation being worked on -> its Cancellation
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: submit()
+    #
+    #  Description:
+    #     Queues a request behind the earlier ones of its conversation.
+    #
+    #  Parameters:
+    #     conversation - Key of the conversation (any hashable)
+    #     item - The request
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def submit(self, conversation, item) -> None:
+
+        with self._cond:
+            self._pending.setdefault(conversation, collections.deque()).append((item, time.perf_counter()))
+
+            if self.supersede and conversation in self._busy:
+                self._busy[conversation].cancel(CANCEL_SUPERSEDED)
+
+            self._cond.notify()
+
+        return
+
+    ###  END OF SUBMIT()  ###
+
+
+    #####################################################
+    #
+    #  Function: take()
+    #
+    #  Description:
+    #     Waits for a ready conversation and takes all its requests.
+    #     The caller must call done() with the conversation afterwards.
+    #
+    #  Parameters:
+    #     timeout - Seconds to wait
+    #
+    #  Returns:
+    #     (conversation, items oldest first, perf_counter time the first
+    #     was submitted, Cancellation), or None
+    #
+    ######################################################
+
+    def take(self, timeout:float):
+
+        end = time.perf_counter() + timeout
+
+        with self._cond:
+            while True:
+                now = time.perf_counter()
+                due = end
+
+                for conversation, pending in self._pending.items():
+                    if conversation in self._busy:
+                        continue
+
+                    burst = len(pending) if self.supersede else self._burst(pending)
+
+                    # A burst followed by a later request has already ended
+                    quiet_at = pending[burst - 1][1] + self.debounce if burst == len(pending) else now
+
+                    if quiet_at <= now:
+                        submitted = pending[0][1]
+                        items = [pending.popleft()[0] for _ in range(burst)]
+
+                        if not pending:
+                            del self._pending[conversation]
+
+                        cancel = self._busy[conversation] = Cancellation()
+
+                        return conversation, items, submitted, cancel
+
+                    due = min(due, quiet_at)
+
+                if now >= end:
+                    return None
+
+                self._cond.wait(due - now)
+
+    ###  END OF TAKE()  ###
+
+
+    #####################################################
+    #
+    #  Function: stop()
+    #
+    #  Description:
+    #     Cancels the request being worked on for a conversation and
+    #     drops the ones still queued.
+    #
+    #  Parameters:
+    #     conversation - Key of the conversation
+    #
+    #  Returns:
+    #     True if anything was stopped or dropped
+    #
+    ######################################################
+
+    def stop(self, conversation) -> bool:
+
+        with self._cond:
+            dropped = self._pending.pop(conversation, None)
+            cancel = self._busy.get(conversation)
+
+            if cancel is not None:
+                cancel.cancel(CANCEL_STOPPED)
+
+        return bool(dropped) or cancel is not None
+
+    ###  END OF STOP()  ###
+
+
+    #####################################################
+    #
+    #  Function: _burst()
+    #
+    #  Description:
+    #     Number of requests at the front of the queue that arrived at
+    #     most self.debounce seconds after the one before.
+    #
+    ######################################################
+
+    def _burst(self, pending) -> int:
+
+        count = 1
+
+        while count < len(pending) and pending[count][1] - pending[count - 1][1] <= self.debounce:
+            count += 1
+
+        return count
+
+    ###  END OF _BURST()  ###
+
+
+    #####################################################
+    #
+    #  Function: done()
+    #
+    #  Description:
+    #     Releases the conversation taken by take().
+    #
+    #  Parameters:
+    #     conversation - As returned by take()
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def done(self, conversation) -> None:
+
+        with self._cond:
+            del self._busy[conversation]
+
+            if conversation in self._pending:
+                self._cond.notify()
+
+        return
+
+    ###  END OF DONE()  ###
+
+
+    #####################################################
+    #
+    #  Function: waiting()
+    #
+    #  Description:
+    #     Number of requests not yet taken by a worker.
+    #
+    ######################################################
+
+    def waiting(self) -> int:
+
+        with self._cond:
+            return sum(len(pending) for pending in self._pending.values())
+
+    ###  END OF WAITING()  ###
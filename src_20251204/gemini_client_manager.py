@@ -0,0 +1,216 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Optional network timeout
+#  2026-10-18   agent          timed(): a config limited to what is left of the deadline
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: gemini_client_manager.py
+#
+#   PURPOSE:
+#   Owns one long-lived Gemini client for the LLM thread. The client keeps
+#   its HTTP connections alive between turns, so only the first request
+#   pays for connection and TLS setup. Request configs are cached per
+#   instructions text.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://googleapis.github.io/python-genai/
+#   https://www.python-httpx.org/advanced/resource-limits/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import threading
+
+import httpx
+
+from google import genai
+from google.genai import types
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+CONFIG_CACHE_SIZE:int = 8          # Distinct instruction texts kept
+
+
+###############################################################################
+#
+#  Class: GeminiClientManager
+#
+###############################################################################
+
+class GeminiClientManager:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Creates the client with a keep-alive connection pool.
+    #
+    #  Parameters:
+    #     api_key - Gemini API key
+    #     base_url - Alternative endpoint (local stand-in server), or None
+    #     max_connections - Connection pool size
+    #     keepalive_expiry - Seconds an idle connection is kept open
+    #     timeout - Seconds to wait on the network per attempt, or None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, api_key:str, base_url = None, max_connections:int = 4, keepalive_expiry:float = 120.0,
+                 timeout = None):
+
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_connections,
+                              keepalive_expiry=keepalive_expiry)
+
+        http_options = types.HttpOptions(client_args={"limits" : limits})
+
+        if base_url:
+            http_options.base_url = base_url
+
+        # A hung connection must fail so the retry policy can act on it
+        if timeout:
+            http_options.timeout = int(timeout * 1000)
+
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+
+        self._configs = {}
+        self._lock = threading.Lock()
+        self._closed:bool = False
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: config()
+    #
+    #  Description:
+    #     Returns the GenerateContentConfig for these instructions,
+    #     building it only the first time.
+    #
+    #  Parameters:
+    #     system_instructions - The system prompt text
+    #
+    #  Returns:
+    #     types.GenerateContentConfig
+    #
+    ######################################################
+
+    def config(self, system_instructions:str) -> types.GenerateContentConfig:
+
+        with self._lock:
+            config = self._configs.get(system_instructions)
+
+            if config is None:
+                if len(self._configs) >= CONFIG_CACHE_SIZE:
+                    # Oldest first: dicts keep insertion order
+                    self._configs.pop(next(iter(self._configs)))
+
+                config = types.GenerateContentConfig(system_instruction=system_instructions)
+                self._configs[system_instructions] = config
+
+        return config
+
+    ###  END OF CONFIG()  ###
+
+
+    #####################################################
+    #
+    #  Function: timed()
+    #
+    #  Description:
+    #     A copy of a config whose request gives up after timeout
+    #     seconds on the network, instead of the client's timeout.
+    #
+    #  Parameters:
+    #     config - GenerateContentConfig, from config() or the
+    #              prefix cache
+    #     timeout - Seconds
+    #
+    #  Returns:
+    #     types.GenerateContentConfig
+    #
+    ######################################################
+
+    def timed(self, config:types.GenerateContentConfig, timeout:float) -> types.GenerateContentConfig:
+
+        return config.model_copy(update={"http_options" : types.HttpOptions(timeout=max(1, int(timeout * 1000)))})
+
+    ###  END OF TIMED()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    #  Description:
+    #     Closes the pooled connections. Safe to call more than once.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+
+        try:
+            self.client.close()
+        except Exception as e:
+            global_variables.console.print(f"Gemini client close error: {e}")
+
+        return
+
+    ###  END OF CLOSE()  ###
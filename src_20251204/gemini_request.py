@@ -0,0 +1,313 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version, from get_gemini_reply() and stream_gemini_reply()
+#  2026-10-18   agent          Rate limit wait and network timeout bounded by the time left
+#  2026-10-18   agent          Window moved in steps while a prefix cache is used
+#  2026-10-18   agent          Hold a lease on the prefix cache until the request is over
+#  2026-10-18   agent          DeadlineExceeded for a reply still streaming at the deadline
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: gemini_request.py
+#
+#   PURPOSE:
+#   One reply request to Gemini, streamed or not. Builds the context,
+#   picks the model, answers from the response cache or sends the turns
+#   after the cached prefix, charges the rate limiter and retries through
+#   the RetryPolicy; then records the latency, token usage and reply.
+#
+#   get_gemini_reply() and stream_gemini_reply() differ only in the call
+#   made: a whole reply is handled as a stream of one chunk.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/text-generation#streaming
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import time
+
+from google.genai import errors
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from gemini_client_manager import GeminiClientManager
+from context_builder import ContextBuilder
+from prefix_cache import PrefixCache
+from response_cache import ResponseCache
+from resilience import DeadlineExceeded, LLMUnavailableError, RequestCancelled, RetryPolicy
+from rate_limiter import RateLimiter, PRIORITY_INTERACTIVE
+from model_router import ModelRouter
+from conversation_log import ConversationLog
+
+
+###############################################################################
+#
+#  FUNCTION: gemini_request
+#
+###############################################################################
+
+def gemini_request(sender:str, user_prompt: str, system_instructions: str, stream: bool = False, on_chunk = None,
+                   model_name: str = None, client_manager: GeminiClientManager = None,
+                   context_builder: ContextBuilder = None, prefix_cache: PrefixCache = None,
+                   response_cache: ResponseCache = None, retry_policy: RetryPolicy = None,
+                   rate_limiter: RateLimiter = None, cancel = None, model_router: ModelRouter = None,
+                   history: ConversationLog = None) -> str:
+    """
+    Asks the Gemini model for a reply to the conversation.
+
+    Args:
+        sender: Who sent the prompt.
+        user_prompt: The main input/question from the user.
+        system_instructions: The instructions to guide the model's behavior.
+        stream: Ask for the reply in chunks as it is generated.
+        on_chunk: Called with each non-empty piece of reply text, or None.
+        model_name: The name of the Gemini model to use. None lets the
+            model router choose.
+        client_manager: Long-lived client owned by the LLM thread. Without
+            one a temporary client is created and closed for this call.
+        context_builder: Chooses the turns sent. Without one a builder
+            is made from the CONTEXT_* settings for this call.
+        prefix_cache: Server-side cache of the older turns, or None to
+            send every turn.
+        response_cache: On-disk cache of earlier replies, or None to
+            always call Gemini.
+        retry_policy: Retries, deadline and circuit breaker. Defaults to
+            the shared global_retry_policy. Only retried before the first
+            chunk, since text already shown cannot be taken back.
+        rate_limiter: Requests and tokens per minute budget. Defaults to
+            the shared global_rate_limiter.
+        cancel: threading.Event; once set the reply is abandoned at the
+            next chunk, and no new attempt is started, with RequestCancelled.
+        model_router: Chooses the model and tracks its time to first
+            chunk. Defaults to the shared global_model_router; without
+            either the model is MODEL_PRIMARY.
+        history: ConversationLog to reply to. Defaults to the main
+            conversation, global_history.
+
+    Returns:
+        The full text response. Chunks already passed to on_chunk are
+        part of the returned text.
+
+    Raises:
+        LLMUnavailableError: No reply could be had, or it was cut off.
+            Its partial attribute holds the text already passed to
+            on_chunk. The caller shows a notice; the error must not
+            become a model turn.
+    """
+    temporary_manager = None
+    lease = None
+    metrics = global_variables.global_metrics
+    pieces = []
+    start = None
+
+    try:
+        if client_manager is None:
+            temporary_manager = GeminiClientManager(global_variables.API_KEY, base_url=global_variables.GEMINI_BASE_URL)
+            client_manager = temporary_manager
+
+        if context_builder is None:
+            context_builder = ContextBuilder(global_variables.CONTEXT_TOKEN_BUDGET, global_variables.CONTEXT_POLICY,
+                                             global_variables.CONTEXT_KEEP_FIRST, global_variables.global_summaries)
+
+        # Add as much of the history as the token budget allows
+        if history is None:
+            history = global_variables.global_history
+
+        # A window that moved every turn would miss the cached prefix every time
+        turns = context_builder.build(history.snapshot(), system_instructions,
+                                      prefix_cache.refresh if prefix_cache is not None else 1)
+
+        # Input tokens, charged against the budget before each call
+        estimated = context_builder.estimate_text(system_instructions) + sum(context_builder.estimate(turn) for turn in turns)
+
+        if model_router is None:
+            model_router = global_variables.global_model_router
+
+        if model_name is None:
+            model_name = global_variables.MODEL_PRIMARY if model_router is None else \
+                         model_router.choose(estimated, context_builder.estimate_text(user_prompt))
+
+        # The same request was answered before: hand it over as one chunk
+        cache_key = None
+
+        if response_cache is not None:
+            cache_key = response_cache.make_key(model_name, system_instructions, turns)
+            cached_reply = response_cache.get(cache_key)
+
+            if cached_reply is not None:
+                if on_chunk is not None:
+                    on_chunk(cached_reply)
+
+                return cached_reply
+
+        # Only the turns after the cached prefix, if there is one. The lease
+        # keeps the cache from being deleted while this request names it
+        if prefix_cache is not None:
+            h, config, lease = prefix_cache.prepare(turns, system_instructions, model_name)
+        else:
+            h, config = [turn.to_content() for turn in turns], client_manager.config(system_instructions)
+
+        usage = None
+
+        if retry_policy is None:
+            retry_policy = global_variables.global_retry_policy
+
+        if rate_limiter is None:
+            rate_limiter = global_variables.global_rate_limiter
+
+        def call(timeout):
+            # The only difference between a streamed and a whole reply
+            models = client_manager.client.models
+            timed_config = client_manager.timed(config, timeout)
+
+            if stream:
+                return models.generate_content_stream(model=model_name, contents=h, config=timed_config)
+
+            return (models.generate_content(model=model_name, contents=h, config=timed_config),)
+
+        def receive(until):
+            nonlocal usage
+
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled("Request cancelled")
+
+            # Neither the wait for the budget nor the call may pass the deadline
+            if rate_limiter is not None and \
+               not rate_limiter.acquire(estimated, PRIORITY_INTERACTIVE, timeout=max(0.0, until - time.monotonic())):
+                raise LLMUnavailableError("Rate limit budget exhausted")
+
+            remaining = until - time.monotonic()
+
+            if remaining <= 0:
+                raise LLMUnavailableError("Gemini did not answer in time")
+
+            for chunk in call(remaining):
+                # Token counts arrive with the last chunk
+                usage = chunk.usage_metadata or usage
+                text = chunk.text
+
+                if not text:
+                    continue
+
+                if not pieces:
+                    metrics.observe("llm.ttft", time.perf_counter() - start)
+
+                    if model_router is not None:
+                        model_router.record(model_name, time.perf_counter() - start)
+
+                pieces.append(text)
+
+                if on_chunk is not None:
+                    on_chunk(text)
+
+                # Leaving the loop closes the response and its connection
+                if cancel is not None and cancel.is_set():
+                    raise RequestCancelled("Request cancelled")
+
+                # The timeout covers each read, not a stream that keeps trickling
+                if time.monotonic() >= until:
+                    raise DeadlineExceeded("Gemini did not answer in time")
+
+        def attempt(remaining):
+            nonlocal h, config
+
+            until = time.monotonic() + remaining
+
+            try:
+                receive(until)
+
+            except errors.ClientError as e:
+                if pieces or config.cached_content is None or e.code == 429:
+                    raise
+
+                # A rejected cache fails before any text: send everything once
+                prefix_cache.invalidate(model_name)
+                h, config = [turn.to_content() for turn in turns], client_manager.config(system_instructions)
+
+                receive(until)
+
+        # Call the API, retrying transient failures
+        start = time.perf_counter()
+
+        if retry_policy is None:
+            attempt(global_variables.LLM_DEADLINE)
+        else:
+            retry_policy.call(attempt, can_retry=lambda: not pieces and not (cancel is not None and cancel.is_set()))
+
+        metrics.observe("llm.total", time.perf_counter() - start)
+        metrics.increment("llm.replies")
+
+        reply = "".join(pieces)
+        context_builder.record_usage(turns, system_instructions, usage, reply)
+
+        if rate_limiter is not None and usage is not None:
+            rate_limiter.settle(estimated, usage.total_token_count)
+
+        if cache_key is not None and reply:
+            response_cache.put(cache_key, reply)
+
+        return reply
+
+    except Exception as e:
+        if not isinstance(e, RequestCancelled):
+            metrics.increment("llm.failed")
+
+            # A slow failure before any text counts against the model like a slow reply
+            if model_router is not None and start is not None and not pieces:
+                model_router.record(model_name, time.perf_counter() - start)
+
+        if not isinstance(e, LLMUnavailableError):
+            e = LLMUnavailableError("Gemini request failed", e)
+
+        # The caller keeps what was already shown
+        e.partial = "".join(pieces)
+
+        raise e
+
+    finally:
+        if lease is not None:
+            prefix_cache.release(lease)
+
+        if temporary_manager is not None:
+            temporary_manager.close()
+
+    ###  END OF GEMINI_REQUEST  ###
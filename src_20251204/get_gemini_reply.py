@@ -8,6 +8,20 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Build the Content list from the TurnRecord history
+#  2026-10-18   agent          Read a lock-free history snapshot
+#  2026-10-18   agent          Use the LLM thread's pooled client and cached config
+#  2026-10-18   agent          Record reply latency in global_metrics
+#  2026-10-18   agent          Send the turns chosen by the ContextBuilder
+#  2026-10-18   agent          Summaries plus recent turns instead of the whole transcript
+#  2026-10-18   agent          Send only the turns after the cached prefix
+#  2026-10-18   agent          Answer repeated requests from the response cache
+#  2026-10-18   agent          Retry through the RetryPolicy; raise LLMUnavailableError instead of replying with the error
+#  2026-10-18   agent          Charge each call against the shared RateLimiter
+#  2026-10-18   agent          Optional cancel event
+#  2026-10-18   agent          Model chosen by the ModelRouter unless given
+#  2026-10-18   agent          history argument for conversations other than the main one
+#  2026-10-18   agent          The request itself is made by gemini_request()
 #
 #
 ###############################################################################
@@ -22,6 +36,8 @@
 #   Calls the Gemini API with the predefined instructions and the user's
 #   input. Returns the reply from Gemini.
 #
+#   The request, and everything around it, is made by gemini_request().
+#
 #
 ###############################################################################
 
@@ -49,6 +65,7 @@ import sys
 from google import genai
 from google.genai import types
 from google.genai.types import Content, Part # Import Content and Part classes
+from google.genai import errors
 
 from rich.console import Console
 from rich.pretty import pprint
@@ -64,11 +81,11 @@ from dotenv import load_dotenv
 
 ###############################################################################
 #
-#  Global Variables
+#  Project Includes
 #
 ###############################################################################
 
-import global_variables
+from gemini_request import gemini_request
 
 
 ###############################################################################
@@ -77,63 +94,25 @@ import global_variables
 #
 ###############################################################################
 
-def get_gemini_reply(sender:str, user_prompt: str, system_instructions: str, model_name: str = 'gemini-2.5-flash') -> str:
+def get_gemini_reply(sender:str, user_prompt: str, system_instructions: str, **options) -> str:
     """
     Calls the Gemini model with specific system instructions and a user prompt.
 
     Args:
+        sender: Who sent the prompt.
         user_prompt: The main input/question from the user.
         system_instructions: The instructions to guide the model's behavior.
-        model_name: The name of the Gemini model to use (default is 'gemini-2.5-flash').
+        options: model_name, client_manager, context_builder, prefix_cache,
+            response_cache, retry_policy, rate_limiter, cancel,
+            model_router and history, as for gemini_request().
 
     Returns:
         The text response from the Gemini model.
-    """
-    try:
-        # The client automatically picks up the API key from the environment variable.
-        client = genai.Client(api_key = global_variables.API_KEY)
-
-        # Configure the request with system instructions
-        config = types.GenerateContentConfig(
-            system_instruction=system_instructions
-        )
-
-        now = datetime.now()
-        now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Add the history
-        h = []
-
-        with global_variables.global_content_lock:
-            h = copy.deepcopy(global_variables.global_content)
-
-        #c = Content(role = "user", parts = [Part.from_text(text=f"At {now_formatted}, {sender} said: {user_prompt}")])
-
-        #h.append(c)
 
-        #filepath = os.path.join(".", "debug", f"content_{now.strftime("%Y-%m-%d-%H-%M-%S")}.txt")
-
-        #try :
-            #string_list = [str(item) for item in h]
-            #content_to_save = '\n'.join(string_list)
-
-            #with open(filepath, "w", encoding="utf-8") as f:
-                #f.write(content_to_save)
-
-        #except Exception as e:
-            #global_variables.console.print(f"Could not write content to {filepath}: {e}")
-
-        # Call the API
-        response = client.models.generate_content(
-            model=model_name,
-            contents=h,
-            config=config,
-        )
-
-        # Return the text part of the response
-        return response.text
-
-    except Exception as e:
-        return f"An error occurred: {e}"
+    Raises:
+        LLMUnavailableError: No reply could be had. The caller shows a
+            notice; the error must not become a model turn.
+    """
+    return gemini_request(sender, user_prompt, system_instructions, stream=False, **options)
 
     ###  END OF GET_gemini_reply  ###
@@ -7,6 +7,34 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          History journal settings
+#  2026-10-18   agent          History generation counter, adaptive saves
+#  2026-10-18   agent          Optional SQLite history backend
+#  2026-10-18   agent          VERBOSE flag
+#  2026-10-18   agent          One TurnRecord list replaces global_content
+#  2026-10-18   agent          global_history is an append-only ConversationLog
+#  2026-10-18   agent          Gemini connection pool settings
+#  2026-10-18   agent          STREAM_REPLIES flag and global_metrics
+#  2026-10-18   agent          Context budget and policy settings
+#  2026-10-18   agent          Summarizer settings
+#  2026-10-18   agent          Prefix cache settings
+#  2026-10-18   agent          Response cache settings
+#  2026-10-18   agent          Retry policy and circuit breaker settings
+#  2026-10-18   agent          Rate limit settings
+#  2026-10-18   agent          LLM_WORKERS
+#  2026-10-18   agent          DEBOUNCE_MS and SUPERSEDE_REPLIES
+#  2026-10-18   agent          global_llm_scheduler for /stop
+#  2026-10-18   agent          Model routing settings
+#  2026-10-18   agent          Hedging settings
+#  2026-10-18   agent          Console view settings
+#  2026-10-18   agent          Server_Queue and LLM_Out_Queue share the Server_Inbox; IDLE_WAIT
+#  2026-10-18   agent          Chat server settings
+#  2026-10-18   agent          Session manager settings
+#  2026-10-18   agent          Readiness events for the launcher
+#  2026-10-18   agent          JOURNAL_FSYNC_INTERVAL
+#  2026-10-18   agent          SUMMARIZE off by default
+#  2026-10-18   agent          CONTEXT_TOKEN_BUDGET 0 (whole history) by default
+#  2026-10-18   agent          No startup timeout by default
 #
 #
 ###############################################################################
@@ -60,6 +88,10 @@ from datetime import datetime
 import copy
 from dotenv import load_dotenv
 
+from conversation_log import ConversationLog
+from metrics import Metrics
+from inbox import Inbox, InboxQueue, InboxEvent
+
 
 ###############################################################################
 #
@@ -74,21 +106,39 @@ console = Console(width=100)
 
 
 # Thread-Safe Communication Queues
+# The Server reads two queues and sleeps until either has work
+Server_Inbox = Inbox()
+
 # Human Client Queues
-Server_Queue = queue.Queue()             # Human input -> Server
+Server_Queue = InboxQueue(Server_Inbox)  # Human input -> Server
 Client_Receive_Queue = queue.Queue()     # Server -> Human output
 
 # LLM Client Queues
 LLM_In_Queue = queue.Queue()             # Server -> LLM input
-LLM_Out_Queue = queue.Queue()            # LLM output -> Server
+LLM_Out_Queue = InboxQueue(Server_Inbox) # LLM output -> Server
 
 # Archival Queue
 Recorder_In_Queue = queue.Queue()        # All -> Archivist
 
 # Global variable to control all threads
 STOP_EVENT = threading.Event()
+IDLE_WAIT:float = 0.5                    # Seconds an idle thread waits before checking STOP_EVENT
+
+# Readiness, each set by its thread once it can do its work (see launcher.py)
+Startup_Inbox = Inbox()
+HISTORY_READY = InboxEvent(Startup_Inbox)      # saver_thread loaded the history
+RECORDER_READY = InboxEvent(Startup_Inbox)     # recorder_thread is taking entries
+SERVER_READY = InboxEvent(Startup_Inbox)       # server_thread is routing
+RECEIVE_READY = InboxEvent(Startup_Inbox)      # client_receive_thread has the backlog
+LLM_READY = InboxEvent(Startup_Inbox)          # llm_client_thread's workers are running
+HOUSEKEEPER_READY = InboxEvent(Startup_Inbox)  # housekeeper_thread is set up
+CHAT_SERVER_READY = InboxEvent(Startup_Inbox)  # chat_server_thread is listening
+STARTUP_TIMEOUT:float = 0.0              # Seconds to wait for every thread to be ready, 0 = no limit
 HUMAN_USERNAME = "Human" # Placeholder for dynamic input
 LLM_USERNAME = "Willow" # LLM's dedicated username
+VERBOSE:bool = False    # Print every history entry as it loads
+STREAM_REPLIES:bool = True  # Show Gemini replies while they are generated
+global_metrics = Metrics()  # Counters and latencies, printed at shutdown
 
 
 ###############################################################################
@@ -97,12 +147,107 @@ LLM_USERNAME = "Willow" # LLM's dedicated username
 #
 ###############################################################################
 
-global_history = {}
-global_history_lock = threading.Lock()
-SAVE_INTERVAL:int = 10 # Seconds
+global_history = ConversationLog()       # TurnRecords, see conversation_log.py
+SAVE_INTERVAL:int = 10 # Seconds, shortest gap between snapshots
+SAVE_INTERVAL_MAX:int = 300 # Seconds, longest gap while unsaved changes exist
+
+# History backend: "json" (history.json + journal) or "sqlite"
+HISTORY_BACKEND:str = "json"
+HISTORY_PAGE_SIZE:int = 200              # Turns loaded at startup (sqlite)
+global_history_store = None              # Where the recorder appends
+global_history_oldest_id = None          # Oldest loaded database row (sqlite)
+
+# Append-only history journal (see history_journal.py)
+global_journal = None
+JOURNAL_GROUP_COMMIT:int = 64            # Max entries written per commit
+JOURNAL_COMPACT_RECORDS:int = 500        # Target entries per snapshot
+JOURNAL_FSYNC_INTERVAL:float = 1.0       # Seconds an append may stay unsynced (interval policy)
+
+# Gemini connection pool (see gemini_client_manager.py)
+GEMINI_BASE_URL = None                   # Alternative endpoint, None = Google
+GEMINI_MAX_CONNECTIONS:int = 4
+GEMINI_KEEPALIVE:float = 120.0           # Seconds an idle connection stays open
+
+# Turns sent with each request (see context_builder.py)
+CONTEXT_TOKEN_BUDGET:int = 0             # 0 = send the whole history
+CONTEXT_POLICY:str = "sliding_window"    # sliding_window, keep_first_last, pinned
+CONTEXT_KEEP_FIRST:int = 2               # Opening turns kept by keep_first_last
+
+# Summaries of older turns (see summarizer.py, housekeeper_thread.py)
+SUMMARIZE:bool = False                   # Opt in with SUMMARIZE = "true"
+global_summaries = None                  # SummaryStore, json backend only
+HOUSEKEEPING_INTERVAL:float = 60.0       # Seconds between housekeeping passes
+SUMMARY_CHUNK_TURNS:int = 50             # Turns per first-level summary
+SUMMARY_KEEP_RECENT:int = 100            # Newest turns never summarized
+SUMMARY_FANOUT:int = 4                   # Summaries combined per higher level
+SUMMARY_MAX_CALLS:int = 4                # Gemini calls per housekeeping pass
+SUMMARY_MODEL:str = "gemini-2.5-flash"
+
+# Server-side cache of the request prefix (see prefix_cache.py)
+PREFIX_CACHE:bool = False
+PREFIX_CACHE_MIN_TOKENS:int = 1024       # Smallest prefix the API will cache
+PREFIX_CACHE_TTL:int = 3600              # Seconds
+PREFIX_CACHE_TAIL:int = 10               # Newest items left out of a new cache
+PREFIX_CACHE_REFRESH:int = 40            # Items after the cache before it is rebuilt
+
+# On-disk cache of replies (see response_cache.py)
+global_response_cache = None             # ResponseCache when RESPONSE_CACHE is on
+RESPONSE_CACHE_BYPASS:bool = False       # Live conversation: always call Gemini
+
+# Retries and circuit breaker for Gemini calls (see resilience.py)
+global_retry_policy = None               # RetryPolicy shared by all callers
+LLM_DEADLINE:float = 60.0                # Seconds per request, retries included
+LLM_MAX_ATTEMPTS:int = 5
+LLM_BACKOFF_BASE:float = 0.5             # First backoff in seconds
+LLM_BACKOFF_MAX:float = 20.0             # Largest backoff in seconds
+BREAKER_FAILURES:int = 5                 # Consecutive failures that open the breaker
+BREAKER_RESET:float = 30.0               # Seconds before a trial request
+
+# Gemini requests in flight at once (see llm_worker_thread.py)
+global_llm_scheduler = None              # ConversationScheduler while the LLM thread runs
+LLM_WORKERS:int = 4                      # Replies to one conversation stay in order
+DEBOUNCE_MS:int = 500                    # Messages this close together get one reply
+SUPERSEDE_REPLIES:bool = True            # A newer message cancels the reply in progress
+
+# Duplicate requests that are slow to start (see hedging.py)
+global_hedger = None                     # Hedger when HEDGE_REQUESTS is on
+HEDGE_REQUESTS:bool = False
+HEDGE_PERCENTILE:float = 95.0            # First-text latency percentile to hedge after
+HEDGE_MIN_MS:int = 250                   # Never hedge sooner than this
+HEDGE_MAX_RATIO:float = 0.05             # Most extra requests hedging may add
+
+# Model per reply (see model_router.py)
+global_model_router = None               # ModelRouter shared by all workers
+MODEL_PRIMARY:str = "gemini-2.5-flash"
+MODEL_FAST:str = "gemini-2.5-flash-lite" # "" = no faster tier
+MODEL_LARGE:str = "gemini-2.5-pro"       # "" = no larger tier
+MODEL_TARGET:str = "primary"             # primary, latency, balanced or quality
+ROUTE_SHORT_TOKENS:int = 24              # Messages up to this size are short
+ROUTE_LONG_TOKENS:int = 8000             # Requests from this size on are long
+LLM_SLO_MS:int = 0                       # p95 time to first text before falling back, 0 = never
+
+# Client-side quota for the API key (see rate_limiter.py)
+global_rate_limiter = None               # RateLimiter when a budget is set
+GEMINI_RPM:int = 0                       # Requests per minute, 0 = unlimited
+GEMINI_TPM:int = 0                       # Tokens per minute, 0 = unlimited
+RATE_LIMIT_RESERVE:float = 0.2           # Share of the budget kept for interactive turns
+
+# Console transcript (see chat_renderer.py)
+CLIENT_VIEW:str = "scroll"               # scroll: print new rows; window: redraw the last rows
+CLIENT_VIEW_ROWS:int = 20                # Rows the window view shows
+CLIENT_REFRESH_HZ:float = 4.0            # Most redraws a second in the window view
+
+# Chat server for remote clients (see chat_server.py)
+global_chat_server = None                # ChatServer while chat_server_thread runs
+CHAT_PORT:int = 0                        # 0 = no chat server
+CHAT_HOST:str = "127.0.0.1"              # 0.0.0.0 to accept other machines
+CHAT_SEND_QUEUE:int = 256                # Lines queued per client before it is disconnected
+CHAT_CONSOLE:bool = True                 # False = no console client on the host
 
-global_content = []
-global_content_lock = threading.Lock()
+# Conversations besides the main one (see session_manager.py); session None is the main one
+global_sessions = None                   # SessionManager
+SESSION_MAX_HOT:int = 128                # Sessions kept in memory
+SESSION_IDLE:float = 600.0               # Seconds unused before a session leaves memory
 
 
 
@@ -115,4 +260,9 @@ global_content_lock = threading.Lock()
 global_config_root:str = ""
 global_instructions_file:str = ""
 global_history_file:str = ""
+global_journal_file:str = ""
+global_history_db_file:str = ""
+global_summary_file:str = ""
+global_response_cache_file:str = ""
+global_sessions_dir:str = ""
 
@@ -0,0 +1,281 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: hedging.py
+#
+#   PURPOSE:
+#   Hedged Gemini requests. A request that has produced no text after the
+#   given percentile of recent first-text latencies gets a duplicate, and
+#   whichever attempt produces text first (or, unstreamed, finishes first)
+#   is the reply. The other one is cancelled: a stream at its next chunk,
+#   an unstreamed call by dropping its result.
+#
+#   Hedges may add at most max_ratio extra requests over all requests,
+#   and none are sent until MIN_SAMPLES latencies have been observed.
+#   "llm.hedged" counts duplicates sent, "llm.hedge_won" those that won.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://research.google/pubs/the-tail-at-scale/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import percentile
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+MIN_SAMPLES:int = 20            # Latencies observed before hedging starts
+
+
+###############################################################################
+#
+#  Class: AttemptCancel
+#
+###############################################################################
+
+class AttemptCancel:
+    """Cancel flag of one attempt: set when the request is cancelled or
+    the other attempt won. Only is_set() is offered, which is all the
+    Gemini calls use."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.lost:bool = False
+
+    def is_set(self) -> bool:
+        return self.lost or (self.parent is not None and self.parent.is_set())
+
+
+###############################################################################
+#
+#  Class: Hedger
+#
+###############################################################################
+
+class Hedger:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     percentile - First-text latency percentile to hedge after
+    #     min_delay - Seconds to wait at least before hedging
+    #     max_ratio - Most extra requests per request
+    #     window - Latencies the percentile is taken over
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, percentile:float = 95.0, min_delay:float = 0.25, max_ratio:float = 0.05, window:int = 200):
+
+        self.percentile:float = percentile
+        self.min_delay:float = min_delay
+        self.max_ratio:float = max_ratio
+
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=max(MIN_SAMPLES, window))
+        self._requests:int = 0
+        self._hedges:int = 0
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: delay()
+    #
+    #  Description:
+    #     Seconds without text after which a request is hedged.
+    #
+    #  Returns:
+    #     Seconds, or None while too few latencies are known
+    #
+    ######################################################
+
+    def delay(self):
+
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+
+            ordered = sorted(self._latencies)
+
+        return max(self.min_delay, percentile(ordered, self.percentile))
+
+    ###  END OF DELAY()  ###
+
+
+    #####################################################
+    #
+    #  Function: run()
+    #
+    #  Description:
+    #     Runs a request, hedged if it is slow to produce text.
+    #
+    #  Parameters:
+    #     request - request(on_chunk, cancel) -> reply; called once per
+    #               attempt, each on its own thread
+    #     cancel - Cancels every attempt when set, or None
+    #     on_chunk - Receives the winning attempt's chunks, or None
+    #
+    #  Returns:
+    #     The winning attempt's reply. If every attempt failed, the
+    #     first attempt's exception is raised.
+    #
+    ######################################################
+
+    def run(self, request, cancel = None, on_chunk = None):
+
+        cond = threading.Condition()
+        attempts = []                       # AttemptCancel per attempt
+        results = {}                        # attempt -> ("reply" | "error", value)
+        winner = None
+
+        def claim(index:int, started:float) -> None:
+            # Called with cond held: the first attempt with text wins
+            nonlocal winner
+
+            winner = index
+
+            for other, attempt in enumerate(attempts):
+                attempt.lost = other != index
+
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+
+            if index > 0:
+                global_variables.global_metrics.increment("llm.hedge_won")
+
+        def launch() -> None:
+            index = len(attempts)
+            attempt = AttemptCancel(cancel)
+            attempts.append(attempt)
+            started = time.perf_counter()
+
+            def chunk(text):
+                with cond:
+                    if winner is None:
+                        claim(index, started)
+
+                    mine = winner == index
+
+                if mine and on_chunk is not None:
+                    on_chunk(text)
+
+            def go():
+                try:
+                    result = ("reply", request(chunk, attempt))
+                except Exception as e:
+                    result = ("error", e)
+
+                with cond:
+                    if result[0] == "reply" and winner is None:
+                        claim(index, started)
+
+                    results[index] = result
+                    cond.notify_all()
+
+            threading.Thread(target=go, name=f"{threading.current_thread().name}-Attempt-{index + 1}", daemon=True).start()
+
+        with self._lock:
+            self._requests += 1
+
+        delay = self.delay()
+
+        with cond:
+            launch()
+
+            if delay is not None:
+                cond.wait_for(lambda: winner is not None or results, timeout=delay)
+
+                if winner is None and not results and not (cancel is not None and cancel.is_set()) and self._allow():
+                    global_variables.global_metrics.increment("llm.hedged")
+                    launch()
+
+            cond.wait_for(lambda: winner in results or len(results) == len(attempts))
+
+            kind, value = results[winner] if winner in results else results[0]
+
+        if kind == "error":
+            raise value
+
+        return value
+
+    ###  END OF RUN()  ###
+
+
+    #####################################################
+    #
+    #  Function: _allow()
+    #
+    #  Description:
+    #     Takes one hedge from the max_ratio budget.
+    #
+    ######################################################
+
+    def _allow(self) -> bool:
+
+        with self._lock:
+            if self._hedges + 1 > self.max_ratio * self._requests:
+                return False
+
+            self._hedges += 1
+
+        return True
+
+    ###  END OF _ALLOW()  ###
@@ -0,0 +1,361 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Store and return TurnRecords
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: history_database.py
+#
+#   PURPOSE:
+#   Optional SQLite store for the chat history, selected with
+#   HISTORY_BACKEND = "sqlite" in .env. Each turn is one row, so appending
+#   is a single insert and startup only reads the most recent page of
+#   turns instead of the whole conversation.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://www.sqlite.org/wal.html
+#   https://docs.python.org/3/library/sqlite3.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import sqlite3
+import threading
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from turn_record import TurnRecord, parse_timestamp
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    role      TEXT NOT NULL,
+    username  TEXT NOT NULL,
+    text      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_timestamp ON turns (timestamp);
+CREATE INDEX IF NOT EXISTS turns_role      ON turns (role, timestamp);
+CREATE INDEX IF NOT EXISTS turns_username  ON turns (username, timestamp);
+"""
+
+
+###############################################################################
+#
+#  Class: HistoryDatabase
+#
+###############################################################################
+
+class HistoryDatabase:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Opens (or creates) the database in WAL mode. WAL lets the
+    #     recorder append while other threads read older pages.
+    #
+    #  Parameters:
+    #     path - Path of the SQLite database file
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, path):
+
+        self.path = path
+        self.lock = threading.Lock()
+
+        # One connection shared by all threads, serialized by self.lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: append()
+    #
+    #  Description:
+    #     Inserts new turns in one transaction. Takes the same
+    #     (seq, TurnRecord) list as HistoryJournal.append() so the recorder
+    #     does not care which backend is in use.
+    #
+    #  Parameters:
+    #     seq_entries - List of (seq, TurnRecord) tuples
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def append(self, seq_entries) -> None:
+
+        rows = [self._turn_to_row(turn) for _, turn in seq_entries]
+
+        if not rows:
+            return
+
+        with self.lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO turns (timestamp, role, username, text) VALUES (?, ?, ?, ?)", rows)
+
+        return
+
+    ###  END OF APPEND()  ###
+
+
+    #####################################################
+    #
+    #  Function: import_entries()
+    #
+    #  Description:
+    #     One-off migration of an existing history.json into an empty
+    #     database.
+    #
+    #  Parameters:
+    #     entries - List of history entry dicts
+    #
+    #  Returns:
+    #     Number of turns imported
+    #
+    ######################################################
+
+    def import_entries(self, entries) -> int:
+
+        if self.count() > 0:
+            return 0
+
+        self.append([(seq, TurnRecord.from_entry(entry)) for seq, entry in enumerate(entries)])
+
+        return len(entries)
+
+    ###  END OF IMPORT_ENTRIES()  ###
+
+
+    #####################################################
+    #
+    #  Function: count()
+    #
+    #  Description:
+    #     Total number of stored turns.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     Row count
+    #
+    ######################################################
+
+    def count(self) -> int:
+
+        with self.lock:
+            return self._conn.execute("SELECT COUNT(*) FROM turns").fetchone()[0]
+
+    ###  END OF COUNT()  ###
+
+
+    #####################################################
+    #
+    #  Function: page()
+    #
+    #  Description:
+    #     Loads the newest turns older than before_id, oldest first.
+    #
+    #  Parameters:
+    #     limit - Maximum number of turns to return
+    #     before_id - Only return turns with a smaller id (None = newest)
+    #
+    #  Returns:
+    #     (turns, oldest_id) where oldest_id is the id of the first
+    #     turn returned, or None when no turns are left
+    #
+    ######################################################
+
+    def page(self, limit:int, before_id = None):
+
+        with self.lock:
+            if before_id is None:
+                rows = self._conn.execute(
+                    "SELECT id, timestamp, role, username, text FROM turns ORDER BY id DESC LIMIT ?",
+                    (limit,)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT id, timestamp, role, username, text FROM turns WHERE id < ? ORDER BY id DESC LIMIT ?",
+                    (before_id, limit)).fetchall()
+
+        if not rows:
+            return [], None
+
+        rows.reverse()
+
+        return [self._row_to_turn(row) for row in rows], rows[0][0]
+
+    ###  END OF PAGE()  ###
+
+
+    #####################################################
+    #
+    #  Function: query()
+    #
+    #  Description:
+    #     Indexed lookup of turns by role, username and time range.
+    #     Timestamps use the "YYYY-MM-DD HH:MM:SS" format, which sorts
+    #     correctly as text.
+    #
+    #  Parameters:
+    #     role - Only this role ("user" or "model"), or None
+    #     username - Only this speaker, or None
+    #     since - Earliest timestamp (inclusive), or None
+    #     until - Latest timestamp (inclusive), or None
+    #     limit - Maximum number of turns to return
+    #
+    #  Returns:
+    #     List of TurnRecords, oldest first
+    #
+    ######################################################
+
+    def query(self, role = None, username = None, since = None, until = None, limit:int = 100):
+
+        clauses = []
+        params = []
+
+        if role is not None:
+            clauses.append("role = ?")
+            params.append(role)
+
+        if username is not None:
+            clauses.append("username = ?")
+            params.append(username)
+
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        with self.lock:
+            rows = self._conn.execute(
+                f"SELECT id, timestamp, role, username, text FROM turns {where} ORDER BY timestamp, id LIMIT ?",
+                params).fetchall()
+
+        return [self._row_to_turn(row) for row in rows]
+
+    ###  END OF QUERY()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    #  Description:
+    #     Checkpoints the WAL and closes the connection.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        with self.lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error as e:
+                    global_variables.console.print(f"History database checkpoint failed: {e}")
+
+                self._conn.close()
+                self._conn = None
+
+        return
+
+    ###  END OF CLOSE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _turn_to_row() / _row_to_turn()
+    #
+    #  Description:
+    #     Convert between TurnRecords and table rows.
+    #
+    ######################################################
+
+    @staticmethod
+    def _turn_to_row(turn):
+
+        return (turn.timestamp_text(), turn.role, turn.username, turn.text)
+
+    @staticmethod
+    def _row_to_turn(row):
+
+        _, timestamp, role, username, text = row
+
+        return TurnRecord(parse_timestamp(timestamp), role, username, text)
+
+    ###  END OF _TURN_TO_ROW() / _ROW_TO_TURN()  ###
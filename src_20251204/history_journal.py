@@ -0,0 +1,382 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Keep the journal if the snapshot write fails
+#  2026-10-18   agent          Journal TurnRecords
+#  2026-10-18   agent          Compact from a history snapshot view without blocking appends
+#  2026-10-18   agent          sync(), so the last appends are synced while the history is idle
+#  2026-10-18   agent          compact() takes the history, for session journals
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: history_journal.py
+#
+#   PURPOSE:
+#   Append-only JSONL journal of chat history entries. The recorder writes
+#   each new entry as a single line so that a save costs O(new entries)
+#   instead of rewriting the whole history file. The saver periodically
+#   compacts the journal into the history.json snapshot.
+#
+#   Every record carries "seq", the index of the entry in the full history.
+#   When replaying, records already contained in the snapshot (or already
+#   replayed) are skipped, so a crash between writing the snapshot and
+#   truncating the journal never duplicates entries.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://jsonlines.org/
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import os
+import json
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+FSYNC_ALWAYS:str = "always"       # fsync after every group commit
+FSYNC_INTERVAL:str = "interval"   # fsync at most once per fsync_interval
+FSYNC_NEVER:str = "never"         # flush only, let the OS decide
+
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+
+###############################################################################
+#
+#  Class: HistoryJournal
+#
+###############################################################################
+
+class HistoryJournal:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Prepares the journal. The file is not opened until the first
+    #     append so that loading can replay it first.
+    #
+    #  Parameters:
+    #     path - Path of the JSONL journal file
+    #     fsync_policy - One of FSYNC_POLICIES
+    #     fsync_interval - Seconds between fsyncs for FSYNC_INTERVAL
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, path, fsync_policy:str = FSYNC_INTERVAL, fsync_interval:float = 1.0):
+
+        if fsync_policy not in FSYNC_POLICIES:
+            global_variables.console.print(f"[bold red]Error:[/bold red] Unknown journal fsync policy '{fsync_policy}', using '{FSYNC_INTERVAL}'")
+            fsync_policy = FSYNC_INTERVAL
+
+        self.path = path
+        self.fsync_policy:str = fsync_policy
+        self.fsync_interval:float = fsync_interval
+
+        self.lock = threading.Lock()
+        self.records_since_compact:int = 0
+
+        self._file = None
+        self._last_fsync:float = 0.0
+        self._unsynced:bool = False     # Appended since the last fsync (FSYNC_INTERVAL)
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: append()
+    #
+    #  Description:
+    #     Group commit: writes all entries with a single write and at
+    #     most one fsync.
+    #
+    #  Parameters:
+    #     seq_entries - List of (seq, TurnRecord) tuples
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def append(self, seq_entries) -> None:
+
+        if not seq_entries:
+            return
+
+        payload:str = self._encode(seq_entries)
+
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+
+            self._file.write(payload)
+            self._file.flush()
+
+            now = time.monotonic()
+
+            if (self.fsync_policy == FSYNC_ALWAYS) or \
+               (self.fsync_policy == FSYNC_INTERVAL and now - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+                self._unsynced = False
+
+            else:
+                self._unsynced = self.fsync_policy == FSYNC_INTERVAL
+
+            self.records_since_compact += len(seq_entries)
+
+        return
+
+    ###  END OF APPEND()  ###
+
+
+    #####################################################
+    #
+    #  Function: sync()
+    #
+    #  Description:
+    #     With FSYNC_INTERVAL, syncs records appended since the last
+    #     fsync. append() only syncs when a later append comes along,
+    #     so the saver calls this every fsync_interval to bound what
+    #     a quiet conversation can lose.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def sync(self) -> None:
+
+        with self.lock:
+            if self._file is not None and self._unsynced:
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+                self._unsynced = False
+
+        return
+
+    ###  END OF SYNC()  ###
+
+
+    #####################################################
+    #
+    #  Function: replay()
+    #
+    #  Description:
+    #     Reads the journal back. A torn final line left by a crash
+    #     is ignored.
+    #
+    #  Parameters:
+    #     start_seq - Skip records whose seq is below this value
+    #
+    #  Returns:
+    #     List of TurnRecords
+    #
+    ######################################################
+
+    def replay(self, start_seq:int = 0):
+
+        entries = []
+
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+
+                if not line:
+                    continue
+
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    global_variables.console.print(f"⚠️ Skipping unreadable journal line {line_number} in {self.path}")
+                    continue
+
+                seq = record.pop("seq", None)
+
+                # Already in the snapshot, or written twice around a compaction
+                if seq is not None:
+                    if seq < start_seq:
+                        continue
+
+                    start_seq = seq + 1
+
+                entries.append(TurnRecord.from_entry(record))
+
+        # These records are on disk but not yet in the snapshot
+        self.records_since_compact = len(entries)
+
+        return entries
+
+    ###  END OF REPLAY()  ###
+
+
+    #####################################################
+    #
+    #  Function: compact()
+    #
+    #  Description:
+    #     Writes a snapshot of the full history and then truncates the
+    #     journal. The snapshot is written without holding the journal
+    #     lock, so the recorder keeps appending meanwhile; the turns it
+    #     added in that time are written back into the emptied journal.
+    #     If the snapshot cannot be written the journal is left alone.
+    #
+    #  Parameters:
+    #     write_snapshot - Callable taking a ConversationView, returns
+    #                      True once the snapshot is safely on disk
+    #     history - ConversationLog journaled here, default the main one
+    #
+    #  Returns:
+    #     History generation contained in the snapshot, or None on failure
+    #
+    ######################################################
+
+    def compact(self, write_snapshot, history = None):
+
+        if history is None:
+            history = global_variables.global_history
+
+        snapshot, generation = history.snapshot_with_generation()
+
+        if not write_snapshot(snapshot):
+            return None
+
+        with self.lock:
+            # Turns recorded while the snapshot was being written
+            newer = history.snapshot()[len(snapshot):]
+            seq_entries = list(enumerate(newer, start=len(snapshot)))
+
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+
+            self._file.seek(0)
+            self._file.truncate()
+
+            if seq_entries:
+                self._file.write(self._encode(seq_entries))
+
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            self._unsynced = False
+            self.records_since_compact = len(seq_entries)
+
+        return generation
+
+    ###  END OF COMPACT()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    #  Description:
+    #     Flushes and syncs any buffered records and closes the file.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        with self.lock:
+            if self._file is not None:
+                self._file.flush()
+
+                if self.fsync_policy != FSYNC_NEVER:
+                    os.fsync(self._file.fileno())
+
+                self._file.close()
+                self._file = None
+
+        return
+
+    ###  END OF CLOSE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _encode()
+    #
+    #  Description:
+    #     One JSON line per (seq, TurnRecord).
+    #
+    ######################################################
+
+    @staticmethod
+    def _encode(seq_entries) -> str:
+
+        lines = []
+
+        for seq, turn in seq_entries:
+            record = turn.to_entry()
+            record["seq"] = seq
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        return "\n".join(lines) + "\n"
+
+    ###  END OF _ENCODE()  ###
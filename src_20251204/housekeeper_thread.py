@@ -0,0 +1,129 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Network timeout from LLM_DEADLINE
+#  2026-10-18   agent          Drop idle sessions from memory
+#  2026-10-18   agent          Sets HOUSEKEEPER_READY; started once the history is loaded
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: housekeeper_thread.py
+#
+#   PURPOSE:
+#   Background maintenance that must stay off the reply path. Every
+#   HOUSEKEEPING_INTERVAL seconds it summarizes older turns into the
+#   summary store (see summarizer.py) and drops sessions idle for
+#   SESSION_IDLE seconds from memory (see session_manager.py).
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html#event-objects
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from gemini_client_manager import GeminiClientManager
+from summarizer import Summarizer
+
+
+###############################################################################
+#
+#  FUNCTION: housekeeper_thread()
+#
+###############################################################################
+
+def housekeeper_thread() :
+
+    store = global_variables.global_summaries
+    sessions = global_variables.global_sessions
+
+    if not global_variables.SUMMARIZE :
+        store = None
+
+    if (store is None) and (sessions is None) :
+        global_variables.STOP_EVENT.wait()
+        global_variables.console.print("Housekeeper: Stopped.")
+        return
+
+    client_manager = None
+    summarizer = None
+
+    if store is not None :
+        # Its own client, so summarizing never waits on a reply connection
+        client_manager = GeminiClientManager(global_variables.API_KEY, base_url=global_variables.GEMINI_BASE_URL, max_connections=1,
+                                             timeout=global_variables.LLM_DEADLINE)
+
+        summarizer = Summarizer(store, client_manager,
+                                chunk_turns=global_variables.SUMMARY_CHUNK_TURNS,
+                                keep_recent=global_variables.SUMMARY_KEEP_RECENT,
+                                fanout=global_variables.SUMMARY_FANOUT,
+                                max_calls=global_variables.SUMMARY_MAX_CALLS,
+                                model_name=global_variables.SUMMARY_MODEL)
+
+    validated = False
+
+    global_variables.HOUSEKEEPER_READY.set()
+
+    # --- Main loop, every HOUSEKEEPING_INTERVAL
+
+    while not global_variables.STOP_EVENT.wait(global_variables.HOUSEKEEPING_INTERVAL):
+        try:
+            if sessions is not None :
+                sessions.evict_idle()
+
+            if summarizer is None :
+                continue
+
+            turns = global_variables.global_history.snapshot()
+
+            if (not validated) and (len(turns) > 0) :
+                dropped = store.validate(turns)
+                validated = True
+
+                if dropped > 0 :
+                    global_variables.console.print(f"Housekeeper: Dropped {dropped} summaries that no longer match the history.")
+
+            summarizer.run_once(turns)
+
+        except Exception as e:
+            global_variables.console.print(f"Housekeeper error: {e}")
+
+    if client_manager is not None :
+        client_manager.close()
+
+    global_variables.console.print("Housekeeper: Stopped.")
+
+    ###  END OF HOUSEKEEPER_THREAD  ###
@@ -0,0 +1,100 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          InboxEvent
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: inbox.py
+#
+#   PURPOSE:
+#   Waiting on several queues at once. Every InboxQueue signals its
+#   Inbox when something is put on it, so a thread reading more than
+#   one queue sleeps in Inbox.wait() until any of them has work, instead
+#   of polling each in turn with a timeout.
+#
+#   The reader clears the inbox before draining the queues: anything put
+#   while it drains signals again, and the next wait returns at once.
+#
+#   An InboxEvent does the same for events: the launcher waits on one
+#   inbox for whichever component becomes ready next.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html#event-objects
+#   https://docs.python.org/3/library/queue.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import queue
+import threading
+
+
+###############################################################################
+#
+#  Class: Inbox
+#
+###############################################################################
+
+class Inbox(threading.Event):
+    """Set when any of its queues has had something put on it."""
+
+
+###############################################################################
+#
+#  Class: InboxQueue
+#
+###############################################################################
+
+class InboxQueue(queue.Queue):
+    """A Queue that also sets an Inbox on every put."""
+
+    def __init__(self, inbox:Inbox, maxsize:int = 0):
+        super().__init__(maxsize)
+        self.inbox = inbox
+
+    def _put(self, item):
+        super()._put(item)
+        self.inbox.set()
+
+
+###############################################################################
+#
+#  Class: InboxEvent
+#
+###############################################################################
+
+class InboxEvent(threading.Event):
+    """An Event that also sets an Inbox when it is set."""
+
+    def __init__(self, inbox:Inbox):
+        super().__init__()
+        self.inbox = inbox
+
+    def set(self):
+        super().set()
+        self.inbox.set()
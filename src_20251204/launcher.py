@@ -0,0 +1,287 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          A timeout of 0 waits as long as the threads are alive
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: launcher.py
+#
+#   PURPOSE:
+#   Starts the threads in dependency order, each as soon as everything
+#   it needs is ready, instead of one a second. A component names the
+#   components it needs, which must have been added before it, so the
+#   graph cannot have a cycle; components that need nothing, or the same
+#   things, start together.
+#
+#   A component is ready when its thread sets its readiness event (see
+#   global_variables.py), or as soon as it starts if it has none. The
+#   events are InboxEvents on one inbox, so the launcher sleeps until the
+#   next one is set and never polls.
+#
+#   Launch time is then what the slowest chain of components actually
+#   takes, e.g. loading the history, and is measured per component.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/threading.html#event-objects
+#   https://en.wikipedia.org/wiki/Topological_sorting
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from inbox import Inbox
+
+
+###############################################################################
+#
+#  Class: Component
+#
+###############################################################################
+
+class Component:
+    """One thread to start, what it needs and when it started and became ready."""
+
+    __slots__ = ("name", "thread", "ready", "needs", "started_at", "ready_at")
+
+    def __init__(self, name:str, thread:threading.Thread, ready:threading.Event, needs):
+        self.name:str = name
+        self.thread:threading.Thread = thread
+        self.ready:threading.Event = ready   # None = ready once started
+        self.needs = tuple(needs)
+        self.started_at = None              # Seconds after start() began
+        self.ready_at = None
+
+
+###############################################################################
+#
+#  Class: Launcher
+#
+###############################################################################
+
+class Launcher:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     inbox - Set by every readiness event
+    #     stop_event - Startup gives up once it is set
+    #     idle_wait - Longest sleep before checking stop_event
+    #
+    ######################################################
+
+    def __init__(self, inbox:Inbox, stop_event:threading.Event, idle_wait:float = 0.5):
+
+        self.inbox:Inbox = inbox
+        self.stop_event:threading.Event = stop_event
+        self.idle_wait:float = idle_wait
+
+        self.components = {}            # name -> Component, in the order added
+        self.elapsed = None             # Seconds until every component was ready
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: add()
+    #
+    #  Parameters:
+    #     name - Used by needs and in the report
+    #     target - The thread function
+    #     thread_name - Name of its thread
+    #     ready - Event the thread sets once ready, or None
+    #     needs - Names of components that must be ready first
+    #
+    ######################################################
+
+    def add(self, name:str, target, thread_name:str, ready:threading.Event = None, needs = ()) -> None:
+
+        if name in self.components:
+            raise ValueError(f"Component {name} was already added")
+
+        for need in needs:
+            if need not in self.components:
+                raise ValueError(f"Component {name} needs {need}, which must be added first")
+
+        thread = threading.Thread(target=target, name=thread_name)
+        self.components[name] = Component(name, thread, ready, needs)
+
+    ###  END OF ADD()  ###
+
+
+    #####################################################
+    #
+    #  Function: start()
+    #
+    #  Description:
+    #     Starts every component as soon as what it needs is ready,
+    #     and returns once all of them are.
+    #
+    #  Parameters:
+    #     timeout - Seconds to wait for them, 0 = as long as none
+    #               of them has ended
+    #
+    #  Returns:
+    #     True if every component is ready; False if stop_event was
+    #     set, a thread ended before it was ready, or time ran out
+    #
+    ######################################################
+
+    def start(self, timeout:float = 0.0) -> bool:
+
+        began = time.perf_counter()
+        deadline = began + timeout if timeout > 0 else None
+
+        while True:
+            # Clear first: an event set meanwhile wakes the next wait at once
+            self.inbox.clear()
+            now = time.perf_counter()
+
+            for component in self.components.values():
+                if component.started_at is not None and component.ready_at is None and component.ready.is_set():
+                    component.ready_at = now - began
+
+            # Starting one with no event can make its dependents startable
+            started = True
+
+            while started:
+                started = False
+
+                for component in self.components.values():
+                    if component.started_at is None and all(self.components[need].ready_at is not None for need in component.needs):
+                        component.thread.start()
+                        component.started_at = time.perf_counter() - began
+                        started = True
+
+                        if component.ready is None:
+                            component.ready_at = component.started_at
+
+            if not self.waiting():
+                self.elapsed = time.perf_counter() - began
+                break
+
+            if self.stop_event.is_set() or (deadline is not None and now >= deadline):
+                return False
+
+            if any(component.started_at is not None and not component.thread.is_alive() for component in self.waiting()):
+                return False
+
+            self.inbox.wait(self.idle_wait if deadline is None else min(self.idle_wait, deadline - now))
+
+        metrics = global_variables.global_metrics
+
+        for component in self.components.values():
+            metrics.observe(f"startup.{component.name}", component.ready_at)
+
+        metrics.observe("startup.ready", self.elapsed)
+
+        return True
+
+    ###  END OF START()  ###
+
+
+    #####################################################
+    #
+    #  Function: waiting()
+    #
+    #  Returns:
+    #     The components not ready yet
+    #
+    ######################################################
+
+    def waiting(self) -> list:
+
+        return [component for component in self.components.values() if component.ready_at is None]
+
+    ###  END OF WAITING()  ###
+
+
+    #####################################################
+    #
+    #  Function: report()
+    #
+    #  Returns:
+    #     One line: launch time, then when each component was
+    #     ready, first ready first
+    #
+    ######################################################
+
+    def report(self) -> str:
+
+        ready = sorted((component for component in self.components.values() if component.ready_at is not None),
+                       key=lambda component: component.ready_at)
+        times = ", ".join(f"{component.name} {component.ready_at * 1000:.0f}" for component in ready)
+
+        if self.elapsed is None:
+            return f"Not ready: {', '.join(component.name for component in self.waiting())} (ready: {times} ms)"
+
+        return f"Ready in {self.elapsed * 1000:.0f} ms ({times})"
+
+    ###  END OF REPORT()  ###
+
+
+    #####################################################
+    #
+    #  Function: join()
+    #
+    #  Description:
+    #     Joins the threads that were started, last started first,
+    #     so each stops before what it needs. Call after setting
+    #     stop_event.
+    #
+    ######################################################
+
+    def join(self) -> None:
+
+        started = [component for component in self.components.values() if component.started_at is not None]
+        started.sort(key=lambda component: component.started_at, reverse=True)
+
+        for component in started:
+            component.thread.join()
+
+    ###  END OF JOIN()  ###
@@ -7,6 +7,22 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Own a pooled GeminiClientManager and close it on shutdown
+#  2026-10-18   agent          Stream replies as partial chunks followed by the final text
+#  2026-10-18   agent          Own the ContextBuilder
+#  2026-10-18   agent          Context includes the conversation summaries
+#  2026-10-18   agent          Optional prefix cache; reload instructions.txt when it changes
+#  2026-10-18   agent          Use the shared response cache unless RESPONSE_CACHE_BYPASS is set
+#  2026-10-18   agent          Gemini failures become an error notice instead of a reply; network timeout from LLM_DEADLINE
+#  2026-10-18   agent          Hand messages to a pool of LLM workers, ordered per conversation
+#  2026-10-18   agent          Debounce and supersede settings for the scheduler
+#  2026-10-18   agent          Publish the scheduler for /stop
+#  2026-10-18   agent          Idle wait of IDLE_WAIT
+#  2026-10-18   agent          Messages carry their session; a session's own instructions replace the main ones
+#  2026-10-18   agent          Sets LLM_READY once the workers run
+#  2026-10-18   agent          Scheduled by session instead of by sender
+#  2026-10-18   agent          Pass on the event set once the message is recorded
+#  2026-10-18   agent          At most GEMINI_MAX_CONNECTIONS Gemini calls at once, abandoned ones included
 #
 #
 ###############################################################################
@@ -20,6 +36,9 @@
 #   PURPOSE:
 #   This allows the LLM to pretend to be another user to the server.
 #
+#   Owns the Gemini client and caches, and hands each message to a pool
+#   of LLM_WORKERS llm_worker_threads through a ConversationScheduler.
+#
 #
 ###############################################################################
 
@@ -50,6 +69,7 @@ import threading
 import queue
 import time
 import sys
+import os
 
 
 ###############################################################################
@@ -69,7 +89,11 @@ import global_variables
 
 from load_history import load_history
 from load_instructions import load_instructions
-from get_gemini_reply import get_gemini_reply
+from gemini_client_manager import GeminiClientManager
+from context_builder import ContextBuilder
+from prefix_cache import PrefixCache
+from conversation_scheduler import ConversationScheduler
+from llm_worker_thread import llm_worker_thread
 
 
 ###############################################################################
@@ -84,19 +108,82 @@ def llm_client_thread():
     global_variables.console.print(f"\n🧠 LLM Client ({global_variables.LLM_USERNAME}): Initializing...")
     
     my_instructions = load_instructions(global_variables.global_instructions_file)
+    instructions_mtime = os.stat(global_variables.global_instructions_file).st_mtime_ns
+
+    # One client for the life of the thread, so connections are reused
+    client_manager = GeminiClientManager(global_variables.API_KEY,
+                                         base_url=global_variables.GEMINI_BASE_URL,
+                                         max_connections=global_variables.GEMINI_MAX_CONNECTIONS,
+                                         keepalive_expiry=global_variables.GEMINI_KEEPALIVE,
+                                         timeout=global_variables.LLM_DEADLINE)
+
+    # Keeps its token calibration between turns
+    context_builder = ContextBuilder(global_variables.CONTEXT_TOKEN_BUDGET, global_variables.CONTEXT_POLICY,
+                                     global_variables.CONTEXT_KEEP_FIRST, global_variables.global_summaries)
+
+    # Server-side cache of the instructions and older turns
+    prefix_cache = None
+
+    if global_variables.PREFIX_CACHE :
+        prefix_cache = PrefixCache(client_manager, context_builder.estimate,
+                                   min_tokens=global_variables.PREFIX_CACHE_MIN_TOKENS,
+                                   ttl=global_variables.PREFIX_CACHE_TTL,
+                                   tail=global_variables.PREFIX_CACHE_TAIL,
+                                   refresh=global_variables.PREFIX_CACHE_REFRESH)
+
+    # Shared response cache, unless this is a live conversation
+    response_cache = None if global_variables.RESPONSE_CACHE_BYPASS else global_variables.global_response_cache
+
+    # Calls abandoned by /stop or a newer message run on until their next
+    # chunk or deadline; bounded, they cannot take every pooled connection
+    request_slots = threading.BoundedSemaphore(max(1, global_variables.GEMINI_MAX_CONNECTIONS))
+
+    # The workers share everything above
+    scheduler = ConversationScheduler(global_variables.DEBOUNCE_MS / 1000.0, global_variables.SUPERSEDE_REPLIES)
+    workers = [threading.Thread(target=llm_worker_thread, name=f"LLM-Worker-{i + 1}",
+                                args=(scheduler, client_manager, context_builder, prefix_cache, response_cache, request_slots))
+               for i in range(max(1, global_variables.LLM_WORKERS))]
+
+    # /stop reaches the requests through it
+    global_variables.global_llm_scheduler = scheduler
+
+    for worker in workers :
+        worker.start()
+
+    global_variables.LLM_READY.set()
 
     while not global_variables.STOP_EVENT.is_set():
         try:
             # Check for incoming messages from the Server (directed to the LLM)
-            message_tuple = global_variables.LLM_In_Queue.get(timeout=0.1)
+            message_tuple = global_variables.LLM_In_Queue.get(timeout=global_variables.IDLE_WAIT)
             
-            sender, message = message_tuple
+            # (sender, message), (sender, message, session) or (sender, message, session,
+            # recorded event); None is the main conversation
+            sender, message, *extra = message_tuple
+            session_id = extra[0] if extra else None
+            recorded = extra[1] if len(extra) > 1 else None
             
             if sender != "Server" :
-                gemini_reply = get_gemini_reply(sender, message, my_instructions)
-
-                # Put the LLM's response into its output queue for the Server to broadcast
-                global_variables.LLM_Out_Queue.put((global_variables.LLM_USERNAME, gemini_reply))
+                # Pick up edits to instructions.txt (this also replaces the prefix cache)
+                try :
+                    mtime = os.stat(global_variables.global_instructions_file).st_mtime_ns
+                except OSError :
+                    mtime = instructions_mtime
+
+                if mtime != instructions_mtime :
+                    my_instructions = load_instructions(global_variables.global_instructions_file)
+                    instructions_mtime = mtime
+                    global_variables.console.print(f"🧠 LLM Client ({global_variables.LLM_USERNAME}): Instructions reloaded.")
+
+                instructions = my_instructions
+
+                if session_id is not None :
+                    # A session may have instructions of its own
+                    instructions = global_variables.global_sessions.instructions(session_id) or my_instructions
+
+                # Replies in one conversation stay in order, whoever sent the
+                # message; different conversations run side by side
+                scheduler.submit(session_id, (sender, message, instructions, session_id, recorded))
             
             global_variables.LLM_In_Queue.task_done()
 
@@ -105,7 +192,17 @@ def llm_client_thread():
         except Exception as e:
             global_variables.console.print(f"LLM Client error: {e}")
             global_variables.STOP_EVENT.set()
-            
+
+    for worker in workers :
+        worker.join()
+
+    global_variables.global_llm_scheduler = None
+
+    if prefix_cache is not None :
+        prefix_cache.close()
+
+    client_manager.close()
+
     global_variables.console.print(f"🧠 LLM Client ({global_variables.LLM_USERNAME}): Shutting down.")
 
     ###  END OF LLM_CLIENT_THREAD  ###
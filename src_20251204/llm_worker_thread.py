@@ -0,0 +1,247 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          One reply per burst of messages; drop superseded replies
+#  2026-10-18   agent          /stop: stopped replies end with a marker; the call runs on its own thread so the worker is freed at once
+#  2026-10-18   agent          Requests go through the Hedger when hedging is on
+#  2026-10-18   agent          Idle wait of IDLE_WAIT
+#  2026-10-18   agent          Reply from the session's history; output carries the session
+#  2026-10-18   agent          Conversations are sessions; replies in the main one tagged MAIN_CONVERSATION
+#  2026-10-18   agent          Wait for the messages' own recorded events, then read the history
+#  2026-10-18   agent          At most request_slots calls at once; chunks and the cancel check under one lock
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: llm_worker_thread.py
+#
+#   PURPOSE:
+#   One of the LLM_WORKERS threads started by llm_client_thread. Takes
+#   requests from the ConversationScheduler, asks Gemini and puts the
+#   reply on LLM_Out_Queue tagged with its conversation: the session id,
+#   or MAIN_CONVERSATION (messages from people carry no tag).
+#
+#   Messages of one conversation that were queued together are answered
+#   with one reply. A reply superseded by a newer message is dropped and
+#   the client is told to take back what it showed of it. A reply stopped
+#   with /stop is recorded as the text shown so far plus STOPPED_MARKER.
+#
+#   The Gemini call runs on a thread of its own, so a cancelled request
+#   frees the worker at once; the abandoned call ends at its next chunk,
+#   or an unstreamed one at its deadline, and starts no further attempt.
+#   Every call holds one of the request_slots shared by the workers until
+#   it ends, so abandoned calls can never take more connections than
+#   there are slots. With a global_hedger the call goes through it and
+#   may be hedged (see hedging.py).
+#
+#   A chunk is shown only if the request was not cancelled, checked
+#   under the same lock the worker takes to read what was shown, so no
+#   chunk follows a "cancelled" or "[stopped]".
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://github.com/Textualize/rich?tab=readme-ov-file
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from get_gemini_reply import get_gemini_reply
+from stream_gemini_reply import stream_gemini_reply
+from resilience import LLMUnavailableError
+from conversation_scheduler import CANCEL_STOPPED
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+RECORDER_WAIT:float = 1.0       # Seconds to wait for the messages to be recorded at most
+STOPPED_MARKER:str = "[stopped]" # Ends a reply cut short with /stop
+MAIN_CONVERSATION:str = "main"  # Tag of replies in the main conversation
+
+
+###############################################################################
+#
+#  FUNCTION: llm_worker_thread()
+#
+###############################################################################
+
+def llm_worker_thread(scheduler, client_manager, context_builder, prefix_cache, response_cache, request_slots):
+    """Serves requests until STOP_EVENT is set. The other arguments are
+    shared by all workers and owned by llm_client_thread; request_slots
+    is the semaphore bounding the Gemini calls running at once."""
+    metrics = global_variables.global_metrics
+
+    while not global_variables.STOP_EVENT.is_set():
+        taken = scheduler.take(timeout=global_variables.IDLE_WAIT)
+
+        if taken is None :
+            continue
+
+        conversation, items, submitted, cancel = taken
+        started = time.perf_counter()
+        metrics.observe("llm.queue_wait", started - submitted)
+
+        # Lines sent in quick succession get one reply, with the newest instructions.
+        # The scheduler keys conversations by session, None for the main one
+        session_id = conversation
+        sender, _, instructions, _, _ = items[-1]
+        message = "\n".join(message for _, message, _, _, _ in items)
+
+        if len(items) > 1 :
+            metrics.increment("llm.coalesced", len(items) - 1)
+
+        # The reply is built from the history, so the messages must be in it.
+        # The recorder sets each one's event once it is
+        waited = time.monotonic() + RECORDER_WAIT
+
+        for _, _, _, _, recorded in items :
+            if recorded is not None :
+                recorded.wait(max(0.0, waited - time.monotonic()))
+
+        # A session replies from its own history, fetched only now since the
+        # session may have been evicted and reloaded meanwhile. The prefix
+        # cache holds one conversation's prefix, the main one's
+        history = None
+        request_prefix_cache = prefix_cache
+
+        if session_id is not None :
+            history = global_variables.global_sessions.history(session_id)
+            request_prefix_cache = None
+
+        def send(text, kind) :
+            tag = MAIN_CONVERSATION if session_id is None else session_id
+            global_variables.LLM_Out_Queue.put((global_variables.LLM_USERNAME, text, kind, tag, session_id))
+
+        pieces = []
+        shown_lock = threading.Lock()
+
+        def on_chunk(text) :
+            # Partial chunks are shown as they arrive but never recorded
+            with shown_lock :
+                if not cancel.is_set() :
+                    pieces.append(text)
+                    send(text, "partial")
+
+        outcome = {}
+        finished = threading.Event()
+
+        def request(on_text, cancel) :
+            if global_variables.STREAM_REPLIES :
+                return stream_gemini_reply(sender, message, instructions, on_text,
+                                           client_manager=client_manager, context_builder=context_builder,
+                                           prefix_cache=request_prefix_cache, response_cache=response_cache,
+                                           cancel=cancel, history=history)
+
+            return get_gemini_reply(sender, message, instructions, client_manager=client_manager,
+                                    context_builder=context_builder, prefix_cache=request_prefix_cache,
+                                    response_cache=response_cache, cancel=cancel, history=history)
+
+        def generate() :
+            hedger = global_variables.global_hedger
+
+            try :
+                outcome["reply"] = request(on_chunk, cancel) if hedger is None else hedger.run(request, cancel, on_chunk)
+            except Exception as e :
+                outcome["error"] = e
+
+            finally :
+                request_slots.release()
+                finished.set()
+
+        try:
+            # Wait for a slot; a request cancelled meanwhile is never sent
+            while not request_slots.acquire(timeout=0.05) :
+                if cancel.is_set() or global_variables.STOP_EVENT.is_set() :
+                    break
+            else :
+                threading.Thread(target=generate, name=f"{threading.current_thread().name}-Request", daemon=True).start()
+
+            while not (finished.wait(0.05) or cancel.is_set() or global_variables.STOP_EVENT.is_set()) :
+                pass
+
+            if cancel.is_set() and cancel.reason == CANCEL_STOPPED :
+                # Keep what was shown, marked as cut short
+                metrics.increment("llm.stopped")
+
+                with shown_lock :
+                    shown = "".join(pieces)
+                    send(f"{shown} {STOPPED_MARKER}" if shown else STOPPED_MARKER, "final")
+
+            elif cancel.is_set() :
+                # A newer message arrived meanwhile: the next request answers both.
+                # Take back whatever was streamed; nothing is recorded
+                metrics.increment("llm.superseded")
+
+                with shown_lock :
+                    send("", "cancelled")
+
+            elif "error" in outcome :
+                e = outcome["error"]
+
+                if not isinstance(e, LLMUnavailableError) :
+                    raise e
+
+                # Text the users already saw stays; the failure itself is
+                # a notice, never a turn the model will read back
+                if e.partial :
+                    send(e.partial, "final")
+
+                send(f"⚠️ {global_variables.LLM_USERNAME} could not reply: {e.reason}", "error")
+
+            elif "reply" in outcome :
+                # Put the LLM's response into its output queue for the Server to broadcast
+                send(outcome["reply"], "final")
+
+        except Exception as e:
+            global_variables.console.print(f"LLM Worker error: {e}")
+            global_variables.STOP_EVENT.set()
+
+        finally:
+            metrics.observe("llm.service", time.perf_counter() - started)
+            scheduler.done(conversation)
+
+    ###  END OF LLM_WORKER_THREAD  ###
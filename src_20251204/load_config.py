@@ -8,6 +8,28 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          History journal settings
+#  2026-10-18   agent          Snapshot interval settings
+#  2026-10-18   agent          HISTORY_BACKEND selects json or sqlite
+#  2026-10-18   agent          VERBOSE setting
+#  2026-10-18   agent          Gemini connection pool settings
+#  2026-10-18   agent          STREAM_REPLIES setting
+#  2026-10-18   agent          Context budget and policy settings
+#  2026-10-18   agent          Summarizer settings and the summary store
+#  2026-10-18   agent          Prefix cache settings
+#  2026-10-18   agent          Open the response cache
+#  2026-10-18   agent          Build the shared retry policy
+#  2026-10-18   agent          Create the rate limiter from GEMINI_RPM, GEMINI_TPM and RATE_LIMIT_FILE
+#  2026-10-18   agent          Read LLM_WORKERS
+#  2026-10-18   agent          Read DEBOUNCE_MS and SUPERSEDE_REPLIES
+#  2026-10-18   agent          Create the model router from MODEL_* and LLM_SLO_MS
+#  2026-10-18   agent          Create the Hedger when HEDGE_REQUESTS is on
+#  2026-10-18   agent          Read CLIENT_VIEW, CLIENT_VIEW_ROWS and CLIENT_REFRESH_HZ
+#  2026-10-18   agent          Read CHAT_PORT, CHAT_HOST, CHAT_SEND_QUEUE and CHAT_CONSOLE
+#  2026-10-18   agent          Read SESSIONS_DIR, SESSION_MAX_HOT and SESSION_IDLE; create the SessionManager
+#  2026-10-18   agent          Read STARTUP_TIMEOUT
+#  2026-10-18   agent          Keep JOURNAL_FSYNC_INTERVAL for the saver
+#  2026-10-18   agent          SUMMARIZE off unless set
 #
 #
 ###############################################################################
@@ -42,6 +64,7 @@
 ###############################################################################
 
 import os
+import json
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -55,6 +78,23 @@ from pathlib import Path
 import global_variables
 
 
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from history_journal import HistoryJournal
+from history_database import HistoryDatabase
+from summary_store import SummaryStore
+from response_cache import ResponseCache
+from resilience import CircuitBreaker, RetryPolicy
+from rate_limiter import RateLimiter
+from model_router import ModelRouter
+from hedging import Hedger
+from session_manager import SessionManager
+
+
 ###############################################################################
 #
 #  FUNCTION: load_config()
@@ -70,15 +110,124 @@ def load_config() :
     instructions_file = os.getenv("INSTRUCTIONS_FILE")
     history_file = os.getenv("HISTORY_FILE")
     gemini_key_file = os.getenv("GEMINI_KEY_FILE")
+    journal_file = os.getenv("JOURNAL_FILE", "history.journal.jsonl")
+    journal_fsync = os.getenv("JOURNAL_FSYNC", "interval")
+    journal_fsync_interval = float(os.getenv("JOURNAL_FSYNC_INTERVAL", "1.0"))
+    global_variables.JOURNAL_FSYNC_INTERVAL = journal_fsync_interval
+    history_db_file = os.getenv("HISTORY_DB_FILE", "history.db")
+    summary_file = os.getenv("SUMMARY_FILE", "summaries.json")
+    response_cache_enabled = os.getenv("RESPONSE_CACHE", "false").strip().lower() in ("1", "true", "yes", "on")
+    response_cache_file = os.getenv("RESPONSE_CACHE_FILE", "responses.db")
+    sessions_dir = os.getenv("SESSIONS_DIR", "sessions")
+
+    global_variables.HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", global_variables.HISTORY_BACKEND).lower()
+    global_variables.HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", global_variables.HISTORY_PAGE_SIZE))
+    global_variables.VERBOSE = os.getenv("VERBOSE", "false").strip().lower() in ("1", "true", "yes", "on")
+    global_variables.STREAM_REPLIES = os.getenv("STREAM_REPLIES", "true").strip().lower() in ("1", "true", "yes", "on")
+
+    global_variables.JOURNAL_GROUP_COMMIT = int(os.getenv("JOURNAL_GROUP_COMMIT", global_variables.JOURNAL_GROUP_COMMIT))
+    global_variables.JOURNAL_COMPACT_RECORDS = int(os.getenv("JOURNAL_COMPACT_RECORDS", global_variables.JOURNAL_COMPACT_RECORDS))
+    global_variables.SAVE_INTERVAL = int(os.getenv("SAVE_INTERVAL", global_variables.SAVE_INTERVAL))
+    global_variables.SAVE_INTERVAL_MAX = int(os.getenv("SAVE_INTERVAL_MAX", global_variables.SAVE_INTERVAL_MAX))
+
+    global_variables.GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL") or None
+    global_variables.GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", global_variables.GEMINI_MAX_CONNECTIONS))
+    global_variables.GEMINI_KEEPALIVE = float(os.getenv("GEMINI_KEEPALIVE", global_variables.GEMINI_KEEPALIVE))
+
+    global_variables.CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", global_variables.CONTEXT_TOKEN_BUDGET))
+    global_variables.CONTEXT_POLICY = os.getenv("CONTEXT_POLICY", global_variables.CONTEXT_POLICY).strip().lower()
+    global_variables.CONTEXT_KEEP_FIRST = int(os.getenv("CONTEXT_KEEP_FIRST", global_variables.CONTEXT_KEEP_FIRST))
+
+    global_variables.SUMMARIZE = os.getenv("SUMMARIZE", "false").strip().lower() in ("1", "true", "yes", "on")
+    global_variables.HOUSEKEEPING_INTERVAL = float(os.getenv("HOUSEKEEPING_INTERVAL", global_variables.HOUSEKEEPING_INTERVAL))
+    global_variables.SUMMARY_CHUNK_TURNS = int(os.getenv("SUMMARY_CHUNK_TURNS", global_variables.SUMMARY_CHUNK_TURNS))
+    global_variables.SUMMARY_KEEP_RECENT = int(os.getenv("SUMMARY_KEEP_RECENT", global_variables.SUMMARY_KEEP_RECENT))
+    global_variables.SUMMARY_FANOUT = int(os.getenv("SUMMARY_FANOUT", global_variables.SUMMARY_FANOUT))
+    global_variables.SUMMARY_MAX_CALLS = int(os.getenv("SUMMARY_MAX_CALLS", global_variables.SUMMARY_MAX_CALLS))
+    global_variables.SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", global_variables.SUMMARY_MODEL)
+
+    global_variables.PREFIX_CACHE = os.getenv("PREFIX_CACHE", "false").strip().lower() in ("1", "true", "yes", "on")
+    global_variables.PREFIX_CACHE_MIN_TOKENS = int(os.getenv("PREFIX_CACHE_MIN_TOKENS", global_variables.PREFIX_CACHE_MIN_TOKENS))
+    global_variables.PREFIX_CACHE_TTL = int(os.getenv("PREFIX_CACHE_TTL", global_variables.PREFIX_CACHE_TTL))
+    global_variables.PREFIX_CACHE_TAIL = int(os.getenv("PREFIX_CACHE_TAIL", global_variables.PREFIX_CACHE_TAIL))
+    global_variables.PREFIX_CACHE_REFRESH = int(os.getenv("PREFIX_CACHE_REFRESH", global_variables.PREFIX_CACHE_REFRESH))
+
+    global_variables.RESPONSE_CACHE_BYPASS = os.getenv("RESPONSE_CACHE_BYPASS", "false").strip().lower() in ("1", "true", "yes", "on")
+
+    global_variables.LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", global_variables.LLM_DEADLINE))
+    global_variables.LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", global_variables.LLM_MAX_ATTEMPTS))
+    global_variables.LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", global_variables.LLM_BACKOFF_BASE))
+    global_variables.LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", global_variables.LLM_BACKOFF_MAX))
+    global_variables.BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", global_variables.BREAKER_FAILURES))
+    global_variables.BREAKER_RESET = float(os.getenv("BREAKER_RESET", global_variables.BREAKER_RESET))
+
+    global_variables.LLM_WORKERS = int(os.getenv("LLM_WORKERS", global_variables.LLM_WORKERS))
+    global_variables.DEBOUNCE_MS = int(os.getenv("DEBOUNCE_MS", global_variables.DEBOUNCE_MS))
+    global_variables.SUPERSEDE_REPLIES = os.getenv("SUPERSEDE_REPLIES", "true").strip().lower() in ("1", "true", "yes", "on")
+
+    global_variables.GEMINI_RPM = int(os.getenv("GEMINI_RPM", global_variables.GEMINI_RPM))
+    global_variables.GEMINI_TPM = int(os.getenv("GEMINI_TPM", global_variables.GEMINI_TPM))
+    global_variables.RATE_LIMIT_RESERVE = float(os.getenv("RATE_LIMIT_RESERVE", global_variables.RATE_LIMIT_RESERVE))
+    rate_limit_file = os.getenv("RATE_LIMIT_FILE", "").strip()
+
+    global_variables.MODEL_PRIMARY = os.getenv("MODEL_PRIMARY", global_variables.MODEL_PRIMARY).strip()
+    global_variables.MODEL_FAST = os.getenv("MODEL_FAST", global_variables.MODEL_FAST).strip()
+    global_variables.MODEL_LARGE = os.getenv("MODEL_LARGE", global_variables.MODEL_LARGE).strip()
+    global_variables.MODEL_TARGET = os.getenv("MODEL_TARGET", global_variables.MODEL_TARGET).strip().lower()
+    global_variables.ROUTE_SHORT_TOKENS = int(os.getenv("ROUTE_SHORT_TOKENS", global_variables.ROUTE_SHORT_TOKENS))
+    global_variables.ROUTE_LONG_TOKENS = int(os.getenv("ROUTE_LONG_TOKENS", global_variables.ROUTE_LONG_TOKENS))
+    global_variables.LLM_SLO_MS = int(os.getenv("LLM_SLO_MS", global_variables.LLM_SLO_MS))
+
+    global_variables.global_model_router = ModelRouter(global_variables.MODEL_PRIMARY, global_variables.MODEL_FAST,
+                                                       global_variables.MODEL_LARGE, global_variables.MODEL_TARGET,
+                                                       global_variables.ROUTE_SHORT_TOKENS, global_variables.ROUTE_LONG_TOKENS,
+                                                       global_variables.LLM_SLO_MS / 1000.0)
+
+    global_variables.CLIENT_VIEW = os.getenv("CLIENT_VIEW", global_variables.CLIENT_VIEW).strip().lower()
+    global_variables.CLIENT_VIEW_ROWS = int(os.getenv("CLIENT_VIEW_ROWS", global_variables.CLIENT_VIEW_ROWS))
+    global_variables.CLIENT_REFRESH_HZ = float(os.getenv("CLIENT_REFRESH_HZ", global_variables.CLIENT_REFRESH_HZ))
+
+    global_variables.CHAT_PORT = int(os.getenv("CHAT_PORT", global_variables.CHAT_PORT))
+    global_variables.CHAT_HOST = os.getenv("CHAT_HOST", global_variables.CHAT_HOST).strip()
+    global_variables.CHAT_SEND_QUEUE = int(os.getenv("CHAT_SEND_QUEUE", global_variables.CHAT_SEND_QUEUE))
+    global_variables.CHAT_CONSOLE = os.getenv("CHAT_CONSOLE", "true").strip().lower() in ("1", "true", "yes", "on")
+
+    global_variables.SESSION_MAX_HOT = int(os.getenv("SESSION_MAX_HOT", global_variables.SESSION_MAX_HOT))
+    global_variables.SESSION_IDLE = float(os.getenv("SESSION_IDLE", global_variables.SESSION_IDLE))
+
+    global_variables.STARTUP_TIMEOUT = float(os.getenv("STARTUP_TIMEOUT", global_variables.STARTUP_TIMEOUT))
+
+    global_variables.HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "false").strip().lower() in ("1", "true", "yes", "on")
+    global_variables.HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", global_variables.HEDGE_PERCENTILE))
+    global_variables.HEDGE_MIN_MS = int(os.getenv("HEDGE_MIN_MS", global_variables.HEDGE_MIN_MS))
+    global_variables.HEDGE_MAX_RATIO = float(os.getenv("HEDGE_MAX_RATIO", global_variables.HEDGE_MAX_RATIO))
+
+    if global_variables.HEDGE_REQUESTS :
+        global_variables.global_hedger = Hedger(global_variables.HEDGE_PERCENTILE, global_variables.HEDGE_MIN_MS / 1000.0,
+                                                global_variables.HEDGE_MAX_RATIO)
+
+    # One breaker for every caller: they all talk to the same service
+    global_variables.global_retry_policy = RetryPolicy(global_variables.LLM_DEADLINE, global_variables.LLM_MAX_ATTEMPTS,
+                                                       global_variables.LLM_BACKOFF_BASE, global_variables.LLM_BACKOFF_MAX,
+                                                       CircuitBreaker(global_variables.BREAKER_FAILURES, global_variables.BREAKER_RESET))
 
     global_variables.global_config_root = (current_path / config_root).resolve()
     global_variables.global_instructions_file = global_variables.global_config_root / instructions_file
     global_variables.global_history_file = global_variables.global_config_root / history_file
+    global_variables.global_journal_file = global_variables.global_config_root / journal_file
+    global_variables.global_history_db_file = global_variables.global_config_root / history_db_file
+    global_variables.global_summary_file = global_variables.global_config_root / summary_file
+    global_variables.global_response_cache_file = global_variables.global_config_root / response_cache_file
+    global_variables.global_sessions_dir = global_variables.global_config_root / sessions_dir
     gemini_key_file_path = global_variables.global_config_root / gemini_key_file
 
     global_variables.console.print(f"[bold green]Configuration Loaded:[/bold green] {global_variables.global_config_root}")
     global_variables.console.print(f"[bold green]Instructions File:[/bold green] {global_variables.global_instructions_file}")
     global_variables.console.print(f"[bold green]History File:[/bold green] {global_variables.global_history_file}")
+    if global_variables.HISTORY_BACKEND == "sqlite" :
+        global_variables.console.print(f"[bold green]History Database:[/bold green] {global_variables.global_history_db_file}")
+    else :
+        global_variables.console.print(f"[bold green]Journal File:[/bold green] {global_variables.global_journal_file} (fsync: {journal_fsync})")
     global_variables.console.print(f"[bold green]Gemini Key File:[/bold green] {gemini_key_file_path}")
 
     ##############
@@ -113,6 +262,77 @@ def load_config() :
         global_variables.console.print(f"[bold green]Created new history file at:[/bold green] {global_variables.global_history_file}")
 
 
+    ##############
+    #
+    # Open the history store
+    #
+    ###############
+
+    if global_variables.HISTORY_BACKEND == "sqlite" :
+        database = HistoryDatabase(global_variables.global_history_db_file)
+
+        # First run on SQLite: bring the existing history.json along
+        if database.count() == 0 :
+            with open(global_variables.global_history_file, 'r', encoding='utf-8') as f:
+                imported = database.import_entries(json.load(f))
+
+            if imported > 0 :
+                global_variables.console.print(f"[bold green]Imported {imported} turns into:[/bold green] {global_variables.global_history_db_file}")
+
+        global_variables.global_history_store = database
+
+    else :
+        if global_variables.HISTORY_BACKEND != "json" :
+            global_variables.console.print(f"[bold red]Error:[/bold red] Unknown HISTORY_BACKEND '{global_variables.HISTORY_BACKEND}', using json")
+            global_variables.HISTORY_BACKEND = "json"
+
+        # The journal is opened on first append
+        global_variables.global_journal = HistoryJournal(global_variables.global_journal_file, journal_fsync, journal_fsync_interval)
+        global_variables.global_history_store = global_variables.global_journal
+
+        # Summaries address turns by their index in the full history, which
+        # only the json backend has in memory
+        if global_variables.SUMMARIZE :
+            global_variables.global_summaries = SummaryStore(global_variables.global_summary_file)
+            global_variables.console.print(f"[bold green]Summary File:[/bold green] {global_variables.global_summary_file}")
+
+
+    # Sessions are loaded on first use
+    global_variables.global_sessions = SessionManager(global_variables.global_sessions_dir, global_variables.SESSION_MAX_HOT,
+                                                      global_variables.SESSION_IDLE, journal_fsync, journal_fsync_interval)
+
+
+    ##############
+    #
+    # Open the response cache
+    #
+    ###############
+
+    if response_cache_enabled :
+        global_variables.global_response_cache = ResponseCache(global_variables.global_response_cache_file,
+                                                               max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")),
+                                                               max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+                                                               ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600))))
+        global_variables.console.print(f"[bold green]Response Cache:[/bold green] {global_variables.global_response_cache_file}"
+                                       f"{' (bypassed)' if global_variables.RESPONSE_CACHE_BYPASS else ''}")
+
+
+    ##############
+    #
+    # Client-side rate limit, shared with other processes through RATE_LIMIT_FILE
+    #
+    ###############
+
+    if global_variables.GEMINI_RPM > 0 or global_variables.GEMINI_TPM > 0 :
+        rate_limit_path = (global_variables.global_config_root / rate_limit_file) if rate_limit_file else None
+
+        global_variables.global_rate_limiter = RateLimiter(global_variables.GEMINI_RPM, global_variables.GEMINI_TPM,
+                                                           rate_limit_path, global_variables.RATE_LIMIT_RESERVE)
+        global_variables.console.print(f"[bold green]Rate Limit:[/bold green] {global_variables.GEMINI_RPM or 'unlimited'} requests, "
+                                       f"{global_variables.GEMINI_TPM or 'unlimited'} tokens per minute"
+                                       f"{f' (shared through {rate_limit_path})' if rate_limit_path else ''}")
+
+
     ##############
     #
     # Check if Gemini key file exists
@@ -8,6 +8,11 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Replay the history journal after the snapshot
+#  2026-10-18   agent          Page recent turns from the SQLite backend
+#  2026-10-18   agent          Stream history.json, build Content in bulk,
+#                              per-entry output only when VERBOSE
+#  2026-10-18   agent          Load TurnRecords, the LLM context is built from them
 #
 #
 ###############################################################################
@@ -56,20 +61,21 @@ import sys
 
 ###############################################################################
 #
-#  Gemini Imports
+#  Global Variables
 #
 ###############################################################################
 
-from google.genai.types import Content, Part
+import global_variables
 
 
 ###############################################################################
 #
-#  Global Variables
+#  Project Includes
 #
 ###############################################################################
 
-import global_variables
+from stream_history import stream_history
+from turn_record import TurnRecord
 
 
 ###############################################################################
@@ -78,42 +84,45 @@ import global_variables
 #
 ###############################################################################
 
-def load_history(path) :
-    """Loads the chat history from a JSON file."""
+def load_history(path, journal=None) :
+    """Loads the chat history from a JSON snapshot plus the journal written since it.
+
+    history.json is parsed one entry at a time and each entry is turned
+    into a TurnRecord straight away, so the parsed dicts never pile up.
+    Set VERBOSE in .env to print every entry as it loads.
+
+    With the SQLite backend only the most recent HISTORY_PAGE_SIZE turns are
+    loaded; load_older_history() pages in the rest on demand.
+    """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            # We use json.load() to read the JSON and convert it back to a Python list of dicts
-            loaded_history = json.load(f)
+        if global_variables.HISTORY_BACKEND == "sqlite" :
+            loaded_history, global_variables.global_history_oldest_id = \
+                global_variables.global_history_store.page(global_variables.HISTORY_PAGE_SIZE)
 
-            for entry in loaded_history:
-                role = entry.get("role", "unknown")
-                username = entry.get("username", "N/A")
-                timestamp = entry.get("timestamp", "N/A")
-                parts = entry.get("parts", [])
+        else :
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded_history = [TurnRecord.from_entry(entry) for entry in stream_history(f)]
 
-                first_item = parts[0] if parts else {}
-                text = first_item.get("text", "")
+            # Entries recorded after the last compaction live in the journal
+            if journal is not None :
+                loaded_history.extend(journal.replay(start_seq=len(loaded_history)))
 
-                new_text = f"At {timestamp}\, {username} said: {text}"
+        if global_variables.VERBOSE :
+            for record in loaded_history:
+                new_text = record.context_text()
                 print(f"[bold green]Loaded entry:[/bold green] {new_text}")
                 print(f"The length of new_text is {len(new_text)} characters.")
 
-                new_part = Part.from_text(text=new_text)
-                new_parts = [new_part]
-
-                c = Content(role=role, parts=new_parts)
-                
-                with global_variables.global_content_lock :
-                    global_variables.global_content.append(c)
+        global_variables.console.print(f"Loaded {len(loaded_history)} history entries.")
 
-            return loaded_history
+        return loaded_history
     
     except FileNotFoundError:
-        console.print(f"⚠️ File not found at {path}. Returning empty list.")
+        global_variables.console.print(f"⚠️ File not found at {path}. Returning empty list.")
         return []
     
     except json.JSONDecodeError as e:
-        console.print(f"❌ Error decoding JSON: {e}")
+        global_variables.console.print(f"❌ Error decoding JSON: {e}")
         return []
 
     return
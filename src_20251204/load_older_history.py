@@ -0,0 +1,121 @@
+
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          History holds TurnRecords
+#  2026-10-18   agent          Prepend through the ConversationLog
+#  2026-10-18   agent          find_history() for the /find command
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: load_older_history.py
+#
+#   PURPOSE:
+#   Pages older turns from the SQLite history backend in front of the
+#   turns already in memory, and looks up a speaker's turns in all of
+#   it, loaded or not.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/sqlite3.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  FUNCTION: load_older_history()
+#
+###############################################################################
+
+def load_older_history(limit:int = 0) -> int :
+    """Loads up to limit turns older than the oldest one in memory.
+
+    Args:
+        limit: Number of turns to load (0 = HISTORY_PAGE_SIZE).
+
+    Returns:
+        The number of turns loaded. Always 0 for the json backend, which
+        keeps the whole history in memory.
+    """
+    if global_variables.HISTORY_BACKEND != "sqlite" :
+        return 0
+
+    if global_variables.global_history_oldest_id is None :
+        return 0
+
+    if limit <= 0 :
+        limit = global_variables.HISTORY_PAGE_SIZE
+
+    turns, oldest_id = global_variables.global_history_store.page(limit, before_id=global_variables.global_history_oldest_id)
+
+    if not turns :
+        return 0
+
+    global_variables.global_history.prepend(turns)
+
+    global_variables.global_history_oldest_id = oldest_id
+
+    return len(turns)
+
+    ###  END OF LOAD_OLDER_HISTORY  ###
+
+
+###############################################################################
+#
+#  FUNCTION: find_history()
+#
+###############################################################################
+
+def find_history(username, since = None, until = None, limit:int = 0) -> list :
+    """Looks up a speaker's turns in the SQLite history, loaded or not.
+
+    Args:
+        username: The speaker.
+        since: First day, "YYYY-MM-DD", or None.
+        until: Last day, "YYYY-MM-DD", or None.
+        limit: Most turns returned (0 = HISTORY_PAGE_SIZE).
+
+    Returns:
+        TurnRecords, oldest first. Always empty for the json backend.
+    """
+    if global_variables.HISTORY_BACKEND != "sqlite" :
+        return []
+
+    if limit <= 0 :
+        limit = global_variables.HISTORY_PAGE_SIZE
+
+    # Stored timestamps sort as text; widen the days to whole days
+    return global_variables.global_history_store.query(username=username,
+                                                       since=None if since is None else f"{since} 00:00:00",
+                                                       until=None if until is None else f"{until} 23:59:59",
+                                                       limit=limit)
+
+    ###  END OF FIND_HISTORY  ###
@@ -8,6 +8,13 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Print the session metrics at shutdown
+#  2026-10-18   agent          Start the housekeeper thread
+#  2026-10-18   agent          Close the response cache
+#  2026-10-18   agent          Start the chat server thread when CHAT_PORT is set; no console client
+#                              when CHAT_CONSOLE is off
+#  2026-10-18   agent          Start the threads through the Launcher as each is ready to, not a
+#                              second apart; report the launch time
 #
 #
 ###############################################################################
@@ -79,7 +86,10 @@ from client_receive_thread import client_receive_thread
 from client_write_thread import client_write_thread
 from saver_thread import saver_thread
 from recorder_thread import recorder_thread
+from housekeeper_thread import housekeeper_thread
+from chat_server_thread import chat_server_thread
 from load_config import load_config
+from launcher import Launcher
 
 
 ###############################################################################
@@ -98,58 +108,70 @@ import global_variables
 ###############################################################################
 
 if __name__ == "__main__":
+    config_started = time.perf_counter()
     load_config()
-    
-    # --- Saver Thread
-    saver_t = threading.Thread(target=saver_thread, name='Saver-Thread')
+    global_variables.global_metrics.observe("startup.config", time.perf_counter() - config_started)
 
-    # --- Server Thread
-    server_t = threading.Thread(target=server_thread, name='Server-Thread')
+    launcher = Launcher(global_variables.Startup_Inbox, global_variables.STOP_EVENT, global_variables.IDLE_WAIT)
 
-    # --- Recorder Thread
-    recorder_t = threading.Thread(target=recorder_thread, name='Recorder-Thread')
+    # --- Saver Thread (loads the history)
+    launcher.add("saver", saver_thread, 'Saver-Thread', global_variables.HISTORY_READY)
 
-    # --- Client Receiver for Human
-    receive_t = threading.Thread(target=client_receive_thread, name='Client-Receive-Thread')
+    # --- Recorder Thread, appends after the loaded history
+    launcher.add("recorder", recorder_thread, 'Recorder-Thread', global_variables.RECORDER_READY, needs=["saver"])
 
-    # --- Client Transmission for Human
-    write_t = threading.Thread(target=client_write_thread, name='Client-Write-Thread')
+    # --- LLM Thread, sets up its clients while the history loads
+    launcher.add("llm", llm_client_thread, 'LLM-Client-Thread', global_variables.LLM_READY)
 
-    # --- LLM Thread
-    llm_t = threading.Thread(target=llm_client_thread, name='LLM-Client-Thread')
-    
+    # --- Server Thread, routes into the recorder and the LLM
+    launcher.add("server", server_thread, 'Server-Thread', global_variables.SERVER_READY, needs=["recorder", "llm"])
 
+    # --- Housekeeper Thread (summaries of older turns)
+    launcher.add("housekeeper", housekeeper_thread, 'Housekeeper-Thread', global_variables.HOUSEKEEPER_READY, needs=["saver"])
 
-    try:
-        # Start all threads
-        saver_t.start()
-        time.sleep(1)
+    # --- Client Receiver for Human, shows the loaded history first
+    if global_variables.CHAT_CONSOLE :
+        launcher.add("receive", client_receive_thread, 'Client-Receive-Thread', global_variables.RECEIVE_READY, needs=["saver"])
 
-        recorder_t.start()
-        time.sleep(1)
+    # --- Chat Server Thread for remote clients
+    if global_variables.CHAT_PORT :
+        launcher.add("chat", chat_server_thread, 'Chat-Server-Thread', global_variables.CHAT_SERVER_READY, needs=["server"])
 
-        server_t.start()
-        time.sleep(1)
+    # --- Client Transmission for Human, once everything else is ready
+    write_t = threading.Thread(target=client_write_thread, name='Client-Write-Thread')
 
-        receive_t.start()
-        time.sleep(1)
 
-        llm_t.start() # Start the LLM thread
-        time.sleep(1)
-        
-        # Start the write thread and wait for it to finish
-        write_t.start()
-        write_t.join()
+    try:
+        # Start all threads
+        if not launcher.start(global_variables.STARTUP_TIMEOUT) :
+            global_variables.console.print(f"[red]Startup: {launcher.report()}")
+
+        else :
+            global_variables.console.print(f"[bold green]Startup:[/bold green] {launcher.report()}")
+
+            if global_variables.CHAT_CONSOLE :
+                # Start the write thread and wait for it to finish
+                write_t.start()
+                write_t.join()
+            else :
+                # Remote clients only: serve until interrupted
+                while not global_variables.STOP_EVENT.wait(global_variables.IDLE_WAIT) :
+                    pass
 
     except KeyboardInterrupt:
         global_variables.console.print("\n\nApplication manually stopped.")
     finally:
         # Gracefully stop the other threads
         global_variables.STOP_EVENT.set()
-        server_t.join()
-        receive_t.join()
-        llm_t.join()
-        recorder_t.join()
+        launcher.join()
+
+        if global_variables.global_response_cache is not None :
+            global_variables.global_response_cache.close()
+
+        summary = global_variables.global_metrics.summary("Session metrics")
+
+        if summary is not None :
+            global_variables.console.print(summary)
         
         global_variables.console.print("\nAll threads cleaned up. Application finished.")
 
@@ -0,0 +1,238 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: metrics.py
+#
+#   PURPOSE:
+#   In-process counters and latency samples shared by the threads, with
+#   percentile summaries printed at shutdown. Latencies are stored in
+#   seconds under dotted names such as "llm.ttft".
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/statistics.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import math
+import threading
+
+from rich.table import Table
+from rich import box
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+MAX_SAMPLES:int = 10000            # Most recent samples kept per latency
+
+
+###############################################################################
+#
+#  Class: Metrics
+#
+###############################################################################
+
+class Metrics:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Empty set of counters and latency samples.
+    #
+    #  Parameters:
+    #     max_samples - Samples kept per latency name
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, max_samples:int = MAX_SAMPLES):
+
+        self.max_samples:int = max_samples
+
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+        self._samples = {}
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: increment()
+    #
+    #  Description:
+    #     Adds to a counter.
+    #
+    #  Parameters:
+    #     name - Counter name
+    #     amount - Value to add
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def increment(self, name:str, amount:int = 1) -> None:
+
+        with self._lock:
+            self._counters[name] += amount
+
+        return
+
+    ###  END OF INCREMENT()  ###
+
+
+    #####################################################
+    #
+    #  Function: observe()
+    #
+    #  Description:
+    #     Records one latency sample.
+    #
+    #  Parameters:
+    #     name - Latency name
+    #     seconds - Measured duration
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def observe(self, name:str, seconds:float) -> None:
+
+        with self._lock:
+            samples = self._samples.get(name)
+
+            if samples is None:
+                samples = collections.deque(maxlen=self.max_samples)
+                self._samples[name] = samples
+
+            samples.append(seconds)
+
+        return
+
+    ###  END OF OBSERVE()  ###
+
+
+    #####################################################
+    #
+    #  Function: counter() / samples()
+    #
+    #  Description:
+    #     Current value of a counter, and a copy of a latency's samples.
+    #
+    ######################################################
+
+    def counter(self, name:str) -> int:
+
+        with self._lock:
+            return self._counters[name]
+
+    def samples(self, name:str):
+
+        with self._lock:
+            return list(self._samples.get(name, ()))
+
+    ###  END OF COUNTER() / SAMPLES()  ###
+
+
+    #####################################################
+    #
+    #  Function: summary()
+    #
+    #  Description:
+    #     Builds a table of every counter and latency.
+    #
+    #  Parameters:
+    #     title - Table title
+    #
+    #  Returns:
+    #     rich Table, or None when nothing was recorded
+    #
+    ######################################################
+
+    def summary(self, title:str = "Metrics"):
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            latencies = sorted((name, sorted(samples)) for name, samples in self._samples.items() if samples)
+
+        if not counters and not latencies:
+            return None
+
+        table = Table(title=title, box=box.ASCII)
+        table.add_column("Metric")
+        table.add_column("Count", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("p50 (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        table.add_column("p99 (ms)", justify="right")
+
+        for name, value in counters:
+            table.add_row(name, f"{value}", "", "", "", "")
+
+        for name, ordered in latencies:
+            table.add_row(name, f"{len(ordered)}",
+                          f"{sum(ordered) / len(ordered) * 1000:.1f}",
+                          f"{percentile(ordered, 50) * 1000:.1f}",
+                          f"{percentile(ordered, 95) * 1000:.1f}",
+                          f"{percentile(ordered, 99) * 1000:.1f}")
+
+        return table
+
+    ###  END OF SUMMARY()  ###
+
+
+###############################################################################
+#
+#  FUNCTION: percentile()
+#
+###############################################################################
+
+def percentile(ordered, p:float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+
+    return ordered[min(rank, len(ordered)) - 1]
+
+    ###  END OF PERCENTILE  ###
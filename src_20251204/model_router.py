@@ -0,0 +1,287 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: model_router.py
+#
+#   PURPOSE:
+#   Picks the Gemini model for each reply. There are three tiers, fast,
+#   primary and large (a tier left empty falls back to primary), and a
+#   target that trades latency and cost against quality:
+#
+#      target     short message   otherwise   long request
+#      primary    primary         primary     primary
+#      latency    fast            fast        primary
+#      balanced   fast            primary     primary
+#      quality    primary         large       large
+#
+#   A message is short when it has at most short_tokens tokens and the
+#   conversation sent with it is not long; a request is long from
+#   long_tokens tokens on (instructions, summaries and turns).
+#
+#   When the chosen model's p95 time to first text over its recent
+#   requests exceeds the SLO, the next faster tier within the SLO is
+#   used instead. Every PROBE_EVERY-th request it would have had still
+#   goes to the slow model, and samples older than window_seconds are
+#   forgotten, so the fallback ends soon after the model recovers.
+#
+#   Every decision is counted in global_metrics as
+#   "route.<model>.<reason>", and every latency as "llm.ttft.<model>".
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/models
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from metrics import percentile
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+TARGETS = ("primary", "latency", "balanced", "quality")
+
+MIN_SAMPLES:int = 5             # Recent requests before a model's p95 is trusted
+PROBE_EVERY:int = 10            # Requests avoiding a slow model per one sent to it
+
+
+###############################################################################
+#
+#  Class: ModelRouter
+#
+###############################################################################
+
+class ModelRouter:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     primary - Model used unless the policy says otherwise
+    #     fast - Cheaper, faster model, or "" for none
+    #     large - Stronger, slower model, or "" for none
+    #     target - One of TARGETS
+    #     short_tokens - Largest message counted as short
+    #     long_tokens - Smallest request counted as long
+    #     slo - Seconds to first text at p95, 0 = no fallback
+    #     window - Requests per model the p95 is taken over
+    #     window_seconds - Age at which a sample is forgotten
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, primary:str, fast:str = "", large:str = "", target:str = "primary", short_tokens:int = 24,
+                 long_tokens:int = 8000, slo:float = 0.0, window:int = 50, window_seconds:float = 300.0):
+
+        if target not in TARGETS:
+            global_variables.console.print(f"[bold red]Error:[/bold red] Unknown routing target {target}, using primary")
+            target = "primary"
+
+        self.primary:str = primary
+        self.fast:str = fast or primary
+        self.large:str = large or primary
+        self.target:str = target
+        self.short_tokens:int = short_tokens
+        self.long_tokens:int = long_tokens
+        self.slo:float = slo
+        self.window:int = max(MIN_SAMPLES, window)
+        self.window_seconds:float = window_seconds
+
+        self._lock = threading.Lock()
+        self._latencies = {}                # model -> deque of (monotonic time, seconds)
+        self._avoided = collections.Counter()   # model -> requests sent elsewhere for the SLO
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: choose()
+    #
+    #  Description:
+    #     Picks the model for one request and counts the decision.
+    #
+    #  Parameters:
+    #     request_tokens - Estimated input tokens of the whole request
+    #     message_tokens - Estimated tokens of the new message
+    #
+    #  Returns:
+    #     Model name
+    #
+    ######################################################
+
+    def choose(self, request_tokens:int, message_tokens:int) -> str:
+
+        if request_tokens >= self.long_tokens:
+            size = "long"
+        elif message_tokens <= self.short_tokens:
+            size = "short"
+        else:
+            size = "default"
+
+        model = {
+            "primary"  : {"short" : self.primary, "default" : self.primary, "long" : self.primary},
+            "latency"  : {"short" : self.fast,    "default" : self.fast,    "long" : self.primary},
+            "balanced" : {"short" : self.fast,    "default" : self.primary, "long" : self.primary},
+            "quality"  : {"short" : self.primary, "default" : self.large,   "long" : self.large},
+        }[self.target][size]
+
+        reason = size
+
+        # Too slow lately: step down to the first faster tier within the SLO
+        if self.over_slo(model):
+            tiers = [self.large, self.primary, self.fast]
+
+            for faster in tiers[tiers.index(model) + 1:]:
+                if faster != model and not self.over_slo(faster):
+                    with self._lock:
+                        self._avoided[model] += 1
+                        probe = self._avoided[model] % PROBE_EVERY == 0
+
+                    # Now and then the slow model is asked anyway to see if it recovered
+                    if probe:
+                        reason = "probe"
+                    else:
+                        model, reason = faster, "slo_fallback"
+
+                    break
+
+        global_variables.global_metrics.increment(f"route.{model}.{reason}")
+
+        return model
+
+    ###  END OF CHOOSE()  ###
+
+
+    #####################################################
+    #
+    #  Function: record()
+    #
+    #  Description:
+    #     Records a model's time to first text, or to the failure.
+    #
+    #  Parameters:
+    #     model - Model name
+    #     seconds - Measured latency
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def record(self, model:str, seconds:float) -> None:
+
+        with self._lock:
+            latencies = self._latencies.get(model)
+
+            if latencies is None:
+                latencies = self._latencies[model] = collections.deque(maxlen=self.window)
+
+            latencies.append((time.monotonic(), seconds))
+
+        global_variables.global_metrics.observe(f"llm.ttft.{model}", seconds)
+
+        return
+
+    ###  END OF RECORD()  ###
+
+
+    #####################################################
+    #
+    #  Function: p95()
+    #
+    #  Description:
+    #     A model's p95 latency over its recent requests.
+    #
+    #  Parameters:
+    #     model - Model name
+    #
+    #  Returns:
+    #     Seconds, or None with fewer than MIN_SAMPLES recent requests
+    #
+    ######################################################
+
+    def p95(self, model:str):
+
+        cutoff = time.monotonic() - self.window_seconds
+
+        with self._lock:
+            recent = sorted(seconds for when, seconds in self._latencies.get(model, ()) if when >= cutoff)
+
+        if len(recent) < MIN_SAMPLES:
+            return None
+
+        return percentile(recent, 95)
+
+    ###  END OF P95()  ###
+
+
+    #####################################################
+    #
+    #  Function: over_slo()
+    #
+    ######################################################
+
+    def over_slo(self, model:str) -> bool:
+
+        if self.slo <= 0:
+            return False
+
+        p95 = self.p95(model)
+
+        return p95 is not None and p95 > self.slo
+
+    ###  END OF OVER_SLO()  ###
@@ -0,0 +1,456 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          One cache per model
+#  2026-10-18   agent          Network calls outside the lock, charged and retried; deletes wait for the last user
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: prefix_cache.py
+#
+#   PURPOSE:
+#   Server-side context caching of the stable front of each request: the
+#   system instructions plus the older turns (and summaries) chosen by the
+#   ContextBuilder. The prefix is uploaded once with caches.create() and
+#   each request then carries only the turns after it.
+#
+#   The newest PREFIX_CACHE_TAIL items are left out of a new cache so it
+#   stays valid while turns are added. Once PREFIX_CACHE_REFRESH items
+#   have piled up after it, or it is about to expire, a larger cache
+#   replaces it. A change of instructions text, or a request that no
+#   longer starts with the cached items, also replaces it.
+#
+#   Each model has a cache of its own, since a cache only serves the
+#   model it was made for, so replies routed to different models do not
+#   replace each other's cache. The ContextBuilder is asked to move the
+#   window start in steps of PREFIX_CACHE_REFRESH turns, otherwise a
+#   budgeted window would start one turn later on almost every request.
+#
+#   Creating and deleting a cache are Gemini calls like any other: made
+#   without holding the lock, charged to the rate limiter and, for a
+#   create, retried through the RetryPolicy within LLM_DEADLINE. While
+#   one request creates a model's cache, others for that model send
+#   every turn instead of waiting. Each request holds a lease on the
+#   cache it names until it is over, so a cache replaced meanwhile is
+#   deleted only once the last request using it (a hedge, or a call
+#   abandoned by /stop) has ended.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/caching
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import hashlib
+import threading
+import time
+
+from google.genai import types
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from gemini_client_manager import GeminiClientManager
+from resilience import LLMUnavailableError, RetryPolicy
+from rate_limiter import RateLimiter, PRIORITY_INTERACTIVE
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+EXPIRY_MARGIN:float = 60.0         # Seconds before expiry a cache is replaced
+
+
+###############################################################################
+#
+#  Class: CachedPrefix
+#
+###############################################################################
+
+class CachedPrefix:
+    """One server-side cache, the items it holds and the requests using it."""
+
+    __slots__ = ("name", "instructions", "prefix", "config", "expires", "users", "dropped")
+
+    def __init__(self, name:str, instructions:str, prefix, config, expires:float):
+        self.name:str = name
+        self.instructions:str = instructions    # Hash of the instructions text
+        self.prefix = tuple(prefix)
+        self.config = config                    # GenerateContentConfig naming it
+        self.expires:float = expires
+        self.users:int = 0                      # Requests holding a lease on it
+        self.dropped:bool = False               # Replaced; deleted once unused
+
+
+###############################################################################
+#
+#  Class: PrefixCache
+#
+###############################################################################
+
+class PrefixCache:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     client_manager - GeminiClientManager used to create/delete caches
+    #     estimate - Callable giving the tokens of an item
+    #                (ContextBuilder.estimate)
+    #     min_tokens - Smallest prefix worth caching (the API minimum)
+    #     ttl - Seconds a cache lives on the server
+    #     tail - Newest items left out of a new cache
+    #     refresh - Items after the cache before it is rebuilt
+    #     retry_policy - Retries a create. Defaults to the shared
+    #                    global_retry_policy
+    #     rate_limiter - Charged for creates and deletes. Defaults to
+    #                    the shared global_rate_limiter
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, client_manager:GeminiClientManager, estimate, min_tokens:int = 1024, ttl:int = 3600,
+                 tail:int = 10, refresh:int = 40, retry_policy:RetryPolicy = None, rate_limiter:RateLimiter = None):
+
+        self.client_manager = client_manager
+        self.estimate = estimate
+        self.min_tokens:int = min_tokens
+        self.ttl:int = ttl
+        self.tail:int = max(1, tail)
+        self.refresh:int = max(self.tail, refresh)
+        self.retry_policy:RetryPolicy = retry_policy
+        self.rate_limiter:RateLimiter = rate_limiter
+
+        self._lock = threading.Lock()
+        self._caches = {}                # model -> CachedPrefix
+        self._creating = set()           # Models whose cache is being created
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: prepare()
+    #
+    #  Description:
+    #     Works out what a request has to carry, creating a cache
+    #     if there is none to use.
+    #
+    #  Parameters:
+    #     items - Output of ContextBuilder.build()
+    #     system_instructions - The instructions text
+    #     model_name - Model the request is for
+    #
+    #  Returns:
+    #     (contents, config, lease): the Content list to send, the
+    #     GenerateContentConfig to send it with, and the CachedPrefix
+    #     it names or None. Pass the lease to release() once the
+    #     request is over.
+    #
+    ######################################################
+
+    def prepare(self, items, system_instructions:str, model_name:str):
+
+        metrics = global_variables.global_metrics
+        instructions = hashlib.sha256(system_instructions.encode("utf-8")).hexdigest()
+        split = len(items) - self.tail
+        unused = []
+        lease = None
+        create = False
+
+        with self._lock:
+            cached = self._caches.get(model_name)
+
+            if cached is not None:
+                if instructions != cached.instructions:
+                    metrics.increment("prefix_cache.invalidated")
+                    unused.append(self._drop(model_name))
+                    cached = None
+
+                elif time.time() >= cached.expires - EXPIRY_MARGIN:
+                    unused.append(self._drop(model_name))
+                    cached = None
+
+            if cached is not None:
+                count = len(cached.prefix)
+
+                if count < len(items) <= count + self.refresh and \
+                   all(prefix is item for prefix, item in zip(cached.prefix, items)):
+                    metrics.increment("prefix_cache.hits")
+                    cached.users += 1
+                    lease = cached
+
+                else:
+                    unused.append(self._drop(model_name))
+
+            if lease is None:
+                metrics.increment("prefix_cache.misses")
+
+                # One request creates it; the others meanwhile send every turn
+                if split > 0 and model_name not in self._creating:
+                    self._creating.add(model_name)
+                    create = True
+
+        self._delete(unused)
+
+        if lease is not None:
+            return [item.to_content() for item in items[len(lease.prefix):]], lease.config, lease
+
+        if create:
+            try:
+                # Unless the prefix is too small to be allowed
+                tokens = sum(self.estimate(item) for item in items[:split])
+
+                if tokens >= self.min_tokens:
+                    lease = self._create(items[:split], tokens, system_instructions, model_name, instructions)
+
+            finally:
+                with self._lock:
+                    self._creating.discard(model_name)
+
+                    if lease is not None:
+                        lease.users += 1
+                        self._caches[model_name] = lease
+
+            if lease is not None:
+                return [item.to_content() for item in items[split:]], lease.config, lease
+
+        return [item.to_content() for item in items], self.client_manager.config(system_instructions), None
+
+    ###  END OF PREPARE()  ###
+
+
+    #####################################################
+    #
+    #  Function: release()
+    #
+    #  Description:
+    #     Ends a request's lease. A cache replaced while it was in
+    #     use is deleted once the last lease on it ends.
+    #
+    #  Parameters:
+    #     lease - As returned by prepare(), or None
+    #
+    ######################################################
+
+    def release(self, lease:CachedPrefix) -> None:
+
+        if lease is None:
+            return
+
+        with self._lock:
+            lease.users -= 1
+            unused = lease.name if lease.dropped and lease.users == 0 else None
+
+        self._delete([unused])
+
+        return
+
+    ###  END OF RELEASE()  ###
+
+
+    #####################################################
+    #
+    #  Function: invalidate()
+    #
+    #  Description:
+    #     Forgets a cache, for example after a request naming it was
+    #     rejected. The next prepare() for the model builds a new one.
+    #
+    #  Parameters:
+    #     model_name - Model whose cache to forget, None = every model
+    #
+    ######################################################
+
+    def invalidate(self, model_name:str = None) -> None:
+
+        with self._lock:
+            unused = [self._drop(model) for model in ([model_name] if model_name is not None else list(self._caches))]
+
+        self._delete(unused)
+
+        return
+
+    ###  END OF INVALIDATE()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    #  Description:
+    #     Deletes the server-side caches instead of waiting for their
+    #     TTL. One still in use is deleted when its last lease ends.
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        self.invalidate()
+
+        return
+
+    ###  END OF CLOSE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _create()
+    #
+    #  Description:
+    #     Uploads the prefix, through the rate limiter and the retry
+    #     policy. Called without the lock.
+    #
+    #  Parameters:
+    #     prefix - Items to cache
+    #     tokens - Their estimated tokens, charged to the rate limiter
+    #     system_instructions - The instructions text
+    #     model_name - Model the cache is for
+    #     instructions - Hash of system_instructions
+    #
+    #  Returns:
+    #     The CachedPrefix, or None if it could not be created
+    #
+    ######################################################
+
+    def _create(self, prefix, tokens:int, system_instructions:str, model_name:str, instructions:str) -> CachedPrefix:
+
+        metrics = global_variables.global_metrics
+        retry_policy = self.retry_policy or global_variables.global_retry_policy
+        rate_limiter = self.rate_limiter or global_variables.global_rate_limiter
+        config = types.CreateCachedContentConfig(
+            system_instruction=system_instructions,
+            contents=[item.to_content() for item in prefix],
+            ttl=f"{self.ttl}s",
+        )
+
+        def attempt(remaining):
+            until = time.monotonic() + remaining
+
+            if rate_limiter is not None and \
+               not rate_limiter.acquire(tokens, PRIORITY_INTERACTIVE, timeout=max(0.0, until - time.monotonic())):
+                raise LLMUnavailableError("Rate limit budget exhausted")
+
+            remaining = until - time.monotonic()
+
+            if remaining <= 0:
+                raise LLMUnavailableError("Gemini did not answer in time")
+
+            return self.client_manager.client.caches.create(model=model_name,
+                                                            config=self.client_manager.timed(config, remaining))
+
+        start = time.perf_counter()
+
+        try:
+            if retry_policy is None:
+                cache = attempt(global_variables.LLM_DEADLINE)
+            else:
+                cache = retry_policy.call(attempt)
+
+        except Exception as e:
+            metrics.increment("prefix_cache.errors")
+            global_variables.console.print(f"Prefix cache error: {e}")
+            return None
+
+        metrics.observe("prefix_cache.create", time.perf_counter() - start)
+        metrics.increment("prefix_cache.created")
+
+        return CachedPrefix(cache.name, instructions, prefix, types.GenerateContentConfig(cached_content=cache.name),
+                            time.time() + self.ttl)
+
+    ###  END OF _CREATE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _drop() / _delete()
+    #
+    #  Description:
+    #     _drop() forgets the model's cache, if any, and is called with
+    #     the lock held. It returns the cache's name if nothing uses it,
+    #     else None; the last release() then deletes it.
+    #
+    #     _delete() deletes the named caches, without the lock. A delete
+    #     the rate limiter has no room for right now is skipped; the
+    #     cache expires with its TTL.
+    #
+    ######################################################
+
+    def _drop(self, model_name:str):
+
+        cached = self._caches.pop(model_name, None)
+
+        if cached is None:
+            return None
+
+        cached.dropped = True
+
+        return cached.name if cached.users == 0 else None
+
+    def _delete(self, names) -> None:
+
+        metrics = global_variables.global_metrics
+        rate_limiter = self.rate_limiter or global_variables.global_rate_limiter
+
+        for name in names:
+            if name is None:
+                continue
+
+            if rate_limiter is not None and not rate_limiter.acquire(0, PRIORITY_INTERACTIVE, timeout=0):
+                metrics.increment("prefix_cache.delete_skipped")
+                continue
+
+            try:
+                self.client_manager.client.caches.delete(
+                    name=name, config=self.client_manager.timed(types.DeleteCachedContentConfig(), global_variables.LLM_DEADLINE))
+            except Exception:
+                # Already gone, or it expires on its own
+                metrics.increment("prefix_cache.delete_errors")
+
+        return
+
+    ###  END OF _DROP() / _DELETE()  ###
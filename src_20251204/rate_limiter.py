@@ -0,0 +1,355 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: rate_limiter.py
+#
+#   PURPOSE:
+#   Client-side requests-per-minute and tokens-per-minute budgets for the
+#   Gemini API key, so Willow slows down before Google answers with 429.
+#
+#   Both budgets are token buckets that hold one minute's allowance and
+#   refill continuously. A caller takes one request and its estimated
+#   input tokens before each call, and settles the difference once the
+#   real token count is known.
+#
+#   Waiting callers queue by priority, interactive turns first and FIFO
+#   within a priority. Background work (summaries) must also leave
+#   background_reserve of each bucket untouched, so it cannot starve
+#   replies that other Willow processes are about to send either.
+#
+#   With a state file the buckets live in that file, locked with flock,
+#   and every Willow process on the host that names the same file shares
+#   one budget.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/rate-limits
+#   https://en.wikipedia.org/wiki/Token_bucket
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import heapq
+import itertools
+import json
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:           # Windows: no flock, budgets stay per process
+    fcntl = None
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+PRIORITY_INTERACTIVE:int = 0    # A user is waiting for the reply
+PRIORITY_BACKGROUND:int = 1     # Summaries and other housekeeping
+
+MAX_WAIT_STEP:float = 0.5       # Seconds between STOP_EVENT checks
+
+
+###############################################################################
+#
+#  Class: RateLimiter
+#
+###############################################################################
+
+class RateLimiter:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     rpm - Requests per minute, 0 = unlimited
+    #     tpm - Tokens per minute, 0 = unlimited
+    #     state_file - Path shared with other processes, or None
+    #     background_reserve - Fraction of each bucket background work
+    #                          must leave for interactive turns
+    #     period - Seconds the budgets are counted over (tests use less)
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, rpm:int = 0, tpm:int = 0, state_file = None, background_reserve:float = 0.2, period:float = 60.0):
+
+        if state_file is not None and fcntl is None:
+            global_variables.console.print("[bold red]Error:[/bold red] File locking is not available here, the rate limit is not shared")
+            state_file = None
+
+        self.rpm:int = max(0, rpm)
+        self.tpm:int = max(0, tpm)
+        self.state_file = state_file
+        self.background_reserve:float = min(max(background_reserve, 0.0), 0.9)
+        self.period:float = period
+
+        self._cond = threading.Condition()
+        self._waiters = []                  # Heap of (priority, ticket)
+        self._tickets = itertools.count()
+
+        # Start with a full minute's allowance
+        self._state = {"requests" : float(self.rpm), "tokens" : float(self.tpm), "updated" : time.time()}
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: acquire()
+    #
+    #  Description:
+    #     Blocks until one request and tokens fit in the budgets and
+    #     every caller ahead in the queue has been served.
+    #
+    #  Parameters:
+    #     tokens - Estimated tokens of the request
+    #     priority - PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+    #     timeout - Seconds to wait at most, or None
+    #
+    #  Returns:
+    #     True once taken, False on timeout or shutdown
+    #
+    ######################################################
+
+    def acquire(self, tokens:int, priority:int = PRIORITY_INTERACTIVE, timeout = None) -> bool:
+
+        metrics = global_variables.global_metrics
+        start = time.monotonic()
+        waited = False
+        entry = (priority, next(self._tickets))
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+
+            try:
+                while True:
+                    if self._waiters[0] == entry:
+                        wait = self._update(lambda state : self._take(state, tokens, priority))
+
+                        if wait == 0:
+                            if waited:
+                                metrics.increment("ratelimit.throttled")
+
+                            metrics.observe("ratelimit.wait", time.monotonic() - start)
+                            return True
+                    else:
+                        # Woken when the caller ahead is done
+                        wait = MAX_WAIT_STEP
+
+                    if timeout is not None:
+                        remaining = start + timeout - time.monotonic()
+
+                        if remaining <= 0:
+                            metrics.increment("ratelimit.timeouts")
+                            return False
+
+                        wait = min(wait, remaining)
+
+                    if global_variables.STOP_EVENT.is_set():
+                        return False
+
+                    waited = True
+                    self._cond.wait(min(wait, MAX_WAIT_STEP))
+
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    ###  END OF ACQUIRE()  ###
+
+
+    #####################################################
+    #
+    #  Function: settle()
+    #
+    #  Description:
+    #     Charges the difference between the estimate taken by acquire()
+    #     and the tokens the API reports (input and output). The token
+    #     bucket may go below zero; later callers wait it off.
+    #
+    #  Parameters:
+    #     estimated - Tokens passed to acquire()
+    #     actual - total_token_count from usage_metadata, or None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def settle(self, estimated:int, actual) -> None:
+
+        if not self.tpm or actual is None:
+            return
+
+        def charge(state):
+            state["tokens"] -= actual - min(estimated, self.tpm)
+
+        with self._cond:
+            self._update(charge)
+            self._cond.notify_all()
+
+        return
+
+    ###  END OF SETTLE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _take()
+    #
+    #  Description:
+    #     Takes one request and tokens from refilled buckets if they
+    #     fit, leaving the reserve for background callers.
+    #
+    #  Parameters:
+    #     state - Bucket levels, already refilled
+    #     tokens - Estimated tokens
+    #     priority - Caller priority
+    #
+    #  Returns:
+    #     0 once taken, else seconds until they would fit
+    #
+    ######################################################
+
+    def _take(self, state:dict, tokens:int, priority:int) -> float:
+
+        reserve = self.background_reserve if priority > PRIORITY_INTERACTIVE else 0.0
+
+        # A request larger than the whole budget would never fit
+        need_requests = 1 + reserve * self.rpm
+        need_tokens = min(tokens, self.tpm * (1 - reserve)) + reserve * self.tpm
+
+        wait = 0.0
+
+        if self.rpm and state["requests"] < need_requests:
+            wait = max(wait, (need_requests - state["requests"]) * self.period / self.rpm)
+
+        if self.tpm and state["tokens"] < need_tokens:
+            wait = max(wait, (need_tokens - state["tokens"]) * self.period / self.tpm)
+
+        if wait > 0:
+            return wait
+
+        state["requests"] -= 1
+        state["tokens"] -= min(tokens, self.tpm)
+
+        return 0
+
+    ###  END OF _TAKE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _update()
+    #
+    #  Description:
+    #     Refills the buckets for the time passed and applies change to
+    #     them, under the file lock when the state is shared. Called
+    #     with self._cond held.
+    #
+    #  Parameters:
+    #     change - Callable taking the state dict
+    #
+    #  Returns:
+    #     Whatever change returns
+    #
+    ######################################################
+
+    def _update(self, change):
+
+        if self.state_file is None:
+            return self._refill_and(self._state, change)
+
+        with open(self.state_file, "a+", encoding="utf-8") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+            try:
+                f.seek(0)
+
+                try:
+                    state = json.loads(f.read())
+                except json.JSONDecodeError:
+                    # New or damaged file: start from a full budget
+                    state = {"requests" : float(self.rpm), "tokens" : float(self.tpm), "updated" : time.time()}
+
+                result = self._refill_and(state, change)
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        return result
+
+    ###  END OF _UPDATE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _refill_and()
+    #
+    #  Description:
+    #     Adds the allowance earned since the last update, capped at
+    #     one period's worth, then applies change.
+    #
+    ######################################################
+
+    def _refill_and(self, state:dict, change):
+
+        now = time.time()
+        elapsed = max(0.0, now - state.get("updated", now))
+
+        state["requests"] = min(float(self.rpm), state.get("requests", 0.0) + elapsed * self.rpm / self.period)
+        state["tokens"] = min(float(self.tpm), state.get("tokens", 0.0) + elapsed * self.tpm / self.period)
+        state["updated"] = now
+
+        return change(state)
+
+    ###  END OF _REFILL_AND()  ###
@@ -7,6 +7,15 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Group commit entries to the history journal
+#  2026-10-18   agent          Bump the history generation for the saver
+#  2026-10-18   agent          Append to whichever history store is configured
+#  2026-10-18   agent          Record TurnRecords only, the LLM context is built from them
+#  2026-10-18   agent          Append to the ConversationLog
+#  2026-10-18   agent          Idle wait of IDLE_WAIT
+#  2026-10-18   agent          Turns of other sessions go to their shards
+#  2026-10-18   agent          Sets RECORDER_READY
+#  2026-10-18   agent          Sets each entry's recorded event once the batch is in the history
 #
 #
 ###############################################################################
@@ -65,11 +74,11 @@ import global_variables
 
 ###############################################################################
 #
-#  Gemini Includes
+#  Project Includes
 #
 ###############################################################################
 
-from google.genai.types import Content, Part
+from turn_record import TurnRecord
 
 
 ###############################################################################
@@ -80,31 +89,57 @@ from google.genai.types import Content, Part
 
 def recorder_thread():
 
+    store = global_variables.global_history_store
+
+    global_variables.RECORDER_READY.set()
+
     # --- Main conversation loop
 
     while not global_variables.STOP_EVENT.is_set():
         try:
-            stuff = global_variables.Recorder_In_Queue.get(timeout=0.1)
-            speaker = stuff[0]
-            message = stuff[1]
-            role = stuff[2]
-            timestamp = stuff[3]
-
-            new_entry = {"timestamp" : timestamp, "role" : role, "username" : speaker}
-            new_part = [{"text" : message}]
-            new_entry["parts"] = new_part
-            
-            with global_variables.global_history_lock :
-                global_variables.global_history.append(new_entry)
+            batch = [global_variables.Recorder_In_Queue.get(timeout=global_variables.IDLE_WAIT)]
 
-            new_parts = [Part.from_text(text=f"At {timestamp}, {speaker} said: {message}")]
+            # Group commit: pick up everything else that is already waiting
+            while len(batch) < global_variables.JOURNAL_GROUP_COMMIT:
+                try:
+                    batch.append(global_variables.Recorder_In_Queue.get_nowait())
+                except queue.Empty:
+                    break
 
-            c = Content(role=role, parts=new_parts)
-            
-            with global_variables.global_content_lock :
-                global_variables.global_content.append(c)
+            new_entries = []
+            session_entries = {}    # session -> its TurnRecords
+
+            for stuff in batch:
+                speaker = stuff[0]
+                message = stuff[1]
+                role = stuff[2]
+                timestamp = stuff[3]
+                session_id = stuff[4] if len(stuff) > 4 else None
+
+                record = TurnRecord.from_message(speaker, message, role, timestamp)
+
+                if session_id is None :
+                    new_entries.append(record)
+                else :
+                    session_entries.setdefault(session_id, []).append(record)
 
-            global_variables.Recorder_In_Queue.task_done()
+            if new_entries :
+                first_seq = global_variables.global_history.append(new_entries)
+
+                # One write (and at most one fsync) for the whole batch
+                if store is not None :
+                    store.append(list(enumerate(new_entries, start=first_seq)))
+
+            # Each session has its own shard
+            for session_id, entries in session_entries.items() :
+                global_variables.global_sessions.record(session_id, entries)
+
+            for stuff in batch :
+                # [speaker, message, role, timestamp, session, recorded event]
+                if len(stuff) > 5 and stuff[5] is not None :
+                    stuff[5].set()
+
+                global_variables.Recorder_In_Queue.task_done()
             
         except queue.Empty:
             continue
@@ -112,6 +147,12 @@ def recorder_thread():
             global_variables.console.print(f"Recorder error: {e}")
             global_variables.STOP_EVENT.set()
     
+    if store is not None :
+        store.close()
+
+    if global_variables.global_sessions is not None :
+        global_variables.global_sessions.close()
+
     global_variables.console.print("Recorder: Stopped.")
 
     ####  END OF RECORDER_THREAD  ###
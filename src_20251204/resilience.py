@@ -0,0 +1,442 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Pass LLMUnavailableError from the request straight through
+#  2026-10-18   agent          RequestCancelled
+#  2026-10-18   agent          Each attempt is given the time left until the deadline
+#  2026-10-18   agent          An attempt that ends before it reaches Gemini frees the trial slot
+#  2026-10-18   agent          DeadlineExceeded counts against the breaker; a rejected
+#                              request frees the trial slot instead of closing it
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: resilience.py
+#
+#   PURPOSE:
+#   Retry policy for Gemini calls. Failures are classified as retryable
+#   (429, 5xx, timeouts, dropped connections) or not; retryable ones are
+#   retried with jittered exponential backoff, honoring the server's
+#   retry delay, until the per-request deadline. Each attempt is told the
+#   time left, so its own waits end by the deadline. A circuit breaker shared
+#   by every caller fails fast while the upstream keeps failing, and lets
+#   one trial request through after a cool-down.
+#
+#   A request that finally fails raises LLMUnavailableError. Callers show
+#   it as a notice; it is never recorded as a model turn.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/troubleshooting
+#   https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+#   https://martinfowler.com/bliki/CircuitBreaker.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import random
+import re
+import threading
+import time
+
+import httpx
+
+from google.genai import errors
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
+BREAKER_CLOSED:str = "closed"        # Requests flow normally
+BREAKER_OPEN:str = "open"            # Failing fast until the cool-down ends
+BREAKER_HALF_OPEN:str = "half_open"  # One trial request decides
+
+
+###############################################################################
+#
+#  Class: LLMUnavailableError
+#
+###############################################################################
+
+class LLMUnavailableError(Exception):
+    """A Gemini request failed for good.
+
+    Attributes:
+        reason: Short text for the user ("rate limited", "circuit open", ...)
+        cause: The last underlying exception, if any
+        partial: Reply text already streamed before the failure
+    """
+
+    def __init__(self, reason:str, cause:Exception = None):
+        super().__init__(reason if cause is None else f"{reason}: {cause}")
+        self.reason = reason
+        self.cause = cause
+        self.partial = ""
+
+
+###############################################################################
+#
+#  Class: RequestCancelled
+#
+###############################################################################
+
+class RequestCancelled(LLMUnavailableError):
+    """The reply was abandoned on purpose, for example because a newer
+    message superseded it. Nothing is shown for it."""
+
+
+###############################################################################
+#
+#  Class: DeadlineExceeded
+#
+###############################################################################
+
+class DeadlineExceeded(LLMUnavailableError):
+    """Gemini was called but did not finish answering by the deadline,
+    for example a stream that kept trickling. Unlike the other
+    LLMUnavailableErrors raised by a request, it counts against the
+    circuit breaker."""
+
+
+###############################################################################
+#
+#  FUNCTION: classify()
+#
+###############################################################################
+
+def classify(error:Exception) :
+    """Returns (retryable, metric label) for an exception."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS, str(error.code)
+
+    if isinstance(error, httpx.TimeoutException):
+        return True, "timeout"
+
+    if isinstance(error, httpx.TransportError):
+        return True, "network"
+
+    return False, type(error).__name__
+
+    ###  END OF CLASSIFY  ###
+
+
+###############################################################################
+#
+#  FUNCTION: retry_after()
+#
+###############################################################################
+
+def retry_after(error:Exception) :
+    """Seconds the server asked us to wait, or None.
+
+    Looks at the Retry-After header and at the RetryInfo detail
+    ("retryDelay": "13s") Gemini sends with 429 responses."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+
+    if headers is not None:
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+
+    match = re.search(r"""retryDelay['"]?\s*:\s*['"](\d+(?:\.\d+)?)s""", str(getattr(error, "details", "")))
+
+    return float(match.group(1)) if match else None
+
+    ###  END OF RETRY_AFTER  ###
+
+
+###############################################################################
+#
+#  Class: CircuitBreaker
+#
+###############################################################################
+
+class CircuitBreaker:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     failure_threshold - Consecutive retryable failures that open it
+    #     reset_timeout - Seconds it stays open before a trial request
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, failure_threshold:int = 5, reset_timeout:float = 30.0):
+
+        self.failure_threshold:int = failure_threshold
+        self.reset_timeout:float = reset_timeout
+
+        self._lock = threading.Lock()
+        self.state:str = BREAKER_CLOSED
+        self._failures:int = 0
+        self._opened_at:float = 0.0
+        self._trial_running:bool = False
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: allow()
+    #
+    #  Description:
+    #     May a request go out now? While half open only one trial
+    #     request is let through.
+    #
+    ######################################################
+
+    def allow(self) -> bool:
+
+        with self._lock:
+            if self.state == BREAKER_OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+
+                self.state = BREAKER_HALF_OPEN
+                self._trial_running = False
+
+            if self.state == BREAKER_HALF_OPEN:
+                if self._trial_running:
+                    return False
+
+                self._trial_running = True
+
+            return True
+
+    ###  END OF ALLOW()  ###
+
+
+    #####################################################
+    #
+    #  Function: record_success() / record_failure()
+    #
+    #  Description:
+    #     Report the outcome of an allowed request.
+    #
+    ######################################################
+
+    def record_success(self) -> None:
+
+        with self._lock:
+            if self.state != BREAKER_CLOSED:
+                global_variables.console.print("Gemini is answering again.")
+
+            self.state = BREAKER_CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+
+            if self.state == BREAKER_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != BREAKER_OPEN:
+                    global_variables.global_metrics.increment("llm.circuit_opened")
+
+                self.state = BREAKER_OPEN
+                self._opened_at = time.monotonic()
+
+    ###  END OF RECORD_SUCCESS() / RECORD_FAILURE()  ###
+
+
+    #####################################################
+    #
+    #  Function: release()
+    #
+    #  Description:
+    #     An allowed request ended without an outcome (cancelled,
+    #     rate limited, shutting down). Counts nothing; while half
+    #     open the next request becomes the trial.
+    #
+    ######################################################
+
+    def release(self) -> None:
+
+        with self._lock:
+            self._trial_running = False
+
+    ###  END OF RELEASE()  ###
+
+
+###############################################################################
+#
+#  Class: RetryPolicy
+#
+###############################################################################
+
+class RetryPolicy:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     deadline - Seconds a request may take, retries included
+    #     max_attempts - Attempts including the first one
+    #     base_delay - First backoff in seconds
+    #     max_delay - Largest backoff in seconds
+    #     breaker - Shared CircuitBreaker, or None
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, deadline:float = 60.0, max_attempts:int = 5, base_delay:float = 0.5, max_delay:float = 20.0,
+                 breaker:CircuitBreaker = None):
+
+        self.deadline:float = deadline
+        self.max_attempts:int = max(1, max_attempts)
+        self.base_delay:float = base_delay
+        self.max_delay:float = max_delay
+        self.breaker = breaker
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: call()
+    #
+    #  Description:
+    #     Runs request() until it succeeds, fails with an error that
+    #     is not retryable, or the attempts or deadline run out.
+    #
+    #  Parameters:
+    #     request - Callable making one attempt, given the seconds
+    #               left until the deadline; no wait of its own
+    #               (rate limit, network) may take longer
+    #     can_retry - Callable, False once retrying is no longer safe
+    #                 (for example after streamed text was shown)
+    #
+    #  Returns:
+    #     Whatever request() returns
+    #
+    ######################################################
+
+    def call(self, request, can_retry = None):
+
+        metrics = global_variables.global_metrics
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                metrics.increment("llm.errors.deadline")
+                raise LLMUnavailableError("Gemini did not answer in time")
+
+            if self.breaker is not None and not self.breaker.allow():
+                metrics.increment("llm.errors.circuit_open")
+                raise LLMUnavailableError("Gemini is failing, not trying again yet")
+
+            attempt += 1
+
+            try:
+                result = request(remaining)
+
+            except DeadlineExceeded:
+                metrics.increment("llm.errors.deadline")
+
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+
+                raise
+
+            except LLMUnavailableError:
+                # Decided before anything was sent, or cancelled (rate limit,
+                # supersede, /stop, a lost hedge): says nothing about Gemini
+                if self.breaker is not None:
+                    self.breaker.release()
+
+                raise
+
+            except Exception as e:
+                retryable, label = classify(e)
+                metrics.increment(f"llm.errors.{label}")
+
+                # Only upstream trouble counts against the breaker; a
+                # rejected request says nothing either way
+                if self.breaker is not None:
+                    if retryable:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.release()
+
+                if not retryable:
+                    raise LLMUnavailableError("Gemini rejected the request", e) from e
+
+                if attempt >= self.max_attempts or (can_retry is not None and not can_retry()):
+                    raise LLMUnavailableError("Gemini is unavailable", e) from e
+
+                # Full jitter, but never sooner than the server asked
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+                hint = retry_after(e)
+
+                if hint is not None:
+                    delay = max(delay, hint)
+
+                if time.monotonic() + delay >= deadline:
+                    metrics.increment("llm.errors.deadline")
+                    raise LLMUnavailableError("Gemini did not answer in time", e) from e
+
+                metrics.increment("llm.retries")
+
+                if global_variables.STOP_EVENT.wait(delay):
+                    raise LLMUnavailableError("Shutting down", e) from e
+
+                continue
+
+            if self.breaker is not None:
+                self.breaker.record_success()
+
+            return result
+
+    ###  END OF CALL()  ###
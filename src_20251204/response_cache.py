@@ -0,0 +1,279 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: response_cache.py
+#
+#   PURPOSE:
+#   Optional on-disk cache of Gemini replies, selected with
+#   RESPONSE_CACHE = "true" in .env. Regression runs, demos and repeated
+#   questions send identical requests; those are answered from an SQLite
+#   file instead of calling Gemini again.
+#
+#   The key is a SHA-256 of the model name, the instructions text and the
+#   serialized context (every summary and turn sent, with its timestamp).
+#   Entries expire after RESPONSE_CACHE_TTL seconds, and the least
+#   recently used are evicted beyond RESPONSE_CACHE_MAX_ENTRIES entries or
+#   RESPONSE_CACHE_MAX_BYTES of text. SQLite's locking makes the file safe
+#   to share between threads and processes.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://www.sqlite.org/wal.html
+#   https://docs.python.org/3/library/hashlib.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size     INTEGER NOT NULL,
+    text     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_created  ON responses (created);
+"""
+
+
+###############################################################################
+#
+#  Class: ResponseCache
+#
+###############################################################################
+
+class ResponseCache:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Opens (or creates) the cache database in WAL mode.
+    #
+    #  Parameters:
+    #     path - Path of the SQLite file
+    #     max_entries - Entries kept
+    #     max_bytes - Reply text kept, in bytes
+    #     ttl - Seconds an entry stays valid
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, path, max_entries:int = 1000, max_bytes:int = 50 * 1024 * 1024, ttl:float = 7 * 24 * 3600):
+
+        self.path = path
+        self.max_entries:int = max_entries
+        self.max_bytes:int = max_bytes
+        self.ttl:float = ttl
+        self.lock = threading.Lock()
+
+        # One connection shared by all threads, serialized by self.lock;
+        # the timeout covers other processes using the same file
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: make_key()
+    #
+    #  Description:
+    #     Hash identifying a request.
+    #
+    #  Parameters:
+    #     model_name - Model the request is for
+    #     system_instructions - The instructions text
+    #     items - Output of ContextBuilder.build()
+    #
+    #  Returns:
+    #     Hex digest
+    #
+    ######################################################
+
+    @staticmethod
+    def make_key(model_name:str, system_instructions:str, items) -> str:
+
+        payload = json.dumps([model_name, system_instructions, [[item.role, item.context_text()] for item in items]],
+                             ensure_ascii=False, separators=(",", ":"))
+
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    ###  END OF MAKE_KEY()  ###
+
+
+    #####################################################
+    #
+    #  Function: get()
+    #
+    #  Description:
+    #     Looks a reply up and marks it as recently used.
+    #
+    #  Parameters:
+    #     key - From make_key()
+    #
+    #  Returns:
+    #     The cached reply, or None
+    #
+    ######################################################
+
+    def get(self, key:str):
+
+        metrics = global_variables.global_metrics
+        now = time.time()
+
+        with self.lock:
+            row = self._conn.execute("SELECT created, text FROM responses WHERE key = ?", (key,)).fetchone()
+
+            if row is not None and now - row[0] > self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+                metrics.increment("response_cache.expired")
+                row = None
+
+            if row is None:
+                metrics.increment("response_cache.misses")
+                return None
+
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        metrics.increment("response_cache.hits")
+
+        return row[1]
+
+    ###  END OF GET()  ###
+
+
+    #####################################################
+    #
+    #  Function: put()
+    #
+    #  Description:
+    #     Stores a reply, then evicts expired and least recently used
+    #     entries until the limits hold.
+    #
+    #  Parameters:
+    #     key - From make_key()
+    #     text - The reply
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def put(self, key:str, text:str) -> None:
+
+        now = time.time()
+        size = len(text.encode("utf-8"))
+
+        with self.lock:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO responses (key, created, accessed, size, text) VALUES (?, ?, ?, ?, ?)",
+                                   (key, now, now, size, text))
+
+                evicted = self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount
+
+                count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+                if count > self.max_entries or total > self.max_bytes:
+                    # Oldest first until both limits hold
+                    for old_key, old_size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+                        if count <= self.max_entries and total <= self.max_bytes:
+                            break
+
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                        count -= 1
+                        total -= old_size
+                        evicted += 1
+
+        if evicted > 0:
+            global_variables.global_metrics.increment("response_cache.evicted", evicted)
+
+        return
+
+    ###  END OF PUT()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    #  Description:
+    #     Checkpoints the WAL and closes the connection.
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        with self.lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error as e:
+                    global_variables.console.print(f"Response cache checkpoint failed: {e}")
+
+                self._conn.close()
+                self._conn = None
+
+        return
+
+    ###  END OF CLOSE()  ###
@@ -8,6 +8,7 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Write to a temp file and rename atomically
 #
 #
 ###############################################################################
@@ -53,6 +54,7 @@ import time
 import sys
 
 import json
+import os
 
 
 ###############################################################################
@@ -71,18 +73,46 @@ import global_variables
 ###############################################################################
 
 def save_history(history, path) :
-    """Saves the chat history (list of dicts) to a JSON file."""
+    """Saves the chat history (list of dicts) to a JSON file.
+
+    The history is written to a temporary file, synced, and renamed over
+    the old file, so a crash leaves either the old or the new history on
+    disk, never a truncated one. Returns True when the file was replaced.
+    """
+    temp_path = f"{path}.tmp"
+
     try:
-        with open(path, 'w', encoding='utf-8') as f:
+        with open(temp_path, 'w', encoding='utf-8') as f:
             # We use json.dump() to write the Python list of dicts directly to the file
             json.dump(history, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, path)
+
+        # Make the rename itself durable (not supported on Windows)
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
         
         #console.print(f"✅ History successfully saved to {path}")
     
-    except IOError as e:
+    except (IOError, OSError) as e:
         global_variables.console.print(f"❌ Error saving file: {e}")
+
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+        return False
     
-    return
+    return True
 
     ###  END OF SAVE_HISTORY  ###
 
@@ -8,6 +8,15 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Compact the history journal instead of
+#                              rewriting the whole history every cycle
+#  2026-10-18   agent          Skip unchanged history, adaptive interval
+#  2026-10-18   agent          Nothing to snapshot with the SQLite backend
+#  2026-10-18   agent          History holds TurnRecords
+#  2026-10-18   agent          Read the generation from the ConversationLog
+#  2026-10-18   agent          Sets HISTORY_READY once the history is loaded
+#  2026-10-18   agent          Sync the journals at least every JOURNAL_FSYNC_INTERVAL
+#  2026-10-18   agent          Compact the session journals too
 #
 #
 ###############################################################################
@@ -21,6 +30,10 @@
 #   PURPOSE:
 #   Archive chat history so that it can carry between sessions.
 #
+#   Also wakes every JOURNAL_FSYNC_INTERVAL to sync the journals, the
+#   sessions' included, so the last messages before a quiet spell are
+#   on disk within that interval.
+#
 #
 ###############################################################################
 
@@ -72,6 +85,31 @@ import global_variables
 ###############################################################################
 
 from load_history import load_history
+from save_history import save_history
+
+
+###############################################################################
+#
+#  FUNCTION: next_save_interval()
+#
+###############################################################################
+
+def next_save_interval(message_rate:float) -> float :
+    """Seconds until the next snapshot check, given messages per second.
+
+    Aims for JOURNAL_COMPACT_RECORDS messages per snapshot, bounded by
+    SAVE_INTERVAL and SAVE_INTERVAL_MAX. A busy conversation is snapshotted
+    every SAVE_INTERVAL with everything that arrived in between; a quiet
+    one waits longer since the journal already holds the new messages.
+    """
+    if message_rate <= 0 :
+        return global_variables.SAVE_INTERVAL_MAX
+
+    interval = global_variables.JOURNAL_COMPACT_RECORDS / message_rate
+
+    return max(global_variables.SAVE_INTERVAL, min(global_variables.SAVE_INTERVAL_MAX, interval))
+
+    ###  END OF NEXT_SAVE_INTERVAL  ###
 
 
 ###############################################################################
@@ -84,33 +122,96 @@ def saver_thread() :
 
 
     #
-    # Load existing history
+    # Load existing history (snapshot plus journal, or the newest page
+    # of the SQLite database)
     #
 
-    json_history = load_history(global_variables.global_history_file)
+    journal = global_variables.global_journal
+
+    json_history = load_history(global_variables.global_history_file, journal)
+
+    # In front of anything recorded while we were loading
+    global_variables.global_history.prepend(json_history)
+    global_variables.HISTORY_READY.set()
+
+    # Journal entries replayed at startup are not in the snapshot yet
+    saved_generation = global_variables.global_history.generation
+    if journal is not None :
+        saved_generation -= journal.records_since_compact
 
-    with global_variables.global_history_lock :
-        global_variables.global_history = copy.deepcopy(json_history)
+    def sync_journals() :
+        # An append is only synced by a later one; do it for the last ones
+        if journal is not None :
+            journal.sync()
+
+        if global_variables.global_sessions is not None :
+            global_variables.global_sessions.sync()
+
+            # Each session's snapshot aims for the same size as the main one
+            global_variables.global_sessions.compact(global_variables.JOURNAL_COMPACT_RECORDS)
+
+    # SQLite commits every turn itself, there is nothing to snapshot
+    if journal is None :
+        while not global_variables.STOP_EVENT.wait(global_variables.JOURNAL_FSYNC_INTERVAL):
+            try:
+                sync_journals()
+
+            except Exception as e:
+                global_variables.console.print(f"Saver error: {e}")
+                global_variables.STOP_EVENT.set()
+
+        global_variables.console.print("Saver: Stopped.")
+        return
+
+    def write_snapshot(history) :
+        return save_history([record.to_entry() for record in history], global_variables.global_history_file)
+
+    last_save = time.monotonic()
+    interval = global_variables.SAVE_INTERVAL
+    next_save = last_save + interval
         
 
     # --- Main conversation loop
 
-    while not global_variables.STOP_EVENT.is_set():
+    while not global_variables.STOP_EVENT.wait(max(0.0, min(global_variables.JOURNAL_FSYNC_INTERVAL, next_save - time.monotonic()))):
         try:
-            # Save history every ten seconds
-            time.sleep(10)
+            sync_journals()
+
+            if time.monotonic() < next_save :
+                continue
 
-            with global_variables.global_history_lock :
-                localhistory = copy.deepcopy(global_variables.global_history)
-            
-            with open(global_variables.global_history_file, "w") as history_file :
-                json.dump(localhistory, history_file, indent=5)
+            generation = global_variables.global_history.generation
+
+            pending = generation - saved_generation
+            elapsed = time.monotonic() - last_save
+
+            # Nothing new: no disk I/O, check again later
+            if pending <= 0 :
+                interval = global_variables.SAVE_INTERVAL_MAX
+                next_save = time.monotonic() + interval
+                continue
+
+            if (pending >= global_variables.JOURNAL_COMPACT_RECORDS) or (elapsed >= global_variables.SAVE_INTERVAL_MAX) :
+                snapshot_generation = journal.compact(write_snapshot)
+
+                if snapshot_generation is not None :
+                    saved_generation = snapshot_generation
+                    last_save = time.monotonic()
+
+            interval = next_save_interval(pending / max(elapsed, 1e-3))
+            next_save = time.monotonic() + interval
 
             # globals.console.print("Saver: History saved.")
 
         except Exception as e:
             global_variables.console.print(f"Saver error: {e}")
             global_variables.STOP_EVENT.set()
+
+    # Leave a compact snapshot behind on a clean shutdown
+    generation = global_variables.global_history.generation
+
+    if generation != saved_generation :
+        journal.compact(write_snapshot)
     
     global_variables.console.print("Saver: Stopped.")
 
@@ -0,0 +1,61 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Only to the clients in the item's session
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: send_to_clients.py
+#
+#   PURPOSE:
+#   Everything the server shows goes through here: to the clients in
+#   the same conversation. The console client is in the main one, unless
+#   the host runs without it; chat server clients are in the session
+#   they named, or the main one.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  FUNCTION: send_to_clients()
+#
+###############################################################################
+
+def send_to_clients(item, session_id = None) -> None :
+    """Shows an item to every client in a conversation.
+
+    Args:
+        item: [speaker, message] or [speaker, message, kind, conversation],
+              as read from Client_Receive_Queue.
+        session_id: The conversation, None for the main one.
+    """
+    if global_variables.CHAT_CONSOLE and session_id is None :
+        global_variables.Client_Receive_Queue.put(item)
+
+    chat_server = global_variables.global_chat_server
+
+    if chat_server is not None :
+        chat_server.broadcast(item, session_id)
+
+    ###  END OF SEND_TO_CLIENTS  ###
@@ -7,6 +7,17 @@
 #     DATE        AUTHOR         COMMENTS  
 #  ----------   ------------   -------------------
 #  2025-10-01   JJ Lay         Initial version
+#  2026-10-18   agent          Forward streamed partial replies to the client without recording them
+#  2026-10-18   agent          Show LLM error notices without recording them
+#  2026-10-18   agent          LLM output carries its conversation so concurrent streams stay apart
+#  2026-10-18   agent          Record a message before the LLM sees it; forward cancelled replies
+#  2026-10-18   agent          Wait on the Server_Inbox and drain both queues instead of polling each for 50 ms
+#  2026-10-18   agent          Messages from chat server sessions carry their sender; show everything
+#                              through send_to_clients
+#  2026-10-18   agent          Messages, replies and recordings carry their session
+#  2026-10-18   agent          Sets SERVER_READY
+#  2026-10-18   agent          Each message carries an event the recorder sets once it is recorded
+#  2026-10-18   agent          Only the console client's SYSTEM_QUIT is a control message
 #
 #
 ###############################################################################
@@ -69,6 +80,7 @@ import global_variables
 #
 ###############################################################################
 
+from send_to_clients import send_to_clients
 
 
 
@@ -84,58 +96,91 @@ def server_thread():
     global_variables.console.print("Server: Starting up and routing messages...")
     
     # Broadcast initial system messages to the Human Client
-    global_variables.Client_Receive_Queue.put(["Server", f"*** {global_variables.HUMAN_USERNAME} joined the chat. ***"])
-    global_variables.Client_Receive_Queue.put(["Server", f"*** {global_variables.LLM_USERNAME} is online. Say 'hello' to begin! ***"])
-    
+    if global_variables.CHAT_CONSOLE :
+        send_to_clients(["Server", f"*** {global_variables.HUMAN_USERNAME} joined the chat. ***"])
+    send_to_clients(["Server", f"*** {global_variables.LLM_USERNAME} is online. Say 'hello' to begin! ***"])
+
+    global_variables.SERVER_READY.set()
 
     while not global_variables.STOP_EVENT.is_set():
+        # Sleep until either queue has work; clear before draining so a
+        # message put meanwhile wakes the next wait at once
+        global_variables.Server_Inbox.wait(global_variables.IDLE_WAIT)
+        global_variables.Server_Inbox.clear()
+
         try:
-            now = datetime.now()
-            now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
+            while True:
+                now = datetime.now()
+                now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
+
+                # 3a. Take the incoming messages from the Human Client, or
+                # (sender, message, session) from a chat server client
+                item = global_variables.Server_Queue.get_nowait()
+                sender, human_message, session_id = item if isinstance(item, tuple) else (global_variables.HUMAN_USERNAME, item, None)
+
+
+                if not isinstance(item, tuple) and human_message.startswith("SYSTEM_QUIT"):
+                    # Handle the explicit quit command from the console client;
+                    # a chat server client typing it is just talking
+                    global_variables.Server_Queue.task_done()
+                    continue
+
+                # Determine if the human is talking to the LLM or to another simulated user (not implemented)
+                # For simplicity, we'll assume ALL human messages go to the LLM for a response.
+                #console.print(f"Server routing Human message: {human_message}")
+
+                # Add the message to the recording; the LLM worker waits for it
+                # to be recorded before it reads the history
+                recorded = threading.Event()
+                global_variables.Recorder_In_Queue.put([f"{sender}",  f"{human_message}", "user", f"{now_formatted}", session_id, recorded])
+
+                global_variables.LLM_In_Queue.put((sender, human_message, session_id, recorded))
 
-            # 3a. Check for incoming messages from the Human Client
-            human_message = global_variables.Server_Queue.get(timeout=0.05)
-            
+                # Show the human's message to every client in the conversation, the sender included
+                send_to_clients([f"{sender}",  f"{human_message}"], session_id)
 
-            if human_message.startswith("SYSTEM_QUIT"):
-                # Handle the explicit quit command from the client
                 global_variables.Server_Queue.task_done()
-                continue
-
-            # Determine if the human is talking to the LLM or to another simulated user (not implemented)
-            # For simplicity, we'll assume ALL human messages go to the LLM for a response.
-            #console.print(f"Server routing Human message: {human_message}")
-
-            global_variables.LLM_In_Queue.put((global_variables.HUMAN_USERNAME, human_message))
-            
-            # Put the human's message into the general receive queue so the human sees their own message
-            global_variables.Client_Receive_Queue.put([f"{global_variables.HUMAN_USERNAME}",  f"{human_message}"])
-            
-            # Add the message to the recording
-            global_variables.Recorder_In_Queue.put([f"{global_variables.HUMAN_USERNAME}",  f"{human_message}", "user", f"{now_formatted}"])
-
-            global_variables.Server_Queue.task_done()
-            
+
         except queue.Empty:
-            pass # No human message, check LLM next
+            pass # No more human messages, check the LLM next
 
         try:
-            now = datetime.now()
-            now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
-
-            # 3b. Check for outgoing messages from the LLM
-            sender, llm_response = global_variables.LLM_Out_Queue.get(timeout=0.05)
-            
-            # Broadcast the LLM's response to the Human Client
-            global_variables.Client_Receive_Queue.put([f"{sender}", f"{llm_response}"])
-            
-            # Add the message to the recording
-            global_variables.Recorder_In_Queue.put([f"{sender}",  f"{llm_response}", "model", f"{now_formatted}"])
-
-            global_variables.LLM_Out_Queue.task_done()
-            
+            while True:
+                now = datetime.now()
+                now_formatted:str = now.strftime("%Y-%m-%d %H:%M:%S")
+
+                # 3b. Take the outgoing messages from the LLM
+                sender, llm_response, kind, conversation, *session = global_variables.LLM_Out_Queue.get_nowait()
+                session_id = session[0] if session else None
+
+                if kind == "partial" :
+                    # Streaming chunk: display only, the final text is recorded
+                    send_to_clients([f"{sender}", f"{llm_response}", "partial", conversation], session_id)
+                    global_variables.LLM_Out_Queue.task_done()
+                    continue
+
+                if kind == "cancelled" :
+                    # Superseded reply: the client drops what it streamed
+                    send_to_clients([f"{sender}", "", "cancelled", conversation], session_id)
+                    global_variables.LLM_Out_Queue.task_done()
+                    continue
+
+                if kind == "error" :
+                    # The LLM could not reply: tell the client, keep it out of the history
+                    send_to_clients(["Server", f"{llm_response}", "error", conversation], session_id)
+                    global_variables.LLM_Out_Queue.task_done()
+                    continue
+
+                # Broadcast the LLM's response to every client
+                send_to_clients([f"{sender}", f"{llm_response}", "final", conversation], session_id)
+
+                # Add the message to the recording
+                global_variables.Recorder_In_Queue.put([f"{sender}",  f"{llm_response}", "model", f"{now_formatted}", session_id])
+
+                global_variables.LLM_Out_Queue.task_done()
+
         except queue.Empty:
-            pass # No LLM message, continue
+            pass # No more LLM messages, wait for the next
 
         except Exception as e:
             global_variables.console.print(f"Server error: {e}")
@@ -0,0 +1,510 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          sync() for the saver
+#  2026-10-18   agent          Load outside the manager lock; compact session journals
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: session_manager.py
+#
+#   PURPOSE:
+#   Conversations other than the main one. A chat server client that
+#   names a session in its hello talks in that conversation: its own
+#   history, the context built from it and, optionally, its own
+#   instructions. Clients naming the same session share it.
+#
+#   Each session's history is a shard of its own, a JSONL journal under
+#   SESSIONS_DIR (two-letter subfolders keep any one folder small). The
+#   recorder appends to it as turns arrive, so nothing is lost when a
+#   session leaves memory.
+#
+#   Sessions are loaded on first use. Up to SESSION_MAX_HOT stay in
+#   memory, least recently used first out, and the housekeeper drops
+#   those idle for SESSION_IDLE seconds. A session out of memory costs
+#   nothing but its file, so the number of sessions is bounded by disk,
+#   not RAM.
+#
+#   A session is loaded outside the manager's lock, so one large shard
+#   does not hold up the others: a placeholder marks it as loading and
+#   other users of that session wait for it. The saver compacts a
+#   session's journal into <session>.json, as it does the main history,
+#   so a load reads a snapshot and a short journal.
+#
+#   A file <session>.instructions.txt next to the shard replaces the
+#   instructions for that session.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/collections.html#collections.OrderedDict
+#   https://en.wikipedia.org/wiki/Cache_replacement_policies#LRU
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import collections
+import hashlib
+import re
+import threading
+import time
+from pathlib import Path
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from history_journal import HistoryJournal, FSYNC_INTERVAL
+from load_instructions import load_instructions
+from save_history import save_history
+from stream_history import stream_history
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")   # Also a safe file name
+
+
+###############################################################################
+#
+#  FUNCTION: valid_session_id()
+#
+###############################################################################
+
+def valid_session_id(session_id) -> bool :
+    """Letters, digits, '-' and '_', at most 64 characters."""
+    return isinstance(session_id, str) and SESSION_ID.fullmatch(session_id) is not None
+
+    ###  END OF VALID_SESSION_ID  ###
+
+
+###############################################################################
+#
+#  Class: ChatSession
+#
+###############################################################################
+
+class ChatSession:
+    """One conversation held in memory.
+
+    Created as a placeholder, before it is loaded; users of the session
+    wait for loaded. lock is held to append to it, compact it or close
+    it, so an evicted session is never written to after its journal is
+    closed.
+    """
+
+    __slots__ = ("session_id", "history", "journal", "instructions", "last_used", "lock", "loaded", "closed", "error")
+
+    def __init__(self, session_id:str):
+        self.session_id:str = session_id
+        self.history:ConversationLog = None
+        self.journal:HistoryJournal = None
+        self.instructions = None                # None = the main instructions
+        self.last_used:float = time.monotonic()
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()         # Set once loaded, or once the load failed
+        self.closed = threading.Event()         # Set once evicted and its journal closed
+        self.error = None                       # Why the load failed
+
+
+###############################################################################
+#
+#  Class: SessionManager
+#
+###############################################################################
+
+class SessionManager:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     root - Folder holding the shards
+    #     max_hot - Most sessions kept in memory
+    #     idle - Seconds unused before evict_idle() drops a session
+    #     fsync_policy, fsync_interval - As for HistoryJournal
+    #
+    ######################################################
+
+    def __init__(self, root, max_hot:int = 128, idle:float = 600.0, fsync_policy:str = FSYNC_INTERVAL, fsync_interval:float = 1.0):
+
+        self.root = Path(root)
+        self.max_hot:int = max(1, max_hot)
+        self.idle:float = idle
+        self.fsync_policy:str = fsync_policy
+        self.fsync_interval:float = fsync_interval
+
+        self._hot = collections.OrderedDict()   # session_id -> ChatSession, least recent first
+        self._leaving = {}                      # session_id -> evicted ChatSession not yet closed
+        self._lock = threading.Lock()
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: path()
+    #
+    #  Description:
+    #     The shard of a session, e.g. sessions/3f/team-a.jsonl.
+    #
+    ######################################################
+
+    def path(self, session_id:str) -> Path:
+
+        shard = hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:2]
+
+        return self.root / shard / f"{session_id}.jsonl"
+
+    ###  END OF PATH()  ###
+
+
+    #####################################################
+    #
+    #  Function: history() / instructions()
+    #
+    #  Description:
+    #     A session's ConversationLog, and its own instructions or
+    #     None; either loads the session if it is not in memory.
+    #
+    ######################################################
+
+    def history(self, session_id:str) -> ConversationLog:
+
+        return self._session(session_id).history
+
+    def instructions(self, session_id:str):
+
+        return self._session(session_id).instructions
+
+    ###  END OF HISTORY() / INSTRUCTIONS()  ###
+
+
+    #####################################################
+    #
+    #  Function: record()
+    #
+    #  Description:
+    #     Appends turns to a session and its shard.
+    #
+    #  Parameters:
+    #     session_id - The session
+    #     turns - TurnRecords, oldest first
+    #
+    ######################################################
+
+    def record(self, session_id:str, turns) -> None:
+
+        while True:
+            session = self._session(session_id)
+
+            with session.lock:
+                # Evicted since we found it; load it again
+                if session.closed.is_set():
+                    continue
+
+                first = session.history.append(turns)
+                session.journal.append(list(enumerate(turns, start=first)))
+                return
+
+    ###  END OF RECORD()  ###
+
+
+    #####################################################
+    #
+    #  Function: evict_idle()
+    #
+    #  Returns:
+    #     Sessions dropped from memory
+    #
+    ######################################################
+
+    def evict_idle(self) -> int:
+
+        cutoff = time.monotonic() - self.idle
+
+        with self._lock:
+            evicted = self._evict(lambda session: session.last_used <= cutoff)
+
+        self._close(evicted)
+
+        return len(evicted)
+
+    ###  END OF EVICT_IDLE()  ###
+
+
+    #####################################################
+    #
+    #  Function: sync()
+    #
+    #  Description:
+    #     Syncs the journals of the sessions in memory (see
+    #     HistoryJournal.sync()). An evicted session's journal was
+    #     synced when it was closed.
+    #
+    ######################################################
+
+    def sync(self) -> None:
+
+        # Outside the lock, so recording into other sessions goes on
+        for session in self._loaded():
+            session.journal.sync()
+
+    ###  END OF SYNC()  ###
+
+
+    #####################################################
+    #
+    #  Function: compact()
+    #
+    #  Description:
+    #     Snapshots the sessions in memory whose journals hold at least
+    #     records records into <session>.json and truncates their
+    #     journals (see HistoryJournal.compact()). Called by the saver.
+    #
+    #  Returns:
+    #     Sessions compacted
+    #
+    ######################################################
+
+    def compact(self, records:int) -> int:
+
+        compacted = 0
+
+        for session in self._loaded():
+            if session.journal.records_since_compact < records:
+                continue
+
+            snapshot_path = session.journal.path.with_suffix(".json")
+
+            def write_snapshot(history) :
+                return save_history([record.to_entry() for record in history], snapshot_path)
+
+            # Holds up only this session's recording and eviction
+            with session.lock:
+                if session.closed.is_set():
+                    continue
+
+                if session.journal.compact(write_snapshot, session.history) is not None:
+                    compacted += 1
+
+        if compacted:
+            global_variables.global_metrics.increment("session.compactions", compacted)
+
+        return compacted
+
+    ###  END OF COMPACT()  ###
+
+
+    #####################################################
+    #
+    #  Function: close()
+    #
+    ######################################################
+
+    def close(self) -> None:
+
+        with self._lock:
+            evicted = self._evict(lambda session: True)
+
+        self._close(evicted)
+
+    ###  END OF CLOSE()  ###
+
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+
+    #####################################################
+    #
+    #  Function: _session()
+    #
+    #  Description:
+    #     Finds a session and marks it most recently used. One not in
+    #     memory is entered as a placeholder under the lock and loaded
+    #     after it is released; anyone else asking for it meanwhile
+    #     waits for that load, not for the lock.
+    #
+    ######################################################
+
+    def _session(self, session_id:str) -> ChatSession:
+
+        evicted = []
+        previous = None
+
+        with self._lock:
+            session = self._hot.get(session_id)
+            load = session is None
+
+            if load:
+                session = ChatSession(session_id)
+                previous = self._leaving.get(session_id)
+                self._hot[session_id] = session
+                evicted = self._evict(lambda other: len(self._hot) > self.max_hot)
+            else:
+                self._hot.move_to_end(session_id)
+                session.last_used = time.monotonic()
+
+        self._close(evicted)
+
+        if not load:
+            session.loaded.wait()
+
+            if session.error is not None:
+                raise session.error
+
+            return session
+
+        try:
+            # Its journal may still be taking a last append
+            if previous is not None:
+                previous.closed.wait()
+
+            self._load(session)
+
+        except Exception as e:
+            session.error = e
+
+            with self._lock:
+                if self._hot.get(session_id) is session:
+                    del self._hot[session_id]
+
+            raise
+
+        finally:
+            session.loaded.set()
+
+        return session
+
+    ###  END OF _SESSION()  ###
+
+
+    #####################################################
+    #
+    #  Function: _load()
+    #
+    #  Description:
+    #     Reads a session's snapshot, the journal written after it and
+    #     its instructions. Called without the lock.
+    #
+    ######################################################
+
+    def _load(self, session:ChatSession) -> None:
+
+        started = time.perf_counter()
+        path = self.path(session.session_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        turns = []
+        snapshot_path = path.with_suffix(".json")
+
+        if snapshot_path.exists():
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                turns = [TurnRecord.from_entry(entry) for entry in stream_history(f)]
+
+        journal = HistoryJournal(path, self.fsync_policy, self.fsync_interval)
+        turns.extend(journal.replay(start_seq=len(turns)))
+
+        instructions_path = path.with_suffix(".instructions.txt")
+
+        session.history = ConversationLog(turns)
+        session.journal = journal
+        session.instructions = load_instructions(instructions_path) if instructions_path.exists() else None
+
+        global_variables.global_metrics.increment("session.loads")
+        global_variables.global_metrics.observe("session.load", time.perf_counter() - started)
+
+    ###  END OF _LOAD()  ###
+
+
+    #####################################################
+    #
+    #  Function: _loaded() / _evict() / _close()
+    #
+    #  Description:
+    #     _loaded() lists the sessions in memory that are loaded.
+    #     _evict(), called with the lock held, drops loaded sessions,
+    #     least recently used first, while should_evict(session) holds;
+    #     _close(), called without it, closes their journals.
+    #
+    ######################################################
+
+    def _loaded(self):
+
+        with self._lock:
+            return [session for session in self._hot.values() if session.loaded.is_set() and session.error is None]
+
+    def _evict(self, should_evict):
+
+        evicted = []
+
+        for session in list(self._hot.values()):
+            if not should_evict(session):
+                break
+
+            # Still loading; its loader holds it
+            if not session.loaded.is_set():
+                continue
+
+            del self._hot[session.session_id]
+            self._leaving[session.session_id] = session
+            evicted.append(session)
+
+        return evicted
+
+    def _close(self, evicted) -> None:
+
+        for session in evicted:
+            with session.lock:
+                session.journal.close()
+                session.closed.set()
+
+            with self._lock:
+                if self._leaving.get(session.session_id) is session:
+                    del self._leaving[session.session_id]
+
+            global_variables.global_metrics.increment("session.evictions")
+
+    ###  END OF _LOADED() / _EVICT() / _CLOSE()  ###
@@ -0,0 +1,61 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          A conversation is its session
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: stop_generation.py
+#
+#   PURPOSE:
+#   The /stop command. Cancels the reply being generated for a
+#   conversation and drops its messages still waiting for a worker. The
+#   worker answering it is freed at once and records the text streamed
+#   so far, marked as stopped, instead of the full reply.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  FUNCTION: stop_generation()
+#
+###############################################################################
+
+def stop_generation(conversation) -> bool :
+    """Stops the reply to a conversation.
+
+    Args:
+        conversation: The session id, None for the main conversation.
+
+    Returns:
+        False if no reply was being generated or waiting.
+    """
+    scheduler = global_variables.global_llm_scheduler
+
+    if scheduler is None :
+        return False
+
+    return scheduler.stop(conversation)
+
+    ###  END OF STOP_GENERATION  ###
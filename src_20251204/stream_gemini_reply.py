@@ -0,0 +1,91 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Send the turns chosen by the ContextBuilder
+#  2026-10-18   agent          Summaries plus recent turns instead of the whole transcript
+#  2026-10-18   agent          Send only the turns after the cached prefix
+#  2026-10-18   agent          Answer repeated requests from the response cache
+#  2026-10-18   agent          Retry through the RetryPolicy; raise LLMUnavailableError instead of replying with the error
+#  2026-10-18   agent          Charge each call against the shared RateLimiter
+#  2026-10-18   agent          Optional cancel event
+#  2026-10-18   agent          No new attempt once cancelled
+#  2026-10-18   agent          Model chosen by the ModelRouter unless given
+#  2026-10-18   agent          history argument for conversations other than the main one
+#  2026-10-18   agent          The request itself is made by gemini_request()
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: stream_gemini_reply.py
+#
+#   PURPOSE:
+#   Streaming version of get_gemini_reply(). Each chunk of text is handed
+#   to a callback as soon as Gemini sends it, and the assembled reply is
+#   returned at the end. Records time-to-first-token ("llm.ttft") and the
+#   full reply time ("llm.total") in global_metrics.
+#
+#   The request, and everything around it, is made by gemini_request().
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/text-generation#streaming
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from gemini_request import gemini_request
+
+
+###############################################################################
+#
+#  FUNCTION: stream_gemini_reply
+#
+###############################################################################
+
+def stream_gemini_reply(sender:str, user_prompt: str, system_instructions: str, on_chunk, **options) -> str:
+    """
+    Calls the Gemini model with streaming and reports text as it arrives.
+
+    Args:
+        sender: Who sent the prompt.
+        user_prompt: The main input/question from the user.
+        system_instructions: The instructions to guide the model's behavior.
+        on_chunk: Called with each non-empty piece of reply text.
+        options: model_name, client_manager, context_builder, prefix_cache,
+            response_cache, retry_policy, rate_limiter, cancel,
+            model_router and history, as for gemini_request().
+
+    Returns:
+        The full text response. Chunks already passed to on_chunk are
+        part of the returned text.
+
+    Raises:
+        LLMUnavailableError: The reply could not be had or was cut off.
+            Its partial attribute holds the text already passed to on_chunk.
+    """
+    return gemini_request(sender, user_prompt, system_instructions, stream=True, on_chunk=on_chunk, **options)
+
+    ###  END OF STREAM_GEMINI_REPLY  ###
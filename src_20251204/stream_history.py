@@ -0,0 +1,154 @@
+
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: stream_history.py
+#
+#   PURPOSE:
+#   Reads the entries of a history.json array one at a time, so loading a
+#   long history never holds the whole file text in memory at once.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/json.html#json.JSONDecoder.raw_decode
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import json
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+CHUNK_SIZE:int = 1 << 16          # Characters read per refill
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = ",]" + _WHITESPACE
+
+
+###############################################################################
+#
+#  FUNCTION: stream_history()
+#
+###############################################################################
+
+def stream_history(f, chunk_size:int = CHUNK_SIZE) :
+    """Yields the entries of a JSON array read incrementally from f.
+
+    Args:
+        f: Text file positioned at the start of the array.
+        chunk_size: Number of characters read per refill.
+
+    Raises:
+        json.JSONDecodeError: The file is not a JSON array of values.
+    """
+    decoder = json.JSONDecoder()
+    buffer:str = ""
+    pos:int = 0
+    eof:bool = False
+
+    def refill() :
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+
+        if not chunk :
+            eof = True
+
+        # Drop what has been consumed so the buffer stays about one entry long
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace() :
+        nonlocal pos
+        while True :
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE :
+                pos += 1
+
+            if pos < len(buffer) or eof :
+                return
+
+            refill()
+
+    # --- Opening bracket
+
+    skip_whitespace()
+
+    if pos >= len(buffer) or buffer[pos] != "[" :
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+
+    pos += 1
+    expect_value:bool = True
+
+    while True :
+        skip_whitespace()
+
+        if pos >= len(buffer) :
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+        if buffer[pos] == "]" :
+            return
+
+        if not expect_value :
+            if buffer[pos] != "," :
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+
+            pos += 1
+            skip_whitespace()
+
+        # An entry cut off by the end of the buffer fails to decode; read
+        # more and try again until it fits or the file ends.
+        while True :
+            try :
+                entry, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError :
+                if eof :
+                    raise
+
+                refill()
+                continue
+
+            # A number cut off by the buffer ("2." of "2.5") decodes early.
+            # Only trust the value once the delimiter after it is visible.
+            if not eof and (end == len(buffer) or buffer[end] not in _DELIMITERS) :
+                refill()
+                continue
+
+            break
+
+        pos = end
+        expect_value = False
+
+        yield entry
+
+    ###  END OF STREAM_HISTORY  ###
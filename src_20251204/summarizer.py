@@ -0,0 +1,250 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Retry through the shared RetryPolicy
+#  2026-10-18   agent          Background priority in the shared RateLimiter
+#  2026-10-18   agent          Rate limit wait and network timeout bounded by the time left
+#  2026-10-18   agent          Whole-token estimate for the rate limiter
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: summarizer.py
+#
+#   PURPOSE:
+#   Asks Gemini to summarize older turns, and to combine summaries into
+#   higher-level ones, adding the results to a SummaryStore. Runs from the
+#   housekeeper thread, never while a reply is being generated.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/text-generation
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import time
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from summary_store import SummaryRecord, SummaryStore
+from gemini_client_manager import GeminiClientManager
+from context_builder import CHARS_PER_TOKEN
+from rate_limiter import PRIORITY_BACKGROUND
+from resilience import LLMUnavailableError
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+TURNS_PROMPT:str = (
+    "You maintain the long-term memory of a chat assistant called Willow. "
+    "Summarize the conversation below in at most 200 words. Keep names, facts about the people, "
+    "their preferences, decisions, promises and dates. Write in the third person. "
+    "Reply with the summary only."
+)
+
+SUMMARIES_PROMPT:str = (
+    "You maintain the long-term memory of a chat assistant called Willow. "
+    "Combine the consecutive summaries below into one summary of at most 300 words. "
+    "Keep names, facts about the people, their preferences, decisions, promises and dates. "
+    "Write in the third person. Reply with the summary only."
+)
+
+
+###############################################################################
+#
+#  Class: Summarizer
+#
+###############################################################################
+
+class Summarizer:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Parameters:
+    #     store - SummaryStore to add to
+    #     client_manager - GeminiClientManager used for the calls
+    #     chunk_turns - Turns per level 0 summary
+    #     keep_recent - Newest turns never summarized
+    #     fanout - Summaries combined into one of the next level
+    #     max_calls - Gemini calls per run_once()
+    #     model_name - Model used for summarizing
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, store:SummaryStore, client_manager:GeminiClientManager, chunk_turns:int = 50,
+                 keep_recent:int = 100, fanout:int = 4, max_calls:int = 4, model_name:str = 'gemini-2.5-flash'):
+
+        self.store = store
+        self.client_manager = client_manager
+        self.chunk_turns:int = max(1, chunk_turns)
+        self.keep_recent:int = keep_recent
+        self.fanout:int = max(2, fanout)
+        self.max_calls:int = max_calls
+        self.model_name:str = model_name
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: run_once()
+    #
+    #  Description:
+    #     Adds summaries until nothing is due or max_calls is used up.
+    #     Combining summaries comes first so the frontier stays short.
+    #
+    #  Parameters:
+    #     turns - The full history (ConversationView)
+    #
+    #  Returns:
+    #     Number of summaries added
+    #
+    ######################################################
+
+    def run_once(self, turns) -> int:
+
+        added = 0
+
+        while added < self.max_calls and not global_variables.STOP_EVENT.is_set():
+            rollup = self.store.next_rollup(self.fanout)
+
+            if rollup is not None:
+                text = self._summarize(SUMMARIES_PROMPT, "\n\n".join(summary.context_text() for summary in rollup))
+                first, last = rollup[0], rollup[-1]
+                summary = None if text is None else \
+                    SummaryRecord(first.level + 1, first.first, last.last, first.start_time, last.end_time, text)
+
+            else:
+                start = self.store.covered_upto()
+
+                if len(turns) - self.keep_recent - start < self.chunk_turns:
+                    break
+
+                chunk = turns[start:start + self.chunk_turns]
+                text = self._summarize(TURNS_PROMPT, "\n".join(turn.context_text() for turn in chunk))
+                summary = None if text is None else \
+                    SummaryRecord(0, start, start + len(chunk) - 1, chunk[0].timestamp, chunk[len(chunk) - 1].timestamp, text)
+
+            if summary is None:
+                break
+
+            self.store.add(summary)
+            added += 1
+
+        return added
+
+    ###  END OF RUN_ONCE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _summarize()
+    #
+    #  Description:
+    #     One Gemini call.
+    #
+    #  Parameters:
+    #     instructions - TURNS_PROMPT or SUMMARIES_PROMPT
+    #     text - What to summarize
+    #
+    #  Returns:
+    #     Summary text, or None on failure
+    #
+    ######################################################
+
+    def _summarize(self, instructions:str, text:str):
+
+        metrics = global_variables.global_metrics
+        start = time.perf_counter()
+
+        rate_limiter = global_variables.global_rate_limiter
+        estimated = int((len(instructions) + len(text)) // CHARS_PER_TOKEN)
+
+        def request(remaining):
+            until = time.monotonic() + remaining
+
+            # Waits behind interactive turns and leaves them a reserve
+            if rate_limiter is not None and \
+               not rate_limiter.acquire(estimated, PRIORITY_BACKGROUND, timeout=remaining):
+                raise LLMUnavailableError("Rate limit budget exhausted")
+
+            remaining = until - time.monotonic()
+
+            if remaining <= 0:
+                raise LLMUnavailableError("Summary did not finish in time")
+
+            return self.client_manager.client.models.generate_content(
+                model=self.model_name,
+                contents=text,
+                config=self.client_manager.timed(self.client_manager.config(instructions), remaining),
+            )
+
+        # Shares the breaker with the replies, so an outage stops both
+        retry_policy = global_variables.global_retry_policy
+
+        try:
+            response = request(global_variables.LLM_DEADLINE) if retry_policy is None else retry_policy.call(request)
+
+        except Exception as e:
+            metrics.increment("summary.errors")
+            global_variables.console.print(f"Summarizer error: {e}")
+            return None
+
+        metrics.observe("summary.call", time.perf_counter() - start)
+        metrics.increment("summary.created")
+
+        if rate_limiter is not None and response.usage_metadata is not None:
+            rate_limiter.settle(estimated, response.usage_metadata.total_token_count)
+
+        summary = (response.text or "").strip()
+
+        return summary or None
+
+    ###  END OF _SUMMARIZE()  ###
@@ -0,0 +1,363 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: summary_store.py
+#
+#   PURPOSE:
+#   Hierarchical summaries of older conversation turns, kept in
+#   summaries.json next to history.json so they are computed only once.
+#
+#   A level 0 summary covers a run of turns; a level n+1 summary combines
+#   several consecutive level n summaries. Turns are addressed by their
+#   index in the full history (the journal's seq). The "frontier" is the
+#   set of highest-level summaries that together cover every summarized
+#   turn once; that is what is sent to the model.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://ai.google.dev/gemini-api/docs/long-context
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import json
+import os
+import threading
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from turn_record import format_timestamp, parse_timestamp
+from save_history import save_history
+
+from google.genai.types import Content, Part
+
+
+###############################################################################
+#
+#  Class: SummaryRecord
+#
+###############################################################################
+
+class SummaryRecord:
+    """Summary of the turns first..last (inclusive).
+
+    Has the same tokens/context_text()/to_content() interface as a
+    TurnRecord so the ContextBuilder can budget both alike.
+
+    Attributes:
+        level: 0 for a summary of turns, n+1 for a summary of level n
+        first, last: Indexes of the first and last turn covered
+        start_time, end_time: Timestamps of those two turns, used to
+            check that the summary still matches the history
+        text: The summary
+        tokens: Cached token estimate, 0 until estimated
+    """
+
+    __slots__ = ("level", "first", "last", "start_time", "end_time", "text", "tokens")
+
+    role = "user"
+    pinned = False
+
+    def __init__(self, level:int, first:int, last:int, start_time:int, end_time:int, text:str):
+        self.level = level
+        self.first = first
+        self.last = last
+        self.start_time = start_time
+        self.end_time = end_time
+        self.text = text
+        self.tokens = 0
+
+    @classmethod
+    def from_entry(cls, entry:dict) -> "SummaryRecord":
+        """Builds a record from a summaries.json entry."""
+        return cls(entry["level"], entry["first"], entry["last"], parse_timestamp(entry.get("start")),
+                   parse_timestamp(entry.get("end")), entry.get("text", ""))
+
+    def to_entry(self) -> dict:
+        """The summaries.json view of this summary."""
+        return {"level" : self.level, "first" : self.first, "last" : self.last,
+                "start" : format_timestamp(self.start_time), "end" : format_timestamp(self.end_time), "text" : self.text}
+
+    def matches(self, turns) -> bool:
+        """True if turns (the full history) still has the covered turns."""
+        return self.last < len(turns) and turns[self.first].timestamp == self.start_time \
+            and turns[self.last].timestamp == self.end_time
+
+    def context_text(self) -> str:
+        """The text the LLM sees for this summary."""
+        return f"Summary of the conversation from {format_timestamp(self.start_time)} to {format_timestamp(self.end_time)}: {self.text}"
+
+    def to_content(self) -> Content:
+        """The Gemini view of this summary."""
+        return Content(role=self.role, parts=[Part.from_text(text=self.context_text())])
+
+    def __repr__(self) -> str:
+        return f"SummaryRecord(level={self.level}, turns {self.first}-{self.last})"
+
+
+###############################################################################
+#
+#  Class: SummaryStore
+#
+###############################################################################
+
+class SummaryStore:
+
+    #####################################################
+    #
+    #  Function: __init__()
+    #
+    #  Description:
+    #     Loads the summaries file if there is one.
+    #
+    #  Parameters:
+    #     path - Path of summaries.json
+    #
+    #  Returns:
+    #     None
+    #
+    ######################################################
+
+    def __init__(self, path):
+
+        self.path = path
+        self.lock = threading.Lock()
+
+        self._summaries = []
+        self._frontier = ()
+
+        self._load()
+
+    ###  END OF __INIT__()  ###
+
+
+    #####################################################
+    #
+    #  Function: frontier()
+    #
+    #  Description:
+    #     The highest-level summaries, oldest first. Lock-free: the
+    #     tuple is replaced, never changed, when summaries are added.
+    #
+    #  Parameters:
+    #     None
+    #
+    #  Returns:
+    #     Tuple of SummaryRecords
+    #
+    ######################################################
+
+    def frontier(self):
+
+        return self._frontier
+
+    ###  END OF FRONTIER()  ###
+
+
+    #####################################################
+    #
+    #  Function: covered_upto()
+    #
+    #  Description:
+    #     Index of the first turn not yet summarized.
+    #
+    ######################################################
+
+    def covered_upto(self) -> int:
+
+        frontier = self._frontier
+
+        return frontier[-1].last + 1 if frontier else 0
+
+    ###  END OF COVERED_UPTO()  ###
+
+
+    #####################################################
+    #
+    #  Function: next_rollup()
+    #
+    #  Description:
+    #     Finds the oldest run of fanout consecutive frontier
+    #     summaries of the same level.
+    #
+    #  Parameters:
+    #     fanout - Summaries combined into one of the next level
+    #
+    #  Returns:
+    #     List of SummaryRecords, or None when nothing is due
+    #
+    ######################################################
+
+    def next_rollup(self, fanout:int):
+
+        frontier = self._frontier
+        run_start = 0
+
+        for i in range(1, len(frontier) + 1):
+            if i == len(frontier) or frontier[i].level != frontier[run_start].level:
+                if i - run_start >= fanout:
+                    return list(frontier[run_start:run_start + fanout])
+
+                run_start = i
+
+        return None
+
+    ###  END OF NEXT_ROLLUP()  ###
+
+
+    #####################################################
+    #
+    #  Function: add()
+    #
+    #  Description:
+    #     Stores a new summary and rewrites the summaries file.
+    #
+    #  Parameters:
+    #     summary - SummaryRecord
+    #
+    #  Returns:
+    #     True once it is on disk
+    #
+    ######################################################
+
+    def add(self, summary:SummaryRecord) -> bool:
+
+        with self.lock:
+            self._summaries.append(summary)
+            self._frontier = self._build_frontier(self._summaries)
+
+            return self._save()
+
+    ###  END OF ADD()  ###
+
+
+    #####################################################
+    #
+    #  Function: validate()
+    #
+    #  Description:
+    #     Drops summaries that no longer match the history, for
+    #     example after history.json was edited or replaced.
+    #
+    #  Parameters:
+    #     turns - The full history
+    #
+    #  Returns:
+    #     Number of summaries dropped
+    #
+    ######################################################
+
+    def validate(self, turns) -> int:
+
+        with self.lock:
+            kept = [summary for summary in self._summaries if summary.matches(turns)]
+            dropped = len(self._summaries) - len(kept)
+
+            if dropped > 0:
+                self._summaries = kept
+                self._frontier = self._build_frontier(kept)
+                self._save()
+
+        return dropped
+
+    ###  END OF VALIDATE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _load() / _save()
+    #
+    #  Description:
+    #     Read and atomically rewrite summaries.json.
+    #
+    ######################################################
+
+    def _load(self) -> None:
+
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+
+            self._summaries = [SummaryRecord.from_entry(entry) for entry in entries]
+            self._frontier = self._build_frontier(self._summaries)
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            global_variables.console.print(f"⚠️ Ignoring unreadable summaries file {self.path}: {e}")
+
+        return
+
+    def _save(self) -> bool:
+
+        return save_history([summary.to_entry() for summary in self._summaries], self.path)
+
+    ###  END OF _LOAD() / _SAVE()  ###
+
+
+    #####################################################
+    #
+    #  Function: _build_frontier()
+    #
+    #  Description:
+    #     Highest-level summaries covering consecutive turns from the
+    #     first one, oldest first.
+    #
+    ######################################################
+
+    @staticmethod
+    def _build_frontier(summaries):
+
+        frontier = []
+        position = 0
+
+        for summary in sorted(summaries, key=lambda s: (s.first, -s.level)):
+            if summary.first == position:
+                frontier.append(summary)
+                position = summary.last + 1
+
+        return tuple(frontier)
+
+    ###  END OF _BUILD_FRONTIER()  ###
@@ -0,0 +1,95 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_context_builder.py
+#
+#   PURPOSE:
+#   ContextBuilder with no token budget: the summaries replace the
+#   turns they cover, except the opening and pinned turns the policy
+#   keeps.
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import types as builtin_types
+import unittest
+
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from context_builder import ContextBuilder, POLICY_KEEP_FIRST_LAST, POLICY_PINNED
+from summary_store import SummaryRecord
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Class: TestWholeHistory
+#
+###############################################################################
+
+class TestWholeHistory(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+        self.turns = [TurnRecord(1767225600 + i, "user", "Human", f"Message {i}", pinned=(i == 3)) for i in range(10)]
+
+        # Turns 0 to 5 summarized
+        self.summary = SummaryRecord(0, 0, 5, self.turns[0].timestamp, self.turns[5].timestamp, "Earlier talk")
+        self.store = builtin_types.SimpleNamespace(frontier=lambda: [self.summary])
+
+    def build(self, policy):
+        builder = ContextBuilder(0, policy, keep_first=2, summary_store=self.store)
+        return builder.build(self.turns)
+
+    def test_keep_first_last_keeps_opening_turns(self):
+        self.assertEqual(self.build(POLICY_KEEP_FIRST_LAST),
+                         [self.summary, self.turns[0], self.turns[1]] + self.turns[6:])
+
+    def test_pinned_keeps_pinned_turns(self):
+        self.assertEqual(self.build(POLICY_PINNED), [self.summary, self.turns[3]] + self.turns[6:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_history_journal.py
+#
+#   PURPOSE:
+#   HistoryJournal replay of a torn final line and of records written
+#   twice, and a compaction the recorder appends to while the snapshot
+#   is being written.
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import os
+import tempfile
+import threading
+import unittest
+
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from conversation_log import ConversationLog
+from history_journal import HistoryJournal, FSYNC_NEVER
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Class: TestHistoryJournal
+#
+###############################################################################
+
+class TestHistoryJournal(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "history.jsonl")
+
+        self.journal = HistoryJournal(self.path, FSYNC_NEVER)
+        self.addCleanup(self.journal.close)
+
+    def turns(self, first, count):
+        return [TurnRecord(1767225600 + i, "user", "Human", f"Message {i}") for i in range(first, first + count)]
+
+    def texts(self, turns):
+        return [turn.text for turn in turns]
+
+    def test_torn_final_line_is_skipped(self):
+        self.journal.append(list(enumerate(self.turns(0, 2))))
+        self.journal.close()
+
+        # A crash in the middle of the next write
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": 1767225602, "role": "us')
+
+        self.assertEqual(self.texts(self.journal.replay()), ["Message 0", "Message 1"])
+
+    def test_duplicate_seqs_are_skipped(self):
+        turns = self.turns(0, 3)
+
+        # Seq 1 written again, as around a compaction
+        self.journal.append([(0, turns[0]), (1, turns[1])])
+        self.journal.append([(1, turns[1]), (2, turns[2])])
+
+        self.assertEqual(self.texts(self.journal.replay()), ["Message 0", "Message 1", "Message 2"])
+        self.assertEqual(self.texts(self.journal.replay(start_seq=2)), ["Message 2"])
+
+    def test_append_during_compaction_is_kept(self):
+        history = ConversationLog(self.turns(0, 3))
+        self.journal.append(list(enumerate(history.snapshot())))
+
+        snapshots = []
+
+        def record(turns):
+            first = history.append(turns)
+            self.journal.append(list(enumerate(turns, start=first)))
+
+        def write_snapshot(snapshot):
+            # The recorder goes on while the snapshot is written
+            recorder = threading.Thread(target=record, args=(self.turns(3, 2),))
+            recorder.start()
+            recorder.join(5)
+
+            snapshots.append(list(snapshot))
+            return True
+
+        self.assertIsNotNone(self.journal.compact(write_snapshot, history))
+
+        # The snapshot plus the journal is the whole history, once
+        snapshot = snapshots[0]
+        self.assertEqual(self.texts(snapshot), ["Message 0", "Message 1", "Message 2"])
+        self.assertEqual(self.texts(snapshot + self.journal.replay(start_seq=len(snapshot))),
+                         [f"Message {i}" for i in range(5)])
+        self.assertEqual(self.journal.records_since_compact, 2)
+
+    def test_failed_snapshot_keeps_the_journal(self):
+        history = ConversationLog(self.turns(0, 3))
+        self.journal.append(list(enumerate(history.snapshot())))
+
+        self.assertIsNone(self.journal.compact(lambda snapshot: False, history))
+        self.assertEqual(len(self.journal.replay()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_prefix_cache.py
+#
+#   PURPOSE:
+#   PrefixCache against a stand-in client: a slow create does not hold
+#   up other requests, and a replaced cache is deleted only once the
+#   last request using it has ended.
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import threading
+import types as builtin_types
+import unittest
+
+from google.genai import types
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from prefix_cache import PrefixCache
+from rate_limiter import RateLimiter
+from resilience import RetryPolicy
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Class: FakeCaches
+#
+###############################################################################
+
+class FakeCaches:
+    """caches.create() blocks until release is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.creating = threading.Event()
+        self.created = []
+        self.deleted = []
+
+    def create(self, model, config):
+        self.creating.set()
+        self.release.wait(5)
+        name = f"cachedContents/{len(self.created)}"
+        self.created.append(name)
+        return builtin_types.SimpleNamespace(name=name)
+
+    def delete(self, name, config=None):
+        self.deleted.append(name)
+
+
+class FakeClientManager:
+
+    def __init__(self):
+        self.client = builtin_types.SimpleNamespace(caches=FakeCaches())
+
+    def config(self, system_instructions):
+        return types.GenerateContentConfig(system_instruction=system_instructions)
+
+    def timed(self, config, timeout):
+        return config
+
+
+###############################################################################
+#
+#  Class: TestPrefixCache
+#
+###############################################################################
+
+class TestPrefixCache(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+        self.manager = FakeClientManager()
+        self.caches = self.manager.client.caches
+        self.cache = PrefixCache(self.manager, lambda item: 100, min_tokens=100, tail=2, refresh=10,
+                                 retry_policy=RetryPolicy(deadline=5.0, max_attempts=1), rate_limiter=RateLimiter())
+        self.items = [TurnRecord(1767225600 + i, "user", "Human", f"Message {i}") for i in range(20)]
+
+    def test_create_does_not_block_other_requests(self):
+        first = {}
+        creator = threading.Thread(target=lambda: first.update(result=self.cache.prepare(self.items, "Be brief.", "model")))
+        creator.start()
+        self.assertTrue(self.caches.creating.wait(5))
+
+        # Meanwhile another request sends every turn at once
+        contents, _, lease = self.cache.prepare(self.items, "Be brief.", "model")
+        self.assertEqual(len(contents), len(self.items))
+        self.assertIsNone(lease)
+
+        self.caches.release.set()
+        creator.join(5)
+
+        contents, config, lease = first["result"]
+        self.assertEqual(len(contents), 2)
+        self.assertEqual(config.cached_content, "cachedContents/0")
+        self.cache.release(lease)
+
+    def test_replaced_cache_deleted_after_last_lease(self):
+        self.caches.release.set()
+        _, _, lease = self.cache.prepare(self.items, "Be brief.", "model")
+
+        # New instructions replace it while the first request still uses it
+        _, _, newer = self.cache.prepare(self.items, "Be very brief.", "model")
+        self.assertEqual(self.caches.deleted, [])
+
+        self.cache.release(lease)
+        self.assertEqual(self.caches.deleted, ["cachedContents/0"])
+
+        self.cache.release(newer)
+        self.cache.close()
+        self.assertEqual(self.caches.deleted, ["cachedContents/0", "cachedContents/1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
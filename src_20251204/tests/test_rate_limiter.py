@@ -0,0 +1,136 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_rate_limiter.py
+#
+#   PURPOSE:
+#   RateLimiter: an interactive caller goes ahead of a background one
+#   that queued first, settle() charges what the estimate missed, and
+#   two limiters naming the same state file share one budget.
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from rate_limiter import RateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, fcntl
+
+
+###############################################################################
+#
+#  Class: TestRateLimiter
+#
+###############################################################################
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+    def test_interactive_goes_ahead_of_background(self):
+        # One request per half second, none left
+        limiter = RateLimiter(rpm=1, background_reserve=0.0, period=0.5)
+        self.assertTrue(limiter.acquire(0, timeout=0))
+
+        served = []
+
+        def caller(name, priority):
+            if limiter.acquire(0, priority, timeout=5):
+                served.append(name)
+
+        background = threading.Thread(target=caller, args=("background", PRIORITY_BACKGROUND))
+        background.start()
+
+        while len(limiter._waiters) < 1:
+            time.sleep(0.01)
+
+        interactive = threading.Thread(target=caller, args=("interactive", PRIORITY_INTERACTIVE))
+        interactive.start()
+
+        background.join(5)
+        interactive.join(5)
+        self.assertEqual(served, ["interactive", "background"])
+
+    def test_settle_charges_the_difference(self):
+        limiter = RateLimiter(tpm=1000)
+        self.assertTrue(limiter.acquire(100, timeout=0))
+
+        # The reply cost 600 tokens, not 100
+        limiter.settle(100, 600)
+        self.assertAlmostEqual(limiter._state["tokens"], 400, delta=5)
+        self.assertFalse(limiter.acquire(500, timeout=0))
+
+        # Nothing reported, nothing charged
+        limiter.settle(100, None)
+        self.assertTrue(limiter.acquire(300, timeout=0))
+
+    @unittest.skipIf(fcntl is None, "no flock here")
+    def test_state_file_is_shared(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        state_file = os.path.join(folder.name, "ratelimit.json")
+
+        first = RateLimiter(rpm=2, state_file=state_file)
+        second = RateLimiter(rpm=2, state_file=state_file)
+
+        self.assertTrue(first.acquire(0, timeout=0))
+        self.assertTrue(second.acquire(0, timeout=0))
+
+        # Both processes' requests came out of the same bucket
+        self.assertFalse(first.acquire(0, timeout=0))
+        self.assertFalse(second.acquire(0, timeout=0))
+
+        with open(state_file, "r", encoding="utf-8") as f:
+            self.assertLess(json.load(f)["requests"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
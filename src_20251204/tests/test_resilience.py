@@ -0,0 +1,122 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Trials that run past the deadline or are rejected
+#  2026-10-18   agent          Restore the console after each test
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_resilience.py
+#
+#   PURPOSE:
+#   Circuit breaker state after a half-open trial that ends without an
+#   answer (cancelled, rate limited, rejected) or with a failure (an
+#   error, or a reply still streaming at the deadline).
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import unittest
+
+import httpx
+from google.genai import errors
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from resilience import CircuitBreaker, RetryPolicy, LLMUnavailableError, RequestCancelled, DeadlineExceeded, \
+                       BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN
+
+
+###############################################################################
+#
+#  Class: TestHalfOpenTrial
+#
+###############################################################################
+
+class TestHalfOpenTrial(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+        # Opened by one failure, and due a trial at once
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        self.breaker.record_failure()
+        self.policy = RetryPolicy(deadline=5.0, max_attempts=1, breaker=self.breaker)
+
+    def trial(self, error:Exception):
+        def request(remaining):
+            raise error
+
+        with self.assertRaises(LLMUnavailableError):
+            self.policy.call(request)
+
+    def test_cancelled_trial_frees_the_slot(self):
+        self.trial(RequestCancelled("Request cancelled"))
+
+        self.assertEqual(self.policy.call(lambda remaining: "reply"), "reply")
+        self.assertEqual(self.breaker.state, BREAKER_CLOSED)
+
+    def test_rate_limited_trial_frees_the_slot(self):
+        self.trial(LLMUnavailableError("Rate limit budget exhausted"))
+
+        self.assertEqual(self.policy.call(lambda remaining: "reply"), "reply")
+        self.assertEqual(self.breaker.state, BREAKER_CLOSED)
+
+    def test_failed_trial_reopens(self):
+        self.trial(httpx.ConnectError("Connection refused"))
+
+        self.assertEqual(self.breaker.state, BREAKER_OPEN)
+
+    def test_trickling_trial_reopens(self):
+        self.trial(DeadlineExceeded("Gemini did not answer in time"))
+
+        self.assertEqual(self.breaker.state, BREAKER_OPEN)
+
+    def test_rejected_trial_frees_the_slot(self):
+        self.trial(errors.ClientError(400, {"error": {"code": 400, "message": "Bad request", "status": "INVALID_ARGUMENT"}}))
+
+        # Neither closed by it nor stuck waiting for it
+        self.assertEqual(self.breaker.state, BREAKER_HALF_OPEN)
+        self.assertEqual(self.policy.call(lambda remaining: "reply"), "reply")
+        self.assertEqual(self.breaker.state, BREAKER_CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
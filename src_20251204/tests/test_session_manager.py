@@ -0,0 +1,153 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: test_session_manager.py
+#
+#   PURPOSE:
+#   SessionManager on a temporary folder: a slow load does not hold up
+#   other sessions, a compacted session loads back whole, and an
+#   evicted session loads back with everything recorded into it.
+#
+#   Usage (from src_20251204):
+#      python -m pytest -q tests
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import os
+import tempfile
+import threading
+import unittest
+
+from rich.console import Console
+
+
+###############################################################################
+#
+#  Global Variables
+#
+###############################################################################
+
+import global_variables
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from history_journal import FSYNC_NEVER
+from session_manager import SessionManager
+from turn_record import TurnRecord
+
+
+###############################################################################
+#
+#  Class: SlowSessionManager
+#
+###############################################################################
+
+class SlowSessionManager(SessionManager):
+    """Loading the session "big" waits until release is set."""
+
+    def __init__(self, root):
+        super().__init__(root, fsync_policy=FSYNC_NEVER)
+        self.loading = threading.Event()
+        self.release = threading.Event()
+
+    def _load(self, session):
+        if session.session_id == "big":
+            self.loading.set()
+            self.release.wait(5)
+
+        super()._load(session)
+
+
+###############################################################################
+#
+#  Class: TestSessionManager
+#
+###############################################################################
+
+class TestSessionManager(unittest.TestCase):
+
+    def setUp(self):
+        console = global_variables.console
+        self.addCleanup(setattr, global_variables, "console", console)
+        global_variables.console = Console(quiet=True)
+
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+
+    def turns(self, first, count):
+        return [TurnRecord(1767225600 + i, "user", "Human", f"Message {i}") for i in range(first, first + count)]
+
+    def texts(self, manager, session_id):
+        return [turn.text for turn in manager.history(session_id).snapshot()]
+
+    def test_slow_load_does_not_block_other_sessions(self):
+        manager = SlowSessionManager(self.root)
+        self.addCleanup(manager.close)
+
+        loader = threading.Thread(target=manager.record, args=("big", self.turns(0, 1)))
+        loader.start()
+        self.assertTrue(manager.loading.wait(5))
+
+        # Another session loads and records while "big" is loading
+        manager.record("small", self.turns(0, 2))
+        self.assertEqual(len(manager.history("small")), 2)
+
+        manager.release.set()
+        loader.join(5)
+        self.assertEqual(self.texts(manager, "big"), ["Message 0"])
+
+    def test_compacted_session_loads_back(self):
+        manager = SessionManager(self.root, fsync_policy=FSYNC_NEVER)
+        manager.record("team", self.turns(0, 10))
+
+        self.assertEqual(manager.compact(5), 1)
+        self.assertEqual(os.path.getsize(manager.path("team")), 0)
+
+        manager.record("team", self.turns(10, 2))
+        manager.close()
+
+        manager = SessionManager(self.root, fsync_policy=FSYNC_NEVER)
+        self.addCleanup(manager.close)
+        self.assertEqual(self.texts(manager, "team"), [f"Message {i}" for i in range(12)])
+
+    def test_evicted_session_loads_back(self):
+        manager = SessionManager(self.root, max_hot=1, fsync_policy=FSYNC_NEVER)
+        self.addCleanup(manager.close)
+
+        manager.record("a", self.turns(0, 3))
+        manager.record("b", self.turns(0, 1))
+        self.assertEqual(len(manager), 1)
+
+        manager.record("a", self.turns(3, 1))
+        self.assertEqual(self.texts(manager, "a"), [f"Message {i}" for i in range(4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
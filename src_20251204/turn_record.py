@@ -0,0 +1,171 @@
+
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS  
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          Cached token estimate and pinned flag
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: turn_record.py
+#
+#   PURPOSE:
+#   One compact record per conversation turn. The history file entries
+#   (JSON dicts) and the Gemini Content objects are both produced from it
+#   on demand instead of keeping two copies of every turn in memory.
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/reference/datamodel.html#slots
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import sys
+import time
+from datetime import datetime
+
+
+###############################################################################
+#
+#  Gemini Imports
+#
+###############################################################################
+
+from google.genai.types import Content, Part
+
+
+###############################################################################
+#
+#  Constants
+#
+###############################################################################
+
+TIMESTAMP_FORMAT:str = "%Y-%m-%d %H:%M:%S"
+UNKNOWN_TIMESTAMP:int = 0         # Stored when a timestamp cannot be parsed
+
+
+###############################################################################
+#
+#  FUNCTION: parse_timestamp()
+#
+###############################################################################
+
+def parse_timestamp(text) -> int :
+    """Converts a "YYYY-MM-DD HH:MM:SS" local time to epoch seconds."""
+    try:
+        return int(time.mktime(time.strptime(text, TIMESTAMP_FORMAT)))
+    except (TypeError, ValueError, OverflowError):
+        return UNKNOWN_TIMESTAMP
+
+    ###  END OF PARSE_TIMESTAMP  ###
+
+
+###############################################################################
+#
+#  FUNCTION: format_timestamp()
+#
+###############################################################################
+
+def format_timestamp(timestamp:int) -> str :
+    """Converts epoch seconds back to "YYYY-MM-DD HH:MM:SS" local time."""
+    if timestamp == UNKNOWN_TIMESTAMP :
+        return "N/A"
+
+    return datetime.fromtimestamp(timestamp).strftime(TIMESTAMP_FORMAT)
+
+    ###  END OF FORMAT_TIMESTAMP  ###
+
+
+###############################################################################
+#
+#  Class: TurnRecord
+#
+###############################################################################
+
+class TurnRecord:
+    """A single turn of the conversation.
+
+    Attributes:
+        timestamp: Epoch seconds (local time when it was recorded)
+        role: "user" or "model" (interned)
+        username: Speaker name (interned)
+        text: What was said
+        tokens: Cached token estimate of context_text(), 0 until
+            estimated (see context_builder.py)
+        pinned: Always sent to the model under the "pinned" context policy
+    """
+
+    __slots__ = ("timestamp", "role", "username", "text", "tokens", "pinned")
+
+    def __init__(self, timestamp:int, role:str, username:str, text:str, pinned:bool = False):
+        # Roles and usernames repeat on every turn; interning stores each
+        # distinct string once.
+        self.timestamp = timestamp
+        self.role = sys.intern(role)
+        self.username = sys.intern(username)
+        self.text = text
+        self.tokens = 0
+        self.pinned = pinned
+
+    @classmethod
+    def from_message(cls, speaker:str, message:str, role:str, timestamp:str) -> "TurnRecord":
+        """Builds a record from a Recorder_In_Queue item."""
+        return cls(parse_timestamp(timestamp), role, speaker, message)
+
+    @classmethod
+    def from_entry(cls, entry:dict) -> "TurnRecord":
+        """Builds a record from a history.json entry."""
+        parts = entry.get("parts", [])
+        first_item = parts[0] if parts else {}
+
+        return cls(parse_timestamp(entry.get("timestamp")), entry.get("role", "unknown"),
+                   entry.get("username", "N/A"), first_item.get("text", ""),
+                   bool(entry.get("pinned", False)))
+
+    def timestamp_text(self) -> str:
+        """The timestamp as "YYYY-MM-DD HH:MM:SS"."""
+        return format_timestamp(self.timestamp)
+
+    def to_entry(self) -> dict:
+        """The history.json view of this turn."""
+        entry = {"timestamp" : self.timestamp_text(), "role" : self.role,
+                 "username" : self.username, "parts" : [{"text" : self.text}]}
+
+        if self.pinned:
+            entry["pinned"] = True
+
+        return entry
+
+    def context_text(self) -> str:
+        """The text the LLM sees for this turn."""
+        return f"At {self.timestamp_text()}, {self.username} said: {self.text}"
+
+    def to_content(self) -> Content:
+        """The Gemini view of this turn."""
+        return Content(role=self.role, parts=[Part.from_text(text=self.context_text())])
+
+    def __repr__(self) -> str:
+        return f"TurnRecord({self.timestamp_text()!r}, {self.role!r}, {self.username!r}, {self.text!r})"
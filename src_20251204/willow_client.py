@@ -0,0 +1,223 @@
+###############################################################################
+#
+#
+#  CHANGE LOG
+#
+#     DATE        AUTHOR         COMMENTS
+#  ----------   ------------   -------------------
+#  2026-10-18   agent          Initial version
+#  2026-10-18   agent          --session
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#
+#   MODULE: willow_client.py
+#
+#   PURPOSE:
+#   Thin terminal client for a Willow host running the chat server
+#   (CHAT_PORT). Needs only rich: no API key, history or configuration.
+#   Type a message and press Enter; /stop cuts your reply in progress
+#   short and quit leaves. --session joins a conversation of its own
+#   instead of the main one.
+#
+#   Usage (from src_20251204):
+#      python willow_client.py --host willow.example.com --port 8765
+#      python willow_client.py --host willow.example.com --port 8765 --session team-a
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#   References:
+#
+#   https://docs.python.org/3/library/socket.html
+#
+#
+###############################################################################
+
+
+###############################################################################
+#
+#  Standard Python Imports
+#
+###############################################################################
+
+import argparse
+import json
+import socket
+import threading
+
+from rich.console import Console
+from rich.console import Group
+from rich.text import Text
+
+
+###############################################################################
+#
+#  Project Includes
+#
+###############################################################################
+
+from chat_renderer import ChatRenderer, VIEWS
+
+
+###############################################################################
+#
+#  FUNCTION: send()
+#
+###############################################################################
+
+def send(connection, message:dict) -> None :
+    connection.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    ###  END OF SEND  ###
+
+
+###############################################################################
+#
+#  FUNCTION: receive()
+#
+###############################################################################
+
+def receive(lines, console, renderer, llm_username:str, closed:threading.Event) :
+    """Shows what the host sends until the connection ends."""
+    streams = {}          # conversation -> text streamed so far
+
+    def streaming() :
+        if not streams :
+            return None
+
+        return Group(*(Text(f"{llm_username}: {text}", style="cyan") for text in streams.values()))
+
+    try :
+        for line in lines :
+            message = json.loads(line)
+
+            if message.get("type") == "error" :
+                console.print(f"[red]{message.get('text')}")
+                break
+
+            if message.get("type") != "message" :
+                continue
+
+            speaker = message["speaker"]
+            kind = message.get("kind", "final")
+            conversation = message.get("conversation")
+
+            if kind == "partial" :
+                streams[conversation] = streams.get(conversation, "") + message["text"]
+                renderer.streaming(streaming())
+                continue
+
+            if kind == "cancelled" :
+                streams.pop(conversation, None)
+                renderer.streaming(streaming())
+                continue
+
+            if conversation in streams :
+                del streams[conversation]
+                renderer.streaming(streaming())
+
+            my_color = "[yellow]"
+
+            if speaker == "Server" :
+                my_color = "[magenta]"
+
+            if speaker == llm_username :
+                my_color = "[cyan]"
+
+            renderer.add(f"{my_color}{speaker}", f"{my_color}{message['text']}", f"{my_color}{message.get('timestamp', '')}")
+
+    except (OSError, ValueError) :
+        pass
+
+    renderer.close()
+
+    if not closed.is_set() :
+        closed.set()
+        console.print("*** Disconnected. Press Enter to exit. ***")
+
+    ###  END OF RECEIVE  ###
+
+
+###############################################################################
+#
+#  ENTRY POINT
+#
+###############################################################################
+
+def main() :
+    parser = argparse.ArgumentParser(description="Chat with a Willow host.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host running the chat server")
+    parser.add_argument("--port", type=int, default=8765, help="Its CHAT_PORT")
+    parser.add_argument("--username", help="Name to chat as")
+    parser.add_argument("--session", help="Conversation to join instead of the main one")
+    parser.add_argument("--view", choices=VIEWS, default="scroll", help="How the transcript is drawn")
+    args = parser.parse_args()
+
+    console = Console(width=100)
+    username = args.username or input("Please enter your username: ")
+
+    connection = socket.create_connection((args.host, args.port))
+    lines = connection.makefile("r", encoding="utf-8")
+
+    send(connection, {"type" : "hello", "username" : username, "session" : args.session})
+    welcome = json.loads(lines.readline() or "{}")
+
+    if welcome.get("type") != "welcome" :
+        console.print(f"[red]{welcome.get('text', 'The host closed the connection.')}")
+        connection.close()
+        return
+
+    llm_username = welcome.get("llm", "Willow")
+    where = f"{args.host}:{args.port}" if args.session is None else f"{args.host}:{args.port}, session {args.session}"
+    console.print(f"\nWelcome, {username}! You are chatting with {llm_username} at {where}. Type 'quit' to exit.\n")
+
+    closed = threading.Event()
+    receiver = threading.Thread(target=receive, args=(lines, console, ChatRenderer(console, args.view), llm_username, closed),
+                                name="Receive", daemon=True)
+    receiver.start()
+
+    try :
+        while not closed.is_set() :
+            user_input = input("")
+
+            if closed.is_set() :
+                break
+
+            if user_input.lower() == "quit" :
+                send(connection, {"type" : "quit"})
+                break
+
+            if user_input.lower() == "/stop" :
+                send(connection, {"type" : "stop"})
+                continue
+
+            if user_input.strip() :
+                send(connection, {"type" : "message", "text" : user_input})
+
+    except (EOFError, KeyboardInterrupt, OSError) :
+        pass
+
+    finally :
+        closed.set()
+
+        try :
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError :
+            pass
+
+        connection.close()
+        receiver.join(timeout=1.0)
+
+
+if __name__ == "__main__":
+    main()
+
+###  END OF ENTRY POINT CODE  ###